@@ -6,6 +6,7 @@ the ontology database with maximum flexibility.
 """
 
 import os
+import re
 import sys
 import json
 import time
@@ -23,10 +24,35 @@ from mes_ontology import (
 )
 from ignition_api_client import IgnitionApiClient
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, faster JSON parsing
+    orjson = None
+
 
 # Load environment variables
 load_dotenv()
 
+# Fenced code block around a JSON answer: from the first (```json) fence to
+# the last fence, so nested fences inside string values don't cut it short
+_JSON_FENCE_RE = re.compile(r"```json(.*)```", re.S)
+_FENCE_RE = re.compile(r"```(.*)```", re.S)
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_loads(text: str) -> Any:
+    """json.loads, using orjson when it is installed.
+
+    orjson is stricter (no NaN/Infinity, 64-bit ints only), so text it
+    rejects is retried with json before giving up.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 
 @dataclass
 class ToolResult:
@@ -909,7 +935,7 @@ class ClaudeClient:
 
     def _stream_response(
         self,
-        system_prompt: str,
+        system_prompt: Any,
         messages: List[Dict],
         max_tokens: int,
         tools: Optional[List[Dict]],
@@ -969,6 +995,22 @@ class ClaudeClient:
             )
             raise
 
+    @staticmethod
+    def _with_cache_breakpoint(messages: List[Dict]) -> List[Dict]:
+        """Copy of messages with a prompt-cache breakpoint on the last block.
+
+        The stored transcript is left untouched so earlier rounds' breakpoints
+        don't pile up past the API's limit of four.
+        """
+        last = messages[-1]
+        content = last["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        else:
+            content = list(content)
+        content[-1] = {**content[-1], "cache_control": {"type": "ephemeral"}}
+        return messages[:-1] + [{**last, "content": content}]
+
     def close(self) -> None:
         """Close Neo4j connection if we own it, and the API client."""
         if self._owns_graph and self._graph:
@@ -995,6 +1037,9 @@ class ClaudeClient:
         use_tools: bool = True,
         verbose: bool = False,
         require_data_query: bool = False,
+        result_tool: Optional[Dict] = None,
+        cache_prompt: bool = False,
+        max_tokens_ceiling: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Send a query to Claude with optional tool support.
@@ -1011,10 +1056,21 @@ class ClaudeClient:
             verbose: Print debug information
             require_data_query: If True, force at least one substantive tool call
                 (run_query or get_node) beyond just get_schema before final response
+            result_tool: Optional tool definition Claude calls to deliver its final
+                answer as structured input; when it is called the query ends and
+                its input is returned as 'data'. Tool use is required on every
+                round, so the answer cannot come back as free text
+            cache_prompt: Mark the tools + system prompt prefix, and the growing
+                transcript during tool rounds, for prompt caching, so repeated
+                calls with the same prompt (e.g. a directory scan) and later
+                tool rounds are billed at the cached-input rate
+            max_tokens_ceiling: With result_tool, a result call cut off by
+                max_tokens is retried with double the budget, up to this limit,
+                so max_tokens can be sized for the typical answer
 
         Returns:
             Dict with 'text' (final text response), 'tool_calls' (list of tool calls made),
-            'usage' (token usage)
+            'usage' (token usage), and 'data' when result_tool was called
         """
         # Use provided messages or create from user_prompt
         if messages:
@@ -1028,10 +1084,26 @@ class ClaudeClient:
         tools = None
         if use_tools and self._enable_tools and self._tools:
             tools = self._tools.get_all_tool_definitions()
+        if result_tool:
+            tools = (tools or []) + [result_tool]
+
+        # Tools render before the system prompt, so a breakpoint on the system
+        # block caches both
+        system = system_prompt
+        if cache_prompt:
+            system = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
 
         tool_calls_made = []
         total_input_tokens = 0
         total_output_tokens = 0
+        total_cache_read_tokens = 0
+        total_cache_write_tokens = 0
         data_query_nudged = False
 
         for tool_round in range(max_tool_rounds + 1):
@@ -1046,21 +1118,33 @@ class ClaudeClient:
             tc = None
             if tool_round == 0 and require_data_query and tools:
                 tc = {"type": "any"}
+            elif result_tool and len(tools) == 1:
+                # No exploration tools - answer straight through the result tool
+                tc = {"type": "tool", "name": result_tool["name"]}
+            elif result_tool:
+                # Explore freely, but finish through the result tool, not prose
+                tc = {"type": "any"}
+
+            # Each tool round resends the whole transcript; a breakpoint on
+            # the newest message lets the next round read it from cache
+            request_messages = messages
+            if cache_prompt:
+                request_messages = self._with_cache_breakpoint(messages)
 
             # Make API call with streaming for visibility
             api_start = time.time()
             if verbose:
                 # Use streaming to show response as it's generated
                 response = self._stream_response(
-                    system_prompt, messages, max_tokens, tools, tool_choice=tc
+                    system, request_messages, max_tokens, tools, tool_choice=tc
                 )
             else:
                 # Build kwargs - only include tools if provided
                 kwargs = {
                     "model": self.model,
                     "max_tokens": max_tokens,
-                    "system": system_prompt,
-                    "messages": messages,
+                    "system": system,
+                    "messages": request_messages,
                 }
                 if tools:
                     kwargs["tools"] = tools
@@ -1071,6 +1155,10 @@ class ClaudeClient:
 
             total_input_tokens += response.usage.input_tokens
             total_output_tokens += response.usage.output_tokens
+            cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
+            cache_write = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
+            total_cache_read_tokens += cache_read
+            total_cache_write_tokens += cache_write
 
             if verbose:
                 print(
@@ -1079,11 +1167,62 @@ class ClaudeClient:
                     flush=True,
                 )
                 print(
-                    f"[DEBUG] Content blocks: {len(response.content)}, tokens: {response.usage.input_tokens}+{response.usage.output_tokens}",
+                    f"[DEBUG] Content blocks: {len(response.content)}, tokens: {response.usage.input_tokens}+{response.usage.output_tokens}"
+                    f" (cache read {cache_read}, cache write {cache_write})",
                     file=sys.stderr,
                     flush=True,
                 )
 
+            # A result call cut off by max_tokens carries unusable input; redo
+            # the round with a larger budget rather than continuing as text
+            # (a tool call can't be continued), or give up once at the ceiling
+            result_cut_off = (
+                result_tool
+                and response.stop_reason == "max_tokens"
+                and any(
+                    block.type == "tool_use" and block.name == result_tool["name"]
+                    for block in response.content
+                )
+            )
+            if result_cut_off:
+                if not max_tokens_ceiling or max_tokens >= max_tokens_ceiling:
+                    return {
+                        "text": "",
+                        "data": None,
+                        "error": "Result cut off at max_tokens",
+                        "tool_calls": tool_calls_made,
+                        "usage": {
+                            "input_tokens": total_input_tokens,
+                            "output_tokens": total_output_tokens,
+                            "cache_read_input_tokens": total_cache_read_tokens,
+                            "cache_creation_input_tokens": total_cache_write_tokens,
+                        },
+                    }
+                max_tokens = min(2 * max_tokens, max_tokens_ceiling)
+                if verbose:
+                    print(
+                        f"[INFO] Result cut off, retrying with max_tokens={max_tokens}",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+                continue
+
+            # Structured final answer - no text to parse
+            if result_tool and response.stop_reason == "tool_use":
+                for block in response.content:
+                    if block.type == "tool_use" and block.name == result_tool["name"]:
+                        return {
+                            "text": "",
+                            "data": block.input,
+                            "tool_calls": tool_calls_made,
+                            "usage": {
+                                "input_tokens": total_input_tokens,
+                                "output_tokens": total_output_tokens,
+                                "cache_read_input_tokens": total_cache_read_tokens,
+                                "cache_creation_input_tokens": total_cache_write_tokens,
+                            },
+                        }
+
             # Check if we need to handle tool use
             if response.stop_reason == "tool_use":
                 # Extract tool uses and text from response
@@ -1242,7 +1381,7 @@ class ClaudeClient:
                     cont_response = self.client.messages.create(
                         model=self.model,
                         max_tokens=max_tokens,
-                        system=system_prompt,
+                        system=system,
                         messages=cont_messages,
                     )
 
@@ -1268,6 +1407,8 @@ class ClaudeClient:
                 "usage": {
                     "input_tokens": total_input_tokens,
                     "output_tokens": total_output_tokens,
+                    "cache_read_input_tokens": total_cache_read_tokens,
+                    "cache_creation_input_tokens": total_cache_write_tokens,
                 },
             }
 
@@ -1278,6 +1419,8 @@ class ClaudeClient:
             "usage": {
                 "input_tokens": total_input_tokens,
                 "output_tokens": total_output_tokens,
+                "cache_read_input_tokens": total_cache_read_tokens,
+                "cache_creation_input_tokens": total_cache_write_tokens,
             },
             "error": "Max tool rounds exceeded",
         }
@@ -1291,11 +1434,18 @@ class ClaudeClient:
         max_tool_rounds: int = 50,  # High limit - Claude self-regulates
         use_tools: bool = True,
         verbose: bool = False,
+        result_tool: Optional[Dict] = None,
+        cache_prompt: bool = False,
+        max_tokens_ceiling: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Query Claude expecting a JSON response.
         Automatically extracts and parses JSON from the response.
 
+        If result_tool is given, Claude can return the JSON as that tool's
+        input instead, which skips text parsing entirely; a plain-text answer
+        is still parsed as a fallback.
+
         Returns:
             Dict with 'data' (parsed JSON), 'tool_calls', 'usage', and optionally 'error'
         """
@@ -1307,8 +1457,25 @@ class ClaudeClient:
             max_tool_rounds=max_tool_rounds,
             use_tools=use_tools,
             verbose=verbose,
+            result_tool=result_tool,
+            cache_prompt=cache_prompt,
+            max_tokens_ceiling=max_tokens_ceiling,
         )
 
+        if result.get("data") is not None:
+            return {
+                "data": result["data"],
+                "tool_calls": result["tool_calls"],
+                "usage": result["usage"],
+            }
+        if result.get("error"):
+            return {
+                "data": None,
+                "error": result["error"],
+                "tool_calls": result["tool_calls"],
+                "usage": result["usage"],
+            }
+
         # Extract JSON from response
         text = result["text"].strip()
 
@@ -1321,28 +1488,22 @@ class ClaudeClient:
             }
 
         # Remove markdown code blocks if present
-        if "```json" in text:
-            json_start = text.find("```json") + 7
-            json_end = text.rfind("```")
-            if json_end > json_start:
-                text = text[json_start:json_end].strip()
-        elif "```" in text:
-            json_start = text.find("```") + 3
-            json_end = text.rfind("```")
-            if json_end > json_start:
-                text = text[json_start:json_end].strip()
+        fence = _JSON_FENCE_RE.search(text) or _FENCE_RE.search(text)
+        if fence:
+            text = fence.group(1).strip()
 
         # Try to parse JSON
         try:
-            data = json.loads(text)
+            data = _json_loads(text)
             return {
                 "data": data,
                 "tool_calls": result["tool_calls"],
                 "usage": result["usage"],
             }
         except json.JSONDecodeError as e:
-            # Try to fix common issues
-            fixed = self._attempt_json_fix(text)
+            # Salvage the answer already paid for: an object wrapped in
+            # commentary, or one cut off by max_tokens
+            fixed = self._salvage_json_object(text)
             if fixed:
                 return {
                     "data": fixed,
@@ -1358,6 +1519,22 @@ class ClaudeClient:
                 "usage": result["usage"],
             }
 
+    def _salvage_json_object(self, text: str) -> Optional[Dict]:
+        """Best-effort parse of the first JSON object in text.
+
+        Prose before the object and anything after its closing brace are
+        ignored; an unterminated object (or a top-level array) goes through
+        _attempt_json_fix.
+        """
+        start = text.find("{")
+        if start == -1 or text[:start].lstrip().startswith("["):
+            return self._attempt_json_fix(text)
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            return self._attempt_json_fix(text[start:])
+        return data if isinstance(data, dict) else None
+
     def _attempt_json_fix(self, json_str: str) -> Optional[Dict]:
         """Attempt to fix truncated or malformed JSON."""
         open_braces = json_str.count("{")
@@ -1388,7 +1565,7 @@ class ClaudeClient:
             fixed += "}" * missing_braces
 
         try:
-            return json.loads(fixed)
+            return _json_loads(fixed)
         except json.JSONDecodeError:
             return None
 
@@ -1397,6 +1574,11 @@ class ClaudeClient:
         """Access the Neo4j graph connection."""
         return self._get_graph()
 
+    def get_schema_summary(self) -> Dict:
+        """Snapshot of the graph schema, as the get_schema tool reports it."""
+        tools = self._tools or OntologyTools(self.graph, api_client=self._api_client)
+        return json.loads(tools.execute("get_schema", {}))
+
 
 # System prompt extension for live Ignition API tools
 LIVE_SYSTEM_PROMPT_EXTENSION = """
@@ -9,6 +9,7 @@ In development mode you would never call this directly – the Electron app
 spawns ``python -u <script>.py ...`` as before.
 """
 
+import multiprocessing
 import os
 import sys
 import runpy
@@ -25,6 +26,10 @@ def _scripts_dir() -> str:
 
 
 def main() -> None:
+    # Scripts may start spawn process pools; when frozen, each worker is this
+    # executable run with --multiprocessing-fork, which must be handled here
+    multiprocessing.freeze_support()
+
     if len(sys.argv) < 2:
         print("Usage: dispatcher <script_name.py> [args ...]", file=sys.stderr)
         sys.exit(1)
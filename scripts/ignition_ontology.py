@@ -84,8 +84,12 @@ class IgnitionOntologyAnalyzer:
             print(f"[INFO] Creating entities from parsed data...")
 
         # Create all UDTs from parsed definitions (gateway-wide, no project)
-        for udt_def in backup.udt_definitions:
-            self.graph.create_udt(udt_def.name, "", backup.file_path)
+        self.graph.create_udts_bulk(
+            [
+                {"name": udt_def.name, "source_file": backup.file_path}
+                for udt_def in backup.udt_definitions
+            ]
+        )
 
         # Create all Views from parsed windows with project-qualified names
         if verbose and len(backup.windows) > 100:
@@ -119,23 +123,27 @@ class IgnitionOntologyAnalyzer:
 
         # Create standalone SCADA tags (gateway-wide, no project prefix)
         tags_created = 0
+        tag_rows = []
         for tag in backup.tags:
             # Skip tags with empty or null names
             if not tag.name:
                 continue
             # Convert complex values to strings (Neo4j only accepts primitives)
-            self.graph.create_scada_tag(
-                name=tag.name,
-                tag_type=tag.tag_type,
-                folder_name=self._to_string(tag.folder_name),
-                data_type=self._to_string(tag.data_type),
-                datasource=self._to_string(tag.datasource),
-                query=self._to_string(tag.query),
-                opc_item_path=self._to_string(tag.opc_item_path),
-                expression=self._to_string(tag.expression),
-                initial_value=self._to_string(tag.initial_value),
+            tag_rows.append(
+                {
+                    "name": tag.name,
+                    "tag_type": tag.tag_type,
+                    "folder_name": self._to_string(tag.folder_name),
+                    "data_type": self._to_string(tag.data_type),
+                    "datasource": self._to_string(tag.datasource),
+                    "query": self._to_string(tag.query),
+                    "opc_item_path": self._to_string(tag.opc_item_path),
+                    "expression": self._to_string(tag.expression),
+                    "initial_value": self._to_string(tag.initial_value),
+                }
             )
             tags_created += 1
+        self.graph.create_scada_tags_bulk(tag_rows)
 
         # Create scripts with project-qualified names
         scripts_created = 0
@@ -548,34 +556,32 @@ class IgnitionOntologyAnalyzer:
         Returns:
             Tuple of (components_created, bindings_created)
         """
-        component_count = 0
         binding_count = 0
 
+        # Create this level's component nodes first (bindings need them to exist)
+        rows = []
         for comp in components:
-            # Build component path
             comp_path = f"{parent_path}/{comp.name}" if parent_path else comp.name
-
-            # Determine component purpose from type
-            comp_purpose = self._infer_component_purpose(comp)
-
-            # Extract relevant props for troubleshooting
-            relevant_props = self._extract_relevant_props(comp)
-
-            # Extract event scripts for this component
-            comp_event_scripts = self._extract_component_event_scripts(comp)
-
-            # Create component node first (bindings need it to exist)
-            success = self.graph.create_view_component(
-                view_name=view_name,
-                component_name=comp.name,
-                component_type=comp.component_type,
-                component_path=comp_path,
-                inferred_purpose=comp_purpose,
-                props=relevant_props,
-                event_scripts=comp_event_scripts or None,
+            rows.append(
+                {
+                    "component_name": comp.name,
+                    "component_type": comp.component_type,
+                    "component_path": comp_path,
+                    # Determine component purpose from type
+                    "inferred_purpose": self._infer_component_purpose(comp),
+                    # Extract relevant props for troubleshooting
+                    "props": self._extract_relevant_props(comp),
+                    # Extract event scripts for this component
+                    "event_scripts": self._extract_component_event_scripts(comp),
+                }
             )
-            if success:
-                component_count += 1
+        component_count = self.graph.create_view_components_bulk(view_name, rows)
+
+        for comp, row in zip(components, rows):
+            comp_path = row["component_path"]
+            comp_purpose = row["inferred_purpose"]
+            relevant_props = row["props"]
+            comp_event_scripts = row["event_scripts"]
 
             # Collect unresolved bindings for this component
             unresolved_bindings = []
@@ -369,38 +369,41 @@ class IncrementalAnalyzer:
             print(f"[INFO] Analyzing {len(pending)} {item_type} items{proj_info}...")
 
         # Mark items as in_progress
-        item_names = []
-        for item in pending:
-            name = (
-                item.get("path") if item_type == "ViewComponent" else item.get("name")
-            )
-            item_names.append(name)
-            self._graph.set_semantic_status(item_type, name, "in_progress")
+        item_names = [
+            item.get("path") if item_type == "ViewComponent" else item.get("name")
+            for item in pending
+        ]
+        self._graph.set_semantic_statuses(
+            item_type, [{"name": n, "status": "in_progress"} for n in item_names]
+        )
 
         # Build context and analyze
         try:
             results = self._analyze_batch(item_type, pending, verbose)
 
             # Update items with results
+            updates = []
             for name, result in results.items():
                 session.items_processed += 1
                 if result.get("error"):
                     session.items_failed += 1
                     session.errors.append({"name": name, "error": result["error"]})
-                    self._graph.set_semantic_status(item_type, name, "review")
+                    updates.append({"name": name, "status": "review"})
                 else:
                     session.items_succeeded += 1
                     purpose = result.get("purpose", "")
-                    self._graph.set_semantic_status(
-                        item_type, name, "complete", purpose
+                    updates.append(
+                        {"name": name, "status": "complete", "purpose": purpose}
                     )
                     if verbose:
                         print(f"  [OK] {name}: {purpose[:60]}...")
+            self._graph.set_semantic_statuses(item_type, updates)
 
         except Exception as e:
             # Reset all items to pending on failure
-            for name in item_names:
-                self._graph.set_semantic_status(item_type, name, "pending")
+            self._graph.set_semantic_statuses(
+                item_type, [{"name": n, "status": "pending"} for n in item_names]
+            )
             raise
 
         return session
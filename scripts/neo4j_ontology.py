@@ -5,16 +5,27 @@ Replaces JSON file storage with a proper graph database.
 """
 
 import os
+import re
+import copy
 import json
-from typing import Dict, List, Optional, Any, Union
+import time
+import functools
+import itertools
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Union
 from dataclasses import dataclass, field
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 try:
     from dotenv import load_dotenv
 except ImportError:  # pragma: no cover - optional fallback for minimal envs
     def load_dotenv(*_args, **_kwargs):
         return False
-from neo4j import GraphDatabase, Driver, Session
+from neo4j import AsyncGraphDatabase, GraphDatabase, Driver, Session, READ_ACCESS
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional, streams large AOI lists
+    ijson = None
 
 
 # Load environment variables
@@ -24,6 +35,921 @@ load_dotenv()
 DEFAULT_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 DEFAULT_USER = os.getenv("NEO4J_USER", "neo4j")
 DEFAULT_PASSWORD = os.getenv("NEO4J_PASSWORD", "leortest1!!!")
+DEFAULT_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "100"))
+DEFAULT_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "5000"))
+# Naming the database skips the per-session home-database lookup
+DEFAULT_DATABASE = os.getenv("NEO4J_DATABASE") or None
+
+# One row per AOI with all related nodes collected alongside it
+_ALL_AOIS_PROJECTION = """RETURN a,
+       [(a)-[:HAS_TAG]->(t:Tag) | {name: t.name, description: t.description}] as tags,
+       [(a)-[:HAS_TAG]->(from:Tag)-[r]->(to:Tag) WHERE type(r) <> 'HAS_TAG' |
+           {from: from.name, to: to.name, relationship_type: type(r),
+            description: r.description}] as relationships,
+       [(a)-[:HAS_PATTERN]->(p:ControlPattern) |
+           {pattern: p.name, description: p.description}] as patterns,
+       [(a)-[:HAS_FLOW]->(f:DataFlow) |
+           {path: f.path, description: f.description}] as flows,
+       [(a)-[:SAFETY_CRITICAL]->(s:SafetyElement) |
+           {element: s.name, criticality: s.criticality, reason: s.reason}] as safety
+"""
+_ITER_ALL_AOIS = "\nMATCH (a:AOI)\n" + _ALL_AOIS_PROJECTION
+# Keyset page of the same rows, ordered by the unique aoi_name constraint
+_PAGE_ALL_AOIS = (
+    """
+MATCH (a:AOI)
+WHERE a.name > $after
+WITH a ORDER BY a.name LIMIT $limit
+"""
+    + _ALL_AOIS_PROJECTION
+)
+
+# add_troubleshooting statements
+_MARK_TROUBLESHOOTING_ENRICHED = """
+MATCH (a:AOI {name: $aoi_name})
+SET a.troubleshooting_enriched = true,
+    a.enriched_at = $enriched_at,
+    a.expected_states = COALESCE($states, a.expected_states)
+"""
+
+_CREATE_FAULT_SYMPTOMS = """
+MATCH (a:AOI {name: $aoi_name})
+UNWIND $faults AS f
+MERGE (s:FaultSymptom {symptom: f.symptom, aoi_name: $aoi_name})
+SET s.symptom_lower = toLower(f.symptom),
+    s.plc_indicators = f.plc_indicators,
+    s.scada_indicators = f.scada_indicators,
+    s.resolution_steps = f.resolution_steps
+MERGE (a)-[:HAS_SYMPTOM]->(s)
+WITH s, f
+UNWIND f.possible_causes AS c
+MERGE (cause:FaultCause {cause: c.cause, aoi_name: $aoi_name})
+SET cause.likelihood = c.likelihood, cause.check = c.check
+MERGE (s)-[:CAUSED_BY {likelihood: c.likelihood}]->(cause)
+"""
+
+_CREATE_INTENTS = """
+MATCH (a:AOI {name: $aoi_name})
+UNWIND $rows AS r
+MERGE (i:Intent {name: r.name, aoi_name: $aoi_name})
+SET i.what = r.what,
+    i.why = r.why,
+    i.consequence_if_missing = r.consequence,
+    i.failure_symptom = r.failure
+MERGE (a)-[:HAS_INTENT]->(i)
+"""
+
+_CREATE_OPERATOR_PHRASES = """
+MATCH (a:AOI {name: $aoi_name})
+UNWIND $rows AS r
+MERGE (p:OperatorPhrase {phrase: r.phrase, aoi_name: $aoi_name})
+SET p.phrase_lower = toLower(r.phrase),
+    p.means = r.means,
+    p.check_first = r.check_first,
+    p.related_tags = r.related_tags
+MERGE (a)-[:HAS_PHRASE]->(p)
+"""
+
+_CREATE_DIAGNOSTIC_TAGS = """
+MATCH (a:AOI {name: $aoi_name})
+UNWIND $rows AS r
+MERGE (t:Tag {name: r.tag, aoi_name: $aoi_name})
+SET t.normal_value = r.normal_value,
+    t.meaning_if_abnormal = r.meaning
+MERGE (a)-[:HAS_TAG]->(t)
+"""
+
+# Lower-cased search keys for nodes stored before the writers set them
+_SEARCH_KEY_BACKFILLS = (
+    "MATCH (s:FaultSymptom) WHERE s.symptom_lower IS NULL "
+    "SET s.symptom_lower = toLower(s.symptom)",
+    "MATCH (p:OperatorPhrase) WHERE p.phrase_lower IS NULL "
+    "SET p.phrase_lower = toLower(p.phrase)",
+    "MATCH (p:CommonPhrase) WHERE p.variations_lower IS NULL "
+    "SET p.variations_lower = [v IN coalesce(p.variations, []) | toLower(v)]",
+)
+
+# All troubleshooting sections of one AOI in a single round-trip
+_GET_TROUBLESHOOTING = """
+MATCH (a:AOI {name: $aoi_name})
+RETURN a.expected_states as expected_states,
+       [(a)-[:HAS_SYMPTOM]->(s:FaultSymptom) |
+           {symptom: s.symptom,
+            plc_indicators: coalesce(s.plc_indicators, []),
+            scada_indicators: coalesce(s.scada_indicators, []),
+            resolution_steps: coalesce(s.resolution_steps, []),
+            possible_causes: [(s)-[:CAUSED_BY]->(c:FaultCause) |
+                {cause: c.cause, likelihood: c.likelihood, check: c.check}]}] as faults,
+       [(a)-[:HAS_INTENT]->(i:Intent) |
+           {name: i.name,
+            intent: {what: i.what, why: i.why,
+                     consequence_if_missing: i.consequence_if_missing,
+                     failure_symptom: i.failure_symptom}}] as intents,
+       [(a)-[:HAS_PHRASE]->(p:OperatorPhrase) |
+           {phrase: p.phrase, means: p.means, check_first: p.check_first,
+            related_tags: coalesce(p.related_tags, [])}] as phrases,
+       [(a)-[:HAS_TAG]->(t:Tag) WHERE t.normal_value IS NOT NULL |
+           {tag: t.name, normal_value: t.normal_value,
+            meaning_if_abnormal: t.meaning_if_abnormal}] as diagnostic_tags
+"""
+
+# SCADA upserts shared by OntologyGraph and AsyncOntologyGraph
+_CREATE_UDT = """
+MERGE (u:UDT {name: $name})
+SET u.source_file = $source_file
+WITH u
+// Set semantic_status to 'pending' only if not already set
+SET u.semantic_status = COALESCE(u.semantic_status, $semantic_status)
+WITH u
+// Update purpose and mark complete if purpose is provided
+FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
+    SET u.purpose = $purpose,
+        u.semantic_status = 'complete',
+        u.analyzed_at = datetime()
+)
+"""
+
+_CREATE_UDT_MEMBERS = """
+MATCH (u:UDT {name: $udt_name})
+UNWIND $members AS m
+MERGE (t:Tag {name: m.name, udt_name: $udt_name})
+SET t.data_type = m.data_type, t.tag_type = m.tag_type
+MERGE (u)-[:HAS_MEMBER]->(t)
+"""
+
+# Bulk forms of _CREATE_UDT / _CREATE_UDT_MEMBERS over row lists
+_CREATE_UDTS_BULK = """
+UNWIND $udts AS row
+MERGE (u:UDT {name: row.name})
+SET u.source_file = row.source_file
+WITH u, row
+SET u.semantic_status = COALESCE(u.semantic_status, row.semantic_status)
+WITH u, row
+FOREACH (_ IN CASE WHEN row.purpose <> '' THEN [1] ELSE [] END |
+    SET u.purpose = row.purpose,
+        u.semantic_status = 'complete',
+        u.analyzed_at = datetime()
+)
+"""
+
+_CREATE_UDT_MEMBERS_BULK = """
+UNWIND $members AS m
+MATCH (u:UDT {name: m.udt})
+MERGE (t:Tag {name: m.name, udt_name: m.udt})
+SET t.data_type = m.data_type, t.tag_type = m.tag_type
+MERGE (u)-[:HAS_MEMBER]->(t)
+"""
+
+_CREATE_EQUIPMENT = """
+MERGE (e:Equipment {name: $name})
+SET e.type = $type
+WITH e
+SET e.semantic_status = COALESCE(e.semantic_status, $semantic_status)
+WITH e
+FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
+    SET e.purpose = $purpose,
+        e.semantic_status = 'complete',
+        e.analyzed_at = datetime()
+)
+WITH e
+// Link to the UDT in the same statement when it exists
+OPTIONAL MATCH (u:UDT {name: $udt_name})
+FOREACH (udt IN CASE WHEN u IS NULL THEN [] ELSE [u] END |
+    MERGE (e)-[:INSTANCE_OF]->(udt)
+)
+"""
+
+_CREATE_VIEW = """
+MERGE (v:View {name: $name})
+SET v.path = $path,
+    v.project = $project
+WITH v
+SET v.semantic_status = COALESCE(v.semantic_status, $semantic_status)
+WITH v
+FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
+    SET v.purpose = $purpose,
+        v.semantic_status = 'complete',
+        v.analyzed_at = datetime()
+)
+"""
+
+_LINK_VIEW_PROJECT = """
+MATCH (v:View {name: $name})
+MATCH (p:Project {name: $project})
+MERGE (v)-[:BELONGS_TO]->(p)
+"""
+
+_CREATE_EQUIPMENT_BULK = """
+UNWIND $rows AS row
+MERGE (e:Equipment {name: row.name})
+SET e.type = row.type
+WITH e, row
+SET e.semantic_status = COALESCE(e.semantic_status, row.semantic_status)
+WITH e, row
+FOREACH (_ IN CASE WHEN row.purpose <> '' THEN [1] ELSE [] END |
+    SET e.purpose = row.purpose,
+        e.semantic_status = 'complete',
+        e.analyzed_at = datetime()
+)
+WITH e, row
+OPTIONAL MATCH (u:UDT {name: row.udt_name})
+FOREACH (udt IN CASE WHEN u IS NULL THEN [] ELSE [u] END |
+    MERGE (e)-[:INSTANCE_OF]->(udt)
+)
+"""
+
+_CREATE_VIEWS_BULK = """
+UNWIND $rows AS row
+MERGE (v:View {name: row.name})
+SET v.path = row.path,
+    v.project = row.project
+WITH v, row
+SET v.semantic_status = COALESCE(v.semantic_status, row.semantic_status)
+WITH v, row
+FOREACH (_ IN CASE WHEN row.purpose <> '' THEN [1] ELSE [] END |
+    SET v.purpose = row.purpose,
+        v.semantic_status = 'complete',
+        v.analyzed_at = datetime()
+)
+WITH v, row
+WHERE row.project IS NOT NULL AND row.project <> ''
+MATCH (p:Project {name: row.project})
+MERGE (v)-[:BELONGS_TO]->(p)
+"""
+
+# Labels reported by get_semantic_status_counts (incl. Siemens TIA Portal types)
+_STATUS_COUNT_LABELS = (
+    "AOI",
+    "UDT",
+    "View",
+    "Equipment",
+    "ViewComponent",
+    "ScadaTag",
+    "HMIScript",
+    "HMIAlarm",
+    "HMIScreen",
+    "PLCTag",
+)
+
+
+def _status_counts_query(where: str) -> str:
+    """One UNION ALL statement counting semantic statuses for every label."""
+    return "\nUNION ALL\n".join(
+        f"MATCH (n:{label}) {where}"
+        f"RETURN '{label}' as label, "
+        "COALESCE(n.semantic_status, 'pending') as status, count(*) as count"
+        for label in _STATUS_COUNT_LABELS
+    )
+
+
+_STATUS_COUNTS_ALL = _status_counts_query("")
+_STATUS_COUNTS_ACTIVE = _status_counts_query(
+    "WHERE n.deleted IS NULL OR n.deleted = false "
+)
+
+def _pending_items_query(label: str, returns: str, active_only: bool = True) -> str:
+    """get_pending_items statement for one label.
+
+    'pending' rows come from the semantic_status index; the IS NULL branch
+    (nodes written before statuses existed) only runs if the limit is not
+    yet filled.
+    """
+    active = (
+        "WITH n WHERE n.deleted IS NULL OR n.deleted = false\n" if active_only else ""
+    )
+    return f"""
+CALL {{
+    MATCH (n:{label}) USING INDEX n:{label}(semantic_status)
+    WHERE n.semantic_status = 'pending'
+    RETURN n
+    UNION ALL
+    MATCH (n:{label})
+    WHERE n.semantic_status IS NULL
+    RETURN n
+}}
+{active}RETURN {returns}
+LIMIT $limit
+"""
+
+
+# get_pending_items statements, one fixed string per label so each is planned
+# once and then served from the query cache. Labels can't be Cypher parameters;
+# routing through apoc.cypher.doIt would still plan the inner statement per
+# label and hide the label from the index planner, so keep literal labels.
+_PENDING_ITEMS_QUERIES: Dict[str, str] = {
+    label: _pending_items_query(
+        label,
+        """n.name as name, n.source_file as source_file,
+       n.type as type, n.path as path""",
+    )
+    for label in (
+        "AOI",
+        "UDT",
+        "View",
+        "Equipment",
+        "Script",
+        "NamedQuery",
+        "GatewayEvent",
+    )
+}
+_PENDING_ITEMS_QUERIES.update(
+    {
+        "ViewComponent": _pending_items_query(
+            "ViewComponent",
+            """n.view as view, n.path as path, n.name as name,
+       n.type as type, n.props as props,
+       n.inferred_purpose as inferred_purpose,
+       n.unresolved_bindings as unresolved_bindings,
+       n.event_scripts as event_scripts""",
+        ),
+        "ScadaTag": _pending_items_query(
+            "ScadaTag",
+            """n.name as name, n.tag_type as tag_type,
+       n.data_type as data_type, n.folder_name as folder_name,
+       n.query as query, n.datasource as datasource,
+       n.opc_item_path as opc_item_path, n.expression as expression""",
+        ),
+        # Siemens TIA Portal types
+        "HMIScript": _pending_items_query(
+            "HMIScript",
+            """n.name as name, n.hmi as hmi, n.project as project,
+       n.script_file as script_file,
+       n.functions as functions,
+       n.script_text as script_text""",
+            active_only=False,
+        ),
+        "HMIAlarm": _pending_items_query(
+            "HMIAlarm",
+            """n.name as name, n.hmi as hmi, n.project as project,
+       n.alarm_type as alarm_type,
+       n.alarm_class as alarm_class,
+       n.origin as origin, n.priority as priority,
+       n.raised_state_tag as raised_state_tag,
+       n.trigger_bit_address as trigger_bit_address,
+       n.trigger_mode as trigger_mode,
+       n.condition as condition,
+       n.condition_value as condition_value""",
+            active_only=False,
+        ),
+        "HMIScreen": _pending_items_query(
+            "HMIScreen",
+            """n.name as name, n.hmi as hmi, n.project as project,
+       n.folder as folder""",
+            active_only=False,
+        ),
+        "PLCTag": _pending_items_query(
+            "PLCTag",
+            """n.name as name, n.table as table_name,
+       n.plc as plc, n.project as project,
+       n.data_type as data_type,
+       n.logical_address as logical_address,
+       n.comment as comment""",
+            active_only=False,
+        ),
+    }
+)
+
+
+def _set_status_query(label: str) -> str:
+    """set_semantic_statuses statement for one label (ViewComponent is keyed by path).
+
+    The index hint pins the lookup to the name/path index created by
+    create_indexes(); set_semantic_statuses() goes through ensure_schema()
+    first.
+    """
+    key = "path" if label == "ViewComponent" else "name"
+    return f"""
+UNWIND $updates AS u
+MATCH (n:{label}) USING INDEX n:{label}({key})
+WHERE n.{key} = u.name
+SET n.semantic_status = u.status
+WITH n, u
+FOREACH (_ IN CASE WHEN u.purpose IS NOT NULL THEN [1] ELSE [] END |
+    SET n.purpose = u.purpose, n.analyzed_at = datetime()
+)
+RETURN count(n) as updated
+"""
+
+
+_SET_STATUS_QUERIES: Dict[str, str] = {
+    label: _set_status_query(label) for label in _PENDING_ITEMS_QUERIES
+}
+
+_VALID_ITEM_TYPES = frozenset(_PENDING_ITEMS_QUERIES)
+_VALID_STATUSES = frozenset({"pending", "in_progress", "complete", "review"})
+
+# Troubleshooting enrichment counts for AOIs and Views in one round-trip
+_ENRICHMENT_COUNTS = """
+MATCH (a:AOI)
+RETURN 'AOI' as label,
+       sum(CASE WHEN a.troubleshooting_enriched = true THEN 1 ELSE 0 END) as enriched,
+       sum(CASE WHEN coalesce(a.troubleshooting_enriched, false) = false THEN 1 ELSE 0 END) as pending
+UNION ALL
+MATCH (v:View)
+RETURN 'View' as label,
+       sum(CASE WHEN v.troubleshooting_enriched = true THEN 1 ELSE 0 END) as enriched,
+       sum(CASE WHEN coalesce(v.troubleshooting_enriched, false) = false THEN 1 ELSE 0 END) as pending
+"""
+
+# Visualization graph: one row per main node (including Siemens TIA project
+# nodes) carrying its outgoing edges to other main nodes, so each edge ships
+# only its target id. Label disjunctions let each label start from its index.
+_VIZ_NODE_LABELS = (
+    "AOI|UDT|Equipment|View|EndToEndFlow|TiaProject|PLCDevice|HMIDevice"
+    "|HMIConnection|HMIAlarm|HMIScript"
+)
+_VIZ_EDGE_LABELS = (
+    "AOI|UDT|Equipment|View|TiaProject|PLCDevice|HMIDevice"
+    "|HMIConnection|HMIAlarm|HMIScript"
+)
+_VIZ_DETAIL_KEYS = (
+    "name",
+    "purpose",
+    "description",
+    "type",
+    "project",
+    "source_file",
+    "semantic_status",
+)
+_GRAPH_FOR_VISUALIZATION = f"""
+MATCH (n:{_VIZ_NODE_LABELS})
+RETURN elementId(n) as id,
+       labels(n)[0] as type,
+       coalesce(n.name, n.key, 'unknown') as label,
+       n {{{", ".join("." + k for k in _VIZ_DETAIL_KEYS)}}} as details,
+       [(n)-[r]->(b:{_VIZ_EDGE_LABELS}) WHERE NOT n:EndToEndFlow |
+           {{target: elementId(b), type: type(r), label: r.mapping_type}}] as edges
+"""
+
+# Full property map for one visualization node, fetched on demand
+_NODE_DETAILS = """
+MATCH (n)
+WHERE elementId(n) = $id
+RETURN labels(n) as labels, properties(n) as props
+"""
+
+# Tag trace statements keyed by depth. Variable-length bounds can't be
+# parameters, so each depth gets its own fixed (and plan-cached) string.
+MAX_TRACE_DEPTH = 8
+_TRACE_DOWNSTREAM: Dict[int, str] = {
+    depth: f"""
+MATCH path = (start:Tag {{name: $tag_name, aoi_name: $aoi_name}})-[*1..{depth}]->(end:Tag)
+RETURN [n IN nodes(path) | n.name] as path,
+       [r IN relationships(path) | type(r)] as relationships
+"""
+    for depth in range(1, MAX_TRACE_DEPTH + 1)
+}
+_TRACE_UPSTREAM: Dict[int, str] = {
+    depth: f"""
+MATCH path = (start:Tag)-[*1..{depth}]->(end:Tag {{name: $tag_name, aoi_name: $aoi_name}})
+RETURN [n IN nodes(path) | n.name] as path,
+       [r IN relationships(path) | type(r)] as relationships
+"""
+    for depth in range(1, MAX_TRACE_DEPTH + 1)
+}
+
+# get_item_with_context statements. Each related set is collected in its own
+# subquery so expansions don't multiply into one another before DISTINCT.
+# The leading indexed MATCH yields no row for a missing item, so none of the
+# subqueries run and the statement doubles as the existence check.
+_ITEM_CONTEXT_QUERIES: Dict[str, str] = {
+    "AOI": """
+MATCH (a:AOI) USING INDEX a:AOI(name)
+WHERE a.name = $name
+CALL {
+    WITH a
+    MATCH (a)-[:HAS_TAG]->(t:Tag)
+    RETURN collect(DISTINCT {name: t.name, description: t.description}) as tags
+}
+CALL {
+    WITH a
+    MATCH (a)-[:HAS_PATTERN]->(p:ControlPattern)
+    RETURN collect(DISTINCT p.name) as patterns
+}
+CALL {
+    WITH a
+    MATCH (a)-[:MAPS_TO_SCADA]->(s)
+    RETURN collect(DISTINCT s.name) as scada_mappings
+}
+RETURN a as item, tags, patterns, scada_mappings
+""",
+    "UDT": """
+MATCH (u:UDT) USING INDEX u:UDT(name)
+WHERE u.name = $name
+CALL {
+    WITH u
+    MATCH (u)<-[:DISPLAYS]-(v:View)
+    RETURN collect(DISTINCT v.name) as views
+}
+CALL {
+    WITH u
+    MATCH (u)<-[:INSTANCE_OF]-(e:Equipment)
+    RETURN collect(DISTINCT e.name) as equipment
+}
+CALL {
+    WITH u
+    MATCH (u)<-[:MAPS_TO_SCADA]-(a:AOI)
+    RETURN collect(DISTINCT a.name) as aois
+}
+CALL {
+    WITH u
+    MATCH (u)-[:HAS_MEMBER]->(t:Tag)
+    RETURN collect(DISTINCT {name: t.name, data_type: t.data_type}) as members
+}
+RETURN u as item, views, equipment, aois, members
+""",
+    "View": """
+MATCH (v:View) USING INDEX v:View(name)
+WHERE v.name = $name
+CALL {
+    WITH v
+    MATCH (v)-[:DISPLAYS]->(u:UDT)
+    RETURN collect(DISTINCT u.name) as udts
+}
+CALL {
+    WITH v
+    MATCH (v)-[:HAS_COMPONENT]->(c:ViewComponent)
+    RETURN collect(DISTINCT {name: c.name, type: c.type, path: c.path}) as components
+}
+RETURN v as item, udts, components
+""",
+    "Equipment": """
+MATCH (e:Equipment) USING INDEX e:Equipment(name)
+WHERE e.name = $name
+CALL {
+    WITH e
+    OPTIONAL MATCH (e)-[:INSTANCE_OF]->(u:UDT)
+    RETURN u.name as udt_type
+    LIMIT 1
+}
+CALL {
+    WITH e
+    MATCH (e)<-[:DISPLAYS]-(v:View)
+    RETURN collect(DISTINCT v.name) as views
+}
+RETURN e as item, udt_type, views
+""",
+    # For ViewComponent, name is actually the path
+    "ViewComponent": """
+MATCH (c:ViewComponent) USING INDEX c:ViewComponent(path)
+WHERE c.path = $name
+CALL {
+    WITH c
+    OPTIONAL MATCH (v:View)-[:HAS_COMPONENT]->(c)
+    RETURN v.name as parent_view
+    LIMIT 1
+}
+CALL {
+    WITH c
+    MATCH (c)-[:BINDS_TO]->(u:UDT)
+    RETURN collect(DISTINCT u.name) as bound_udts
+}
+CALL {
+    WITH c
+    MATCH (c)-[:BINDS_TO]->(t:ScadaTag)
+    RETURN collect(DISTINCT t.name) as bound_tags
+}
+RETURN c as item, parent_view, bound_udts, bound_tags
+""",
+    "ScadaTag": """
+MATCH (t:ScadaTag) USING INDEX t:ScadaTag(name)
+WHERE t.name = $name
+CALL {
+    WITH t
+    MATCH (t)-[:REFERENCES]->(ref:ScadaTag)
+    RETURN collect(DISTINCT ref.name) as referenced_tags
+}
+CALL {
+    WITH t
+    MATCH (t)<-[:BINDS_TO]-(c:ViewComponent)
+    OPTIONAL MATCH (v:View)-[:HAS_COMPONENT]->(c)
+    RETURN collect(DISTINCT c.path) as bound_components,
+           collect(DISTINCT v.name) as used_in_views
+}
+RETURN t as item, referenced_tags, bound_components, used_in_views
+""",
+}
+
+def _without_index_hints(query: str) -> str:
+    """*query* with its USING INDEX hints removed.
+
+    A hint on a missing index is an error, so reads fall back to these until
+    this instance has seen the schema created (see ensure_schema()).
+    """
+    return re.sub(r" USING INDEX \w+:\w+\(\w+\)", "", query)
+
+
+_UNHINTED_PENDING_ITEMS_QUERIES = {
+    label: _without_index_hints(query)
+    for label, query in _PENDING_ITEMS_QUERIES.items()
+}
+_UNHINTED_SET_STATUS_QUERIES = {
+    label: _without_index_hints(query)
+    for label, query in _SET_STATUS_QUERIES.items()
+}
+_UNHINTED_ITEM_CONTEXT_QUERIES = {
+    label: _without_index_hints(query)
+    for label, query in _ITEM_CONTEXT_QUERIES.items()
+}
+
+# URIs whose connectivity has already been verified in this process
+_VERIFIED_URIS: set = set()
+
+# Seconds before ensure_schema() retries after a failed schema statement
+SCHEMA_RETRY_INTERVAL = 60.0
+
+# In-process cache for get_troubleshooting (seconds, entries)
+TROUBLESHOOTING_CACHE_TTL = 60.0
+TROUBLESHOOTING_CACHE_SIZE = 256
+
+# In-process caches for the semantic-analysis worker reads
+ITEM_CONTEXT_CACHE_TTL = 60.0
+ITEM_CONTEXT_CACHE_SIZE = 2048
+PENDING_ITEMS_CACHE_TTL = 30.0
+
+# Max candidates per side for a fuzzy PLC-to-SCADA match
+FUZZY_MATCH_LIMIT = 50
+
+# Rows per commit for large deletes (apoc.periodic.iterate batchSize)
+DELETE_BATCH_SIZE = 10000
+
+# Records per pull when streaming wide rows (e.g. iter_all_aois)
+STREAM_FETCH_SIZE = 1000
+
+# Rows per transaction for bulk node imports
+BULK_BATCH_SIZE = 1000
+
+# AOIs per create_aois_bulk transaction (directory scans and JSON imports);
+# each AOI fans out into tag, pattern, flow and safety rows
+AOI_WRITE_BATCH = 100
+
+# Per-row ScadaTag upsert; r is one create_scada_tags_bulk row
+_MERGE_SCADA_TAG_ROW = """
+MERGE (t:ScadaTag {name: r.name})
+SET t += r.props,
+    t.semantic_status = COALESCE(t.semantic_status, r.semantic_status)
+"""
+
+# Optional ScadaTag properties; empty values are written as null, which
+# removes a value left over from the tag's previous kind (e.g. OPC -> memory)
+_SCADA_TAG_FIELDS = (
+    "folder_name",
+    "data_type",
+    "datasource",
+    "query",
+    "opc_item_path",
+    "expression",
+    "initial_value",
+)
+
+# AOI upsert variants. The analyzed/pending choice is made in Python so each
+# form keeps a simple, stable plan instead of a CASE/FOREACH branch.
+_CREATE_AOI_ANALYZED = """
+MERGE (a:AOI {name: $name})
+SET a.type = $type,
+    a.source_file = $source_file,
+    a.revision = $revision,
+    a.vendor = $vendor,
+    a.description = $description,
+    a.purpose = $purpose,
+    a.semantic_status = 'complete',
+    a.analyzed_at = $analyzed_at,
+    a.analysis_hash = $analysis_hash
+RETURN a.name as name
+"""
+
+_CREATE_AOI_PENDING = """
+MERGE (a:AOI {name: $name})
+SET a.type = $type,
+    a.source_file = $source_file,
+    a.revision = $revision,
+    a.vendor = $vendor,
+    a.description = $description,
+    // Set semantic_status to 'pending' only if not already set
+    a.semantic_status = COALESCE(a.semantic_status, $semantic_status)
+RETURN a.name as name
+"""
+
+# Bulk forms of create_aoi over row lists; see create_aois_bulk
+_CREATE_AOIS_ANALYZED_BULK = """
+UNWIND $aois AS row
+MERGE (a:AOI {name: row.name})
+SET a.type = row.type,
+    a.source_file = row.source_file,
+    a.revision = row.revision,
+    a.vendor = row.vendor,
+    a.description = row.description,
+    a.purpose = row.purpose,
+    a.semantic_status = 'complete',
+    a.analyzed_at = $analyzed_at,
+    a.analysis_hash = row.analysis_hash
+"""
+
+_CREATE_AOIS_PENDING_BULK = """
+UNWIND $aois AS row
+MERGE (a:AOI {name: row.name})
+SET a.type = row.type,
+    a.source_file = row.source_file,
+    a.revision = row.revision,
+    a.vendor = row.vendor,
+    a.description = row.description,
+    a.semantic_status = COALESCE(a.semantic_status, row.semantic_status)
+"""
+
+# Pending placeholder for an import without analysis: properties are only
+# written when the node is new, so re-imports leave existing AOIs untouched
+_CREATE_AOI_STUBS_BULK = """
+UNWIND $aois AS row
+MERGE (a:AOI {name: row.name})
+ON CREATE SET a.type = row.type,
+    a.source_file = row.source_file,
+    a.revision = row.revision,
+    a.vendor = row.vendor,
+    a.description = row.description,
+    a.semantic_status = 'pending'
+ON MATCH SET a.semantic_status = COALESCE(a.semantic_status, 'pending')
+"""
+
+_CREATE_AOI_TAGS_BULK = """
+UNWIND $tags AS row
+MATCH (a:AOI {name: row.aoi})
+MERGE (t:Tag {name: row.name, aoi_name: row.aoi})
+SET t.description = row.description
+MERGE (a)-[:HAS_TAG]->(t)
+"""
+
+# Tags only named as relationship endpoints: linked, description untouched
+_LINK_AOI_TAGS_BULK = """
+UNWIND $tags AS row
+MATCH (a:AOI {name: row.aoi})
+MERGE (t:Tag {name: row.name, aoi_name: row.aoi})
+MERGE (a)-[:HAS_TAG]->(t)
+"""
+
+# Formatted with one sanitized relationship type per statement
+_CREATE_TAG_RELATIONSHIPS_BULK = """
+UNWIND $rels AS row
+MATCH (from:Tag {{name: row.from, aoi_name: row.aoi}})
+MATCH (to:Tag {{name: row.to, aoi_name: row.aoi}})
+MERGE (from)-[r:{rel_type}]->(to)
+SET r.description = row.description
+"""
+
+_CREATE_CONTROL_PATTERNS_BULK = """
+UNWIND $patterns AS row
+MATCH (a:AOI {name: row.aoi})
+MERGE (p:ControlPattern {name: row.name, aoi_name: row.aoi})
+SET p.description = row.description
+MERGE (a)-[:HAS_PATTERN]->(p)
+"""
+
+_CREATE_DATA_FLOWS_BULK = """
+UNWIND $flows AS row
+MATCH (a:AOI {name: row.aoi})
+MERGE (f:DataFlow {path: row.path, aoi_name: row.aoi})
+SET f.description = row.description
+MERGE (a)-[:HAS_FLOW]->(f)
+"""
+
+_CREATE_SAFETY_ELEMENTS_BULK = """
+UNWIND $elements AS row
+MATCH (a:AOI {name: row.aoi})
+MERGE (s:SafetyElement {name: row.name, aoi_name: row.aoi})
+SET s.criticality = row.criticality, s.reason = row.reason
+MERGE (a)-[:SAFETY_CRITICAL]->(s)
+"""
+
+
+def _load_json_property(value: Any) -> Any:
+    """Decode a property stored with json.dumps.
+
+    Values written before properties were JSON-encoded (Python repr strings)
+    are returned unchanged.
+    """
+    if not isinstance(value, str) or not value:
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+_REL_TYPE_INVALID = re.compile(r"[^A-Za-z0-9_]")
+
+
+def _udt_member_rows(members: List[Dict]) -> List[Dict]:
+    """Normalize UDT member definitions into _CREATE_UDT_MEMBERS rows."""
+    return [
+        {
+            "name": member.get("name", ""),
+            "data_type": member.get("data_type", ""),
+            "tag_type": member.get("tag_type", ""),
+        }
+        for member in members
+    ]
+
+
+def _aoi_node_row(aoi: Dict) -> Dict:
+    """AOI node properties for the bulk AOI statements from a create_aoi dict."""
+    metadata = aoi.get("metadata") or {}
+    return {
+        "name": aoi["name"],
+        "type": aoi.get("type"),
+        "source_file": aoi.get("source_file"),
+        "revision": metadata.get("revision", ""),
+        "vendor": metadata.get("vendor", ""),
+        "description": metadata.get("description", ""),
+    }
+
+
+def _control_pattern_row(aoi_name: str, pattern: Union[Dict, str]) -> Dict:
+    """Normalize an analysis control pattern (dict or bare name) into a row."""
+    if isinstance(pattern, dict):
+        return {
+            "aoi": aoi_name,
+            "name": pattern.get("pattern", pattern.get("name", str(pattern))),
+            "description": pattern.get("description", ""),
+        }
+    return {"aoi": aoi_name, "name": str(pattern), "description": ""}
+
+
+def _data_flow_row(aoi_name: str, flow: Union[Dict, str]) -> Dict:
+    """Normalize an analysis data flow (dict or bare path) into a row."""
+    if isinstance(flow, dict):
+        return {
+            "aoi": aoi_name,
+            "path": flow.get("path", ""),
+            "description": flow.get("description", ""),
+        }
+    return {"aoi": aoi_name, "path": str(flow), "description": ""}
+
+
+def _safety_element_row(aoi_name: str, element: Union[Dict, str]) -> Dict:
+    """Normalize an analysis safety element (dict or bare name) into a row."""
+    if isinstance(element, dict):
+        return {
+            "aoi": aoi_name,
+            "name": element.get("element", element.get("name", str(element))),
+            "criticality": element.get("criticality", "unknown"),
+            "reason": element.get("reason", ""),
+        }
+    return {
+        "aoi": aoi_name,
+        "name": str(element),
+        "criticality": "unknown",
+        "reason": "",
+    }
+
+
+def _scada_tag_props(tag_type: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """ScadaTag property map: tag_type plus every optional field (None if empty).
+
+    With SET t += props a None value removes the property, so empty fields
+    are neither stored as empty strings nor left stale on re-import.
+    """
+    props: Dict[str, Any] = {"tag_type": tag_type}
+    for key in _SCADA_TAG_FIELDS:
+        value = fields.get(key)
+        if not value:
+            value = None
+        elif key == "initial_value":
+            value = str(value)
+        props[key] = value
+    return props
+
+
+def _cache_lookup(cache: Dict, key: Any, ttl: float) -> Any:
+    """Return a cached value younger than *ttl* seconds, else None."""
+    cached = cache.get(key)
+    if cached is None or (time.monotonic() - cached[0]) >= ttl:
+        return None
+    if isinstance(cache, OrderedDict):
+        cache.move_to_end(key)
+    return cached[1]
+
+
+def _cache_store(cache: Dict, key: Any, value: Any, max_size: int = 0) -> None:
+    """Store *value* with the current time; trims the oldest LRU entries."""
+    cache[key] = (time.monotonic(), value)
+    if isinstance(cache, OrderedDict):
+        cache.move_to_end(key)
+        while max_size and len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def _fuzzy_words(component: str) -> List[str]:
+    """Lowercase key words used for fuzzy PLC/SCADA name matching.
+
+    e.g., "Valve_Solenoid" -> ["valve", "solenoid"]. Words of two characters
+    or fewer are dropped; they match far too many names.
+    """
+    return [w.lower() for w in component.replace("_", " ").split() if len(w) > 2]
+
+
+@functools.lru_cache(maxsize=256)
+def _sanitize_rel_type(rel_type: str) -> str:
+    """Normalize an LLM-supplied relationship name into a valid Neo4j type."""
+    return _REL_TYPE_INVALID.sub("_", rel_type.upper().replace(" ", "_"))
 
 
 @dataclass
@@ -33,6 +959,12 @@ class Neo4jConfig:
     uri: str = DEFAULT_URI
     user: str = DEFAULT_USER
     password: str = DEFAULT_PASSWORD
+    database: Optional[str] = DEFAULT_DATABASE
+    # Driver tuning (seconds for timeouts)
+    max_connection_pool_size: int = DEFAULT_POOL_SIZE
+    connection_acquisition_timeout: int = 60
+    fetch_size: int = DEFAULT_FETCH_SIZE
+    max_transaction_retry_time: int = 30
 
 
 class OntologyGraph:
@@ -124,15 +1056,38 @@ class OntologyGraph:
         """Initialize Neo4j connection."""
         self.config = config or Neo4jConfig()
         self._driver: Optional[Driver] = None
+        self._has_apoc: Optional[bool] = None
+        self._schema_ready = False
+        self._schema_retry_at = 0.0
+        # aoi_name -> (fetched_at, troubleshooting dict), oldest first
+        self._trouble_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # (item_type, name) -> (fetched_at, context); (item_type, limit) -> items
+        self._context_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._pending_cache: Dict[tuple, tuple] = {}
 
     def connect(self) -> None:
         """Establish connection to Neo4j."""
         if self._driver is None:
             self._driver = GraphDatabase.driver(
-                self.config.uri, auth=(self.config.user, self.config.password)
-            )
-            # Verify connectivity
-            self._driver.verify_connectivity()
+                self.config.uri,
+                auth=(self.config.user, self.config.password),
+                max_connection_pool_size=self.config.max_connection_pool_size,
+                connection_acquisition_timeout=self.config.connection_acquisition_timeout,
+                fetch_size=self.config.fetch_size,
+                max_transaction_retry_time=self.config.max_transaction_retry_time,
+                keep_alive=True,
+            )
+            # Verify connectivity once per process and URI; later drivers skip
+            # the extra round-trip (use healthcheck() to re-check explicitly)
+            if self.config.uri not in _VERIFIED_URIS:
+                self._driver.verify_connectivity()
+                _VERIFIED_URIS.add(self.config.uri)
+
+    def healthcheck(self) -> None:
+        """Verify the Neo4j server is reachable; raises on failure."""
+        if self._driver is None:
+            self.connect()
+        self._driver.verify_connectivity()
 
     def close(self) -> None:
         """Close Neo4j connection."""
@@ -145,7 +1100,65 @@ class OntologyGraph:
         """Context manager for Neo4j sessions."""
         if self._driver is None:
             self.connect()
-        session = self._driver.session()
+        session = self._driver.session(database=self.config.database)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    @contextmanager
+    def _use_session(self, session: Optional[Session] = None):
+        """Yield the caller's session/transaction, or open a new session."""
+        if session is not None:
+            yield session
+        else:
+            with self.session() as own_session:
+                yield own_session
+
+    def _execute_write(self, session: Optional[Session], work, *args):
+        """Run transaction function *work* in the caller's session/transaction,
+        or in a new managed write transaction."""
+        if session is not None:
+            return work(session, *args)
+        with self.session() as own_session:
+            return own_session.execute_write(work, *args)
+
+    @contextmanager
+    def bulk(self):
+        """Group many writes into one session and one explicit transaction.
+
+        Example::
+
+            with graph.bulk() as tx:
+                graph.create_udt("Motor", "", session=tx)
+                graph.create_equipment("M1", "motor", "", "Motor", session=tx)
+
+        The transaction commits when the block exits cleanly and rolls back
+        if it raises.
+        """
+        with self.session() as session:
+            with session.begin_transaction() as tx:
+                yield tx
+                tx.commit()
+
+    @contextmanager
+    def read_session(self, fetch_size: Optional[int] = None):
+        """Context manager for read-only sessions.
+
+        Reads are routed to followers/read replicas on a cluster instead of
+        the leader. *fetch_size* overrides the driver's records-per-pull for
+        this session (smaller values stream wide rows with less buffering).
+        """
+        if self._driver is None:
+            self.connect()
+        options: Dict[str, Any] = {}
+        if fetch_size:
+            options["fetch_size"] = fetch_size
+        session = self._driver.session(
+            database=self.config.database,
+            default_access_mode=READ_ACCESS,
+            **options,
+        )
         try:
             yield session
         finally:
@@ -162,8 +1175,13 @@ class OntologyGraph:
     # Schema Management
     # =========================================================================
 
-    def create_indexes(self) -> None:
-        """Create indexes and constraints for optimal query performance."""
+    def create_indexes(self) -> bool:
+        """Create indexes and constraints for optimal query performance.
+
+        Returns:
+            True if every statement succeeded (or its index already existed)
+        """
+        ok = True
         with self.session() as session:
             # Unique constraints (also create indexes)
             constraints = [
@@ -176,6 +1194,9 @@ class OntologyGraph:
                 "CREATE CONSTRAINT namedquery_name IF NOT EXISTS FOR (q:NamedQuery) REQUIRE q.name IS UNIQUE",
                 "CREATE CONSTRAINT agentrun_id IF NOT EXISTS FOR (r:AgentRun) REQUIRE r.run_id IS UNIQUE",
                 "CREATE CONSTRAINT anomalyevent_id IF NOT EXISTS FOR (e:AnomalyEvent) REQUIRE e.event_id IS UNIQUE",
+                "CREATE CONSTRAINT systemoverview_id IF NOT EXISTS FOR (s:SystemOverview) REQUIRE s.id IS UNIQUE",
+                "CREATE CONSTRAINT endtoendflow_name IF NOT EXISTS FOR (f:EndToEndFlow) REQUIRE f.name IS UNIQUE",
+                "CREATE CONSTRAINT commonphrase_key IF NOT EXISTS FOR (p:CommonPhrase) REQUIRE p.key IS UNIQUE",
             ]
 
             # Regular indexes
@@ -184,8 +1205,24 @@ class OntologyGraph:
                 "CREATE INDEX tag_aoi IF NOT EXISTS FOR (t:Tag) ON (t.aoi_name)",
                 "CREATE INDEX symptom_text IF NOT EXISTS FOR (s:FaultSymptom) ON (s.symptom)",
                 "CREATE INDEX phrase_text IF NOT EXISTS FOR (p:OperatorPhrase) ON (p.phrase)",
+                # Lower-cased copies serve the CONTAINS searches
+                "CREATE TEXT INDEX symptom_lower_text IF NOT EXISTS FOR (s:FaultSymptom) ON (s.symptom_lower)",
+                "CREATE TEXT INDEX phrase_lower_text IF NOT EXISTS FOR (p:OperatorPhrase) ON (p.phrase_lower)",
+                # Composite indexes matching the (aoi_name, key) MERGE patterns
+                "CREATE INDEX tag_aoi_name IF NOT EXISTS FOR (t:Tag) ON (t.aoi_name, t.name)",
+                "CREATE INDEX controlpattern_aoi_name IF NOT EXISTS FOR (p:ControlPattern) ON (p.aoi_name, p.name)",
+                "CREATE INDEX dataflow_aoi_path IF NOT EXISTS FOR (f:DataFlow) ON (f.aoi_name, f.path)",
+                "CREATE INDEX safetyelement_aoi_name IF NOT EXISTS FOR (s:SafetyElement) ON (s.aoi_name, s.name)",
+                "CREATE INDEX faultsymptom_aoi_symptom IF NOT EXISTS FOR (s:FaultSymptom) ON (s.aoi_name, s.symptom)",
+                "CREATE INDEX faultcause_aoi_cause IF NOT EXISTS FOR (c:FaultCause) ON (c.aoi_name, c.cause)",
+                "CREATE INDEX tag_udt_name IF NOT EXISTS FOR (t:Tag) ON (t.udt_name, t.name)",
+                "CREATE INDEX intent_aoi_name IF NOT EXISTS FOR (i:Intent) ON (i.aoi_name, i.name)",
+                "CREATE INDEX operatorphrase_aoi_phrase IF NOT EXISTS FOR (p:OperatorPhrase) ON (p.aoi_name, p.phrase)",
+                "CREATE INDEX viewcomponent_view_path IF NOT EXISTS FOR (c:ViewComponent) ON (c.view, c.path)",
+                "CREATE INDEX viewcomponent_path IF NOT EXISTS FOR (c:ViewComponent) ON (c.path)",
                 # Semantic status indexes for incremental analysis
                 "CREATE INDEX aoi_semantic_status IF NOT EXISTS FOR (a:AOI) ON (a.semantic_status)",
+                "CREATE INDEX aoi_analysis_hash IF NOT EXISTS FOR (a:AOI) ON (a.analysis_hash)",
                 "CREATE INDEX udt_semantic_status IF NOT EXISTS FOR (u:UDT) ON (u.semantic_status)",
                 "CREATE INDEX view_semantic_status IF NOT EXISTS FOR (v:View) ON (v.semantic_status)",
                 "CREATE INDEX equipment_semantic_status IF NOT EXISTS FOR (e:Equipment) ON (e.semantic_status)",
@@ -193,6 +1230,11 @@ class OntologyGraph:
                 "CREATE INDEX scadatag_semantic_status IF NOT EXISTS FOR (t:ScadaTag) ON (t.semantic_status)",
                 "CREATE INDEX script_semantic_status IF NOT EXISTS FOR (s:Script) ON (s.semantic_status)",
                 "CREATE INDEX namedquery_semantic_status IF NOT EXISTS FOR (q:NamedQuery) ON (q.semantic_status)",
+                "CREATE INDEX gatewayevent_semantic_status IF NOT EXISTS FOR (ge:GatewayEvent) ON (ge.semantic_status)",
+                "CREATE INDEX hmiscript_semantic_status IF NOT EXISTS FOR (hs:HMIScript) ON (hs.semantic_status)",
+                "CREATE INDEX hmialarm_semantic_status IF NOT EXISTS FOR (ha:HMIAlarm) ON (ha.semantic_status)",
+                "CREATE INDEX hmiscreen_semantic_status IF NOT EXISTS FOR (hsc:HMIScreen) ON (hsc.semantic_status)",
+                "CREATE INDEX plctag_semantic_status IF NOT EXISTS FOR (ptg:PLCTag) ON (ptg.semantic_status)",
                 # Soft delete indexes
                 "CREATE INDEX aoi_deleted IF NOT EXISTS FOR (a:AOI) ON (a.deleted)",
                 "CREATE INDEX udt_deleted IF NOT EXISTS FOR (u:UDT) ON (u.deleted)",
@@ -203,6 +1245,7 @@ class OntologyGraph:
                 "CREATE INDEX view_project IF NOT EXISTS FOR (v:View) ON (v.project)",
                 "CREATE INDEX script_project IF NOT EXISTS FOR (s:Script) ON (s.project)",
                 "CREATE INDEX namedquery_project IF NOT EXISTS FOR (q:NamedQuery) ON (q.project)",
+                "CREATE INDEX gatewayevent_name IF NOT EXISTS FOR (ge:GatewayEvent) ON (ge.name)",
                 # Siemens TIA Portal project indexes
                 "CREATE INDEX tiaproject_name IF NOT EXISTS FOR (tp:TiaProject) ON (tp.name)",
                 "CREATE INDEX plcdevice_name IF NOT EXISTS FOR (pd:PLCDevice) ON (pd.name)",
@@ -215,6 +1258,7 @@ class OntologyGraph:
                 "CREATE INDEX hmitextlist_name IF NOT EXISTS FOR (htl:HMITextList) ON (htl.name)",
                 "CREATE INDEX plctagtable_name IF NOT EXISTS FOR (pt:PLCTagTable) ON (pt.name)",
                 "CREATE INDEX plctag_name IF NOT EXISTS FOR (ptg:PLCTag) ON (ptg.name)",
+                "CREATE INDEX hmiscreen_name IF NOT EXISTS FOR (hsc:HMIScreen) ON (hsc.name)",
                 # ScadaTag lookup indexes (used by agent persist queries)
                 "CREATE INDEX scadatag_name IF NOT EXISTS FOR (t:ScadaTag) ON (t.name)",
                 "CREATE INDEX scadatag_opc_item_path IF NOT EXISTS FOR (t:ScadaTag) ON (t.opc_item_path)",
@@ -238,6 +1282,7 @@ class OntologyGraph:
                 except Exception as e:
                     if "already exists" not in str(e).lower():
                         print(f"[WARNING] Constraint error: {e}")
+                        ok = False
 
             for index in indexes:
                 try:
@@ -245,10 +1290,39 @@ class OntologyGraph:
                 except Exception as e:
                     if "already exists" not in str(e).lower():
                         print(f"[WARNING] Index error: {e}")
+                        ok = False
+
+            # Fill search keys on nodes written before they existed
+            for backfill in _SEARCH_KEY_BACKFILLS:
+                try:
+                    session.run(backfill)
+                except Exception as e:
+                    print(f"[WARNING] Backfill error: {e}")
+                    ok = False
+
+        self._schema_ready = ok
+        return ok
+
+    def ensure_schema(self) -> None:
+        """Create constraints and indexes once per instance.
+
+        The write helpers MERGE on a label+property key, and without the
+        backing index each MERGE is a label scan. They do not call this
+        themselves: get_ontology_graph() runs it on every connect, and
+        set_semantic_statuses() and init_agent_monitoring_schema() run it
+        before writing. An OntologyGraph created directly gets no DDL until
+        one of those, or a direct create_indexes() call, runs it. Until the
+        schema exists, reads and status updates skip their index hints. A
+        failed attempt is retried after SCHEMA_RETRY_INTERVAL.
+        """
+        if self._schema_ready or time.monotonic() < self._schema_retry_at:
+            return
+        if not self.create_indexes():
+            self._schema_retry_at = time.monotonic() + SCHEMA_RETRY_INTERVAL
 
     def init_agent_monitoring_schema(self) -> None:
         """Ensure agent monitoring labels and indexes exist."""
-        self.create_indexes()
+        self.ensure_schema()
 
     def list_anomaly_events(
         self,
@@ -335,10 +1409,90 @@ class OntologyGraph:
             record = result.single()
             return int(record["deleted"]) if record else 0
 
+    def _apoc_available(self, session: Session) -> bool:
+        """Check (once per instance) whether APOC periodic procedures are installed."""
+        if self._has_apoc is None:
+            try:
+                record = session.run(
+                    """
+                    SHOW PROCEDURES YIELD name
+                    WHERE name = 'apoc.periodic.iterate'
+                    RETURN count(*) > 0 as available
+                    """
+                ).single()
+                self._has_apoc = bool(record and record["available"])
+            except Exception:
+                self._has_apoc = False
+        return self._has_apoc
+
+    def _batched_delete(
+        self, session: Session, match: str, action: str = "DETACH DELETE n"
+    ) -> int:
+        """Delete everything bound to ``n`` by *match* in periodic commits.
+
+        Uses apoc.periodic.iterate so each batch commits separately and memory
+        stays bounded; without APOC it falls back to a single transaction.
+
+        Returns:
+            Number of deleted nodes/relationships
+
+        Raises:
+            RuntimeError: If any APOC batch failed (earlier batches stay
+                committed, so the delete is partial)
+        """
+        if self._apoc_available(session):
+            record = session.run(
+                """
+                CALL apoc.periodic.iterate($outer, $inner, {batchSize: $batch_size})
+                YIELD committedOperations, failedOperations, errorMessages
+                RETURN committedOperations as count, failedOperations as failed,
+                       errorMessages as errors
+                """,
+                {
+                    "outer": f"{match} RETURN DISTINCT n",
+                    "inner": action,
+                    "batch_size": DELETE_BATCH_SIZE,
+                },
+            ).single()
+            if record and record["failed"]:
+                raise RuntimeError(
+                    f"Batched delete '{match}' failed for {record['failed']} "
+                    f"operations after deleting {record['count']}: "
+                    f"{record['errors']}"
+                )
+        else:
+            record = session.run(
+                f"{match} WITH DISTINCT n {action} RETURN count(n) as count"
+            ).single()
+        return record["count"] if record else 0
+
+    def clear_cache(self) -> None:
+        """Drop cached read results (troubleshooting, item context, pending items)."""
+        self._trouble_cache.clear()
+        self._context_cache.clear()
+        self._pending_cache.clear()
+
+    def _invalidate_items(
+        self, item_type: str, names: Optional[Iterable[str]] = None
+    ) -> None:
+        """Drop cached pending lists of item_type and the context of names.
+
+        Without names every cached context is dropped, for writes that can
+        also change what related items' contexts include.
+        """
+        if names is None:
+            self._context_cache.clear()
+        else:
+            for name in names:
+                self._context_cache.pop((item_type, name), None)
+        for key in [k for k in self._pending_cache if k[0] == item_type]:
+            del self._pending_cache[key]
+
     def clear_all(self) -> None:
         """Clear all nodes and relationships. USE WITH CAUTION."""
+        self.clear_cache()
         with self.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+            self._batched_delete(session, "MATCH (n)")
 
     def clear_ignition(self) -> Dict[str, int]:
         """Clear all Ignition/SCADA-related nodes and cross-system mappings.
@@ -348,61 +1502,42 @@ class OntologyGraph:
         Returns:
             Dict with counts of deleted nodes by type
         """
+        self.clear_cache()
         with self.session() as session:
             counts = {}
 
             # Delete MAPS_TO_SCADA relationships first (cross-system links)
-            result = session.run(
-                "MATCH ()-[r:MAPS_TO_SCADA]->() DELETE r RETURN count(r) as count"
+            counts["MAPS_TO_SCADA_relationships"] = self._batched_delete(
+                session, "MATCH ()-[n:MAPS_TO_SCADA]->()", "DELETE n"
             )
-            counts["MAPS_TO_SCADA_relationships"] = result.single()["count"]
 
             # Delete ViewComponents and their relationships
-            result = session.run(
-                "MATCH (c:ViewComponent) DETACH DELETE c RETURN count(c) as count"
+            counts["ViewComponent"] = self._batched_delete(
+                session, "MATCH (n:ViewComponent)"
             )
-            counts["ViewComponent"] = result.single()["count"]
 
             # Delete Views and their relationships
-            result = session.run(
-                "MATCH (v:View) DETACH DELETE v RETURN count(v) as count"
-            )
-            counts["View"] = result.single()["count"]
+            counts["View"] = self._batched_delete(session, "MATCH (n:View)")
 
             # Delete Equipment and their relationships
-            result = session.run(
-                "MATCH (e:Equipment) DETACH DELETE e RETURN count(e) as count"
-            )
-            counts["Equipment"] = result.single()["count"]
+            counts["Equipment"] = self._batched_delete(session, "MATCH (n:Equipment)")
 
             # Delete UDTs and their member tags
-            result = session.run(
-                """
-                MATCH (u:UDT)
-                OPTIONAL MATCH (u)-[:HAS_MEMBER]->(t:Tag)
-                DETACH DELETE u, t
-                RETURN count(DISTINCT u) as count
-                """
-            )
-            counts["UDT"] = result.single()["count"]
+            self._batched_delete(session, "MATCH (:UDT)-[:HAS_MEMBER]->(n:Tag)")
+            counts["UDT"] = self._batched_delete(session, "MATCH (n:UDT)")
 
             # Delete ScadaTags (standalone SCADA tags)
-            result = session.run(
-                "MATCH (t:ScadaTag) DETACH DELETE t RETURN count(t) as count"
-            )
-            counts["ScadaTag"] = result.single()["count"]
+            counts["ScadaTag"] = self._batched_delete(session, "MATCH (n:ScadaTag)")
 
             # Delete EndToEndFlow nodes (cross-system)
-            result = session.run(
-                "MATCH (f:EndToEndFlow) DETACH DELETE f RETURN count(f) as count"
+            counts["EndToEndFlow"] = self._batched_delete(
+                session, "MATCH (n:EndToEndFlow)"
             )
-            counts["EndToEndFlow"] = result.single()["count"]
 
             # Delete SystemOverview (cross-system)
-            result = session.run(
-                "MATCH (s:SystemOverview) DETACH DELETE s RETURN count(s) as count"
+            counts["SystemOverview"] = self._batched_delete(
+                session, "MATCH (n:SystemOverview)"
             )
-            counts["SystemOverview"] = result.single()["count"]
 
             return counts
 
@@ -415,50 +1550,44 @@ class OntologyGraph:
         Returns:
             Dict with counts of deleted nodes by type
         """
+        self.clear_cache()
         with self.session() as session:
             counts = {}
 
             # Delete MAPS_TO_SCADA relationships first (cross-system links)
-            result = session.run(
-                "MATCH ()-[r:MAPS_TO_SCADA]->() DELETE r RETURN count(r) as count"
+            counts["MAPS_TO_SCADA_relationships"] = self._batched_delete(
+                session, "MATCH ()-[n:MAPS_TO_SCADA]->()", "DELETE n"
             )
-            counts["MAPS_TO_SCADA_relationships"] = result.single()["count"]
 
             # Delete EndToEndFlow nodes (cross-system)
-            result = session.run(
-                "MATCH (f:EndToEndFlow) DETACH DELETE f RETURN count(f) as count"
+            counts["EndToEndFlow"] = self._batched_delete(
+                session, "MATCH (n:EndToEndFlow)"
             )
-            counts["EndToEndFlow"] = result.single()["count"]
 
             # Delete SystemOverview (cross-system)
-            result = session.run(
-                "MATCH (s:SystemOverview) DETACH DELETE s RETURN count(s) as count"
-            )
-            counts["SystemOverview"] = result.single()["count"]
-
-            # Delete AOIs and all their related nodes
-            result = session.run(
-                """
-                MATCH (a:AOI)
-                OPTIONAL MATCH (a)-[:HAS_TAG]->(t:Tag)
-                OPTIONAL MATCH (a)-[:HAS_PATTERN]->(p:ControlPattern)
-                OPTIONAL MATCH (a)-[:HAS_FLOW]->(f:DataFlow)
-                OPTIONAL MATCH (a)-[:SAFETY_CRITICAL]->(s:SafetyElement)
-                OPTIONAL MATCH (a)-[:HAS_SYMPTOM]->(sym:FaultSymptom)
-                OPTIONAL MATCH (sym)-[:CAUSED_BY]->(c:FaultCause)
-                OPTIONAL MATCH (a)-[:HAS_INTENT]->(i:Intent)
-                OPTIONAL MATCH (a)-[:HAS_PHRASE]->(op:OperatorPhrase)
-                DETACH DELETE a, t, p, f, s, sym, c, i, op
-                RETURN count(DISTINCT a) as count
-                """
-            )
-            counts["AOI"] = result.single()["count"]
+            counts["SystemOverview"] = self._batched_delete(
+                session, "MATCH (n:SystemOverview)"
+            )
+
+            # Delete all nodes hanging off AOIs (causes before their symptoms),
+            # then the AOIs themselves
+            for match in (
+                "MATCH (:AOI)-[:HAS_SYMPTOM]->(:FaultSymptom)-[:CAUSED_BY]->(n:FaultCause)",
+                "MATCH (:AOI)-[:HAS_SYMPTOM]->(n:FaultSymptom)",
+                "MATCH (:AOI)-[:HAS_TAG]->(n:Tag)",
+                "MATCH (:AOI)-[:HAS_PATTERN]->(n:ControlPattern)",
+                "MATCH (:AOI)-[:HAS_FLOW]->(n:DataFlow)",
+                "MATCH (:AOI)-[:SAFETY_CRITICAL]->(n:SafetyElement)",
+                "MATCH (:AOI)-[:HAS_INTENT]->(n:Intent)",
+                "MATCH (:AOI)-[:HAS_PHRASE]->(n:OperatorPhrase)",
+            ):
+                self._batched_delete(session, match)
+            counts["AOI"] = self._batched_delete(session, "MATCH (n:AOI)")
 
             # Delete CommonPhrases (operator dictionary)
-            result = session.run(
-                "MATCH (p:CommonPhrase) DETACH DELETE p RETURN count(p) as count"
+            counts["CommonPhrase"] = self._batched_delete(
+                session, "MATCH (n:CommonPhrase)"
             )
-            counts["CommonPhrase"] = result.single()["count"]
 
             return counts
 
@@ -475,28 +1604,24 @@ class OntologyGraph:
             counts = {}
 
             # Delete MAPS_TO_SCADA relationships
-            result = session.run(
-                "MATCH ()-[r:MAPS_TO_SCADA]->() DELETE r RETURN count(r) as count"
+            counts["MAPS_TO_SCADA_relationships"] = self._batched_delete(
+                session, "MATCH ()-[n:MAPS_TO_SCADA]->()", "DELETE n"
             )
-            counts["MAPS_TO_SCADA_relationships"] = result.single()["count"]
 
             # Delete EndToEndFlow nodes
-            result = session.run(
-                "MATCH (f:EndToEndFlow) DETACH DELETE f RETURN count(f) as count"
+            counts["EndToEndFlow"] = self._batched_delete(
+                session, "MATCH (n:EndToEndFlow)"
             )
-            counts["EndToEndFlow"] = result.single()["count"]
 
             # Delete SystemOverview
-            result = session.run(
-                "MATCH (s:SystemOverview) DETACH DELETE s RETURN count(s) as count"
+            counts["SystemOverview"] = self._batched_delete(
+                session, "MATCH (n:SystemOverview)"
             )
-            counts["SystemOverview"] = result.single()["count"]
 
             # Delete CommonPhrases (operator dictionary)
-            result = session.run(
-                "MATCH (p:CommonPhrase) DETACH DELETE p RETURN count(p) as count"
+            counts["CommonPhrase"] = self._batched_delete(
+                session, "MATCH (n:CommonPhrase)"
             )
-            counts["CommonPhrase"] = result.single()["count"]
 
             return counts
 
@@ -512,6 +1637,8 @@ class OntologyGraph:
         metadata: Optional[Dict] = None,
         analysis: Optional[Dict] = None,
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
+        analysis_hash: Optional[str] = None,
     ) -> str:
         """
         Create an AOI node with all its related data.
@@ -523,53 +1650,66 @@ class OntologyGraph:
             metadata: Metadata dict (revision, vendor, description)
             analysis: Analysis dict (purpose, tags, patterns, etc.)
             semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
+            session: Optional session or transaction to run in (see bulk())
+            analysis_hash: Hash of the analyzer input that produced *analysis*,
+                so unchanged sources can reuse it (see get_aoi_by_analysis_hash)
 
         Returns:
             The AOI name.
         """
         purpose = (analysis or {}).get("purpose", "")
-
-        with self.session() as session:
-            # Create main AOI node with semantic_status tracking
-            result = session.run(
-                """
-                MERGE (a:AOI {name: $name})
-                SET a.type = $type,
-                    a.source_file = $source_file,
-                    a.revision = $revision,
-                    a.vendor = $vendor,
-                    a.description = $description
-                WITH a
-                // Set semantic_status to 'pending' only if not already set
-                SET a.semantic_status = COALESCE(a.semantic_status, $semantic_status)
-                WITH a
-                // Update purpose and mark complete if purpose is provided
-                FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
-                    SET a.purpose = $purpose,
-                        a.semantic_status = 'complete',
-                        a.analyzed_at = datetime()
+        self._invalidate_items("AOI", [name])
+
+        with self._use_session(session) as session:
+            # Create main AOI node with semantic_status tracking; a non-empty
+            # purpose means analysis is done and the AOI is marked complete
+            params = {
+                "name": name,
+                "type": aoi_type,
+                "source_file": source_file,
+                "revision": (metadata or {}).get("revision", ""),
+                "vendor": (metadata or {}).get("vendor", ""),
+                "description": (metadata or {}).get("description", ""),
+            }
+            if purpose:
+                session.run(
+                    _CREATE_AOI_ANALYZED,
+                    {
+                        **params,
+                        "purpose": purpose,
+                        "analyzed_at": datetime.now(timezone.utc),
+                        "analysis_hash": analysis_hash,
+                    },
+                )
+            else:
+                session.run(
+                    _CREATE_AOI_PENDING,
+                    {**params, "semantic_status": semantic_status},
                 )
-                RETURN a.name as name
-            """,
-                {
-                    "name": name,
-                    "type": aoi_type,
-                    "source_file": source_file,
-                    "revision": (metadata or {}).get("revision", ""),
-                    "vendor": (metadata or {}).get("vendor", ""),
-                    "description": (metadata or {}).get("description", ""),
-                    "purpose": purpose,
-                    "semantic_status": semantic_status,
-                },
-            )
 
             # Create tags
             tags = (analysis or {}).get("tags", {})
             for tag_name, tag_desc in tags.items():
                 self._create_tag(session, name, tag_name, tag_desc)
 
-            # Create tag relationships
+            # Create tag relationships. Tags only mentioned as relationship
+            # endpoints get their node and HAS_TAG edge up front, so each
+            # relationship write only has to MATCH its two tags.
             relationships = (analysis or {}).get("relationships", [])
+            endpoint_tags = {
+                rel.get(end, "") for rel in relationships for end in ("from", "to")
+            }
+            missing_tags = sorted(endpoint_tags.difference(tags))
+            if missing_tags:
+                session.run(
+                    """
+                    MATCH (a:AOI {name: $aoi_name})
+                    UNWIND $tag_names AS tag_name
+                    MERGE (t:Tag {name: tag_name, aoi_name: $aoi_name})
+                    MERGE (a)-[:HAS_TAG]->(t)
+                """,
+                    {"aoi_name": name, "tag_names": missing_tags},
+                )
             for rel in relationships:
                 self._create_tag_relationship(session, name, rel)
 
@@ -590,6 +1730,167 @@ class OntologyGraph:
 
             return name
 
+    def create_aois_bulk(
+        self,
+        aois: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many AOIs and their related nodes in one transaction.
+
+        Each kind of node is written with a single UNWIND statement over all
+        AOIs (tag relationships take one statement per relationship type), so
+        the write cost no longer grows with one commit per AOI.
+
+        Args:
+            aois: Dicts with create_aoi's arguments: name, type, source_file,
+                and optional metadata, analysis, semantic_status, analysis_hash
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of AOIs written
+        """
+        rows: Dict[str, List[Dict]] = {
+            key: []
+            for key in (
+                "analyzed",
+                "pending",
+                "tags",
+                "endpoint_tags",
+                "patterns",
+                "flows",
+                "elements",
+            )
+        }
+        rels: Dict[str, List[Dict]] = {}
+        for aoi in aois:
+            name = aoi.get("name")
+            if not name:
+                continue
+            analysis = aoi.get("analysis") or {}
+            row = _aoi_node_row(aoi)
+            purpose = analysis.get("purpose", "")
+            if purpose:
+                row["purpose"] = purpose
+                row["analysis_hash"] = aoi.get("analysis_hash")
+                rows["analyzed"].append(row)
+            else:
+                row["semantic_status"] = aoi.get("semantic_status") or "pending"
+                rows["pending"].append(row)
+
+            tags = analysis.get("tags", {})
+            rows["tags"].extend(
+                {"aoi": name, "name": tag, "description": desc}
+                for tag, desc in tags.items()
+            )
+            endpoints = set()
+            for rel in analysis.get("relationships", []):
+                endpoints.update((rel.get("from", ""), rel.get("to", "")))
+                rel_type = rel.get("relationship_type", "RELATES_TO")
+                rels.setdefault(_sanitize_rel_type(rel_type), []).append(
+                    {
+                        "aoi": name,
+                        "from": rel.get("from", ""),
+                        "to": rel.get("to", ""),
+                        "description": rel.get("description", ""),
+                    }
+                )
+            rows["endpoint_tags"].extend(
+                {"aoi": name, "name": tag} for tag in sorted(endpoints.difference(tags))
+            )
+            rows["patterns"].extend(
+                _control_pattern_row(name, pattern)
+                for pattern in analysis.get("control_patterns", [])
+            )
+            rows["flows"].extend(
+                _data_flow_row(name, flow) for flow in analysis.get("data_flows", [])
+            )
+            rows["elements"].extend(
+                _safety_element_row(name, element)
+                for element in analysis.get("safety_critical", [])
+            )
+
+        count = len(rows["analyzed"]) + len(rows["pending"])
+        if count:
+            self._invalidate_items(
+                "AOI", [row["name"] for row in rows["analyzed"] + rows["pending"]]
+            )
+            self._execute_write(session, self._write_aois, rows, rels)
+        return count
+
+    def create_aoi_stub(
+        self,
+        name: str,
+        aoi_type: str,
+        source_file: str,
+        metadata: Optional[Dict] = None,
+        session: Optional[Session] = None,
+    ) -> str:
+        """Create a pending AOI placeholder for a later analysis pass.
+
+        Unlike create_aoi with no analysis, an AOI that already exists is
+        left as it is (only a missing semantic_status is set to 'pending').
+        """
+        self.create_aoi_stubs_bulk(
+            [
+                {
+                    "name": name,
+                    "type": aoi_type,
+                    "source_file": source_file,
+                    "metadata": metadata,
+                }
+            ],
+            session=session,
+        )
+        return name
+
+    def create_aoi_stubs_bulk(
+        self,
+        aois: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many pending AOI placeholders (see create_aoi_stub) at once.
+
+        Args:
+            aois: Dicts with name, type, source_file and optional metadata
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of AOIs written
+        """
+        rows = [_aoi_node_row(aoi) for aoi in aois if aoi.get("name")]
+        if rows:
+            self._invalidate_items("AOI", [row["name"] for row in rows])
+            self._execute_write(
+                session, self._run_rows, _CREATE_AOI_STUBS_BULK, {"aois": rows}
+            )
+        return len(rows)
+
+    @staticmethod
+    def _write_aois(tx, rows: Dict[str, List[Dict]], rels: Dict[str, List[Dict]]):
+        """Transaction function for create_aois_bulk."""
+        if rows["analyzed"]:
+            tx.run(
+                _CREATE_AOIS_ANALYZED_BULK,
+                {"aois": rows["analyzed"], "analyzed_at": datetime.now(timezone.utc)},
+            )
+        if rows["pending"]:
+            tx.run(_CREATE_AOIS_PENDING_BULK, {"aois": rows["pending"]})
+        if rows["tags"]:
+            tx.run(_CREATE_AOI_TAGS_BULK, {"tags": rows["tags"]})
+        if rows["endpoint_tags"]:
+            tx.run(_LINK_AOI_TAGS_BULK, {"tags": rows["endpoint_tags"]})
+        for rel_type, rel_rows in rels.items():
+            tx.run(
+                _CREATE_TAG_RELATIONSHIPS_BULK.format(rel_type=rel_type),
+                {"rels": rel_rows},
+            )
+        if rows["patterns"]:
+            tx.run(_CREATE_CONTROL_PATTERNS_BULK, {"patterns": rows["patterns"]})
+        if rows["flows"]:
+            tx.run(_CREATE_DATA_FLOWS_BULK, {"flows": rows["flows"]})
+        if rows["elements"]:
+            tx.run(_CREATE_SAFETY_ELEMENTS_BULK, {"elements": rows["elements"]})
+
     def _create_tag(
         self, session: Session, aoi_name: str, tag_name: str, description: str
     ) -> None:
@@ -614,20 +1915,14 @@ class OntologyGraph:
         """Create a relationship between tags."""
         from_tag = rel.get("from", "")
         to_tag = rel.get("to", "")
-        rel_type = rel.get("relationship_type", "RELATES_TO").upper().replace(" ", "_")
+        rel_type = _sanitize_rel_type(rel.get("relationship_type", "RELATES_TO"))
         description = rel.get("description", "")
 
-        # Sanitize relationship type for Neo4j
-        rel_type = "".join(c if c.isalnum() or c == "_" else "_" for c in rel_type)
-
-        # Use APOC or dynamic relationship - fallback to property-based approach
+        # Both tags are already linked to the AOI by create_aoi
         session.run(
             f"""
-            MATCH (a:AOI {{name: $aoi_name}})
-            MERGE (from:Tag {{name: $from_tag, aoi_name: $aoi_name}})
-            MERGE (to:Tag {{name: $to_tag, aoi_name: $aoi_name}})
-            MERGE (a)-[:HAS_TAG]->(from)
-            MERGE (a)-[:HAS_TAG]->(to)
+            MATCH (from:Tag {{name: $from_tag, aoi_name: $aoi_name}})
+            MATCH (to:Tag {{name: $to_tag, aoi_name: $aoi_name}})
             MERGE (from)-[r:{rel_type}]->(to)
             SET r.description = $description
         """,
@@ -643,12 +1938,7 @@ class OntologyGraph:
         self, session: Session, aoi_name: str, pattern: Union[Dict, str]
     ) -> None:
         """Create a control pattern node."""
-        if isinstance(pattern, dict):
-            pattern_name = pattern.get("pattern", pattern.get("name", str(pattern)))
-            description = pattern.get("description", "")
-        else:
-            pattern_name = str(pattern)
-            description = ""
+        row = _control_pattern_row(aoi_name, pattern)
 
         session.run(
             """
@@ -659,8 +1949,8 @@ class OntologyGraph:
         """,
             {
                 "aoi_name": aoi_name,
-                "pattern_name": pattern_name,
-                "description": description,
+                "pattern_name": row["name"],
+                "description": row["description"],
             },
         )
 
@@ -668,12 +1958,7 @@ class OntologyGraph:
         self, session: Session, aoi_name: str, flow: Union[Dict, str]
     ) -> None:
         """Create a data flow node."""
-        if isinstance(flow, dict):
-            path = flow.get("path", "")
-            description = flow.get("description", "")
-        else:
-            path = str(flow)
-            description = ""
+        row = _data_flow_row(aoi_name, flow)
 
         session.run(
             """
@@ -684,8 +1969,8 @@ class OntologyGraph:
         """,
             {
                 "aoi_name": aoi_name,
-                "path": path,
-                "description": description,
+                "path": row["path"],
+                "description": row["description"],
             },
         )
 
@@ -693,14 +1978,7 @@ class OntologyGraph:
         self, session: Session, aoi_name: str, element: Union[Dict, str]
     ) -> None:
         """Create a safety-critical element node."""
-        if isinstance(element, dict):
-            elem_name = element.get("element", element.get("name", str(element)))
-            criticality = element.get("criticality", "unknown")
-            reason = element.get("reason", "")
-        else:
-            elem_name = str(element)
-            criticality = "unknown"
-            reason = ""
+        row = _safety_element_row(aoi_name, element)
 
         session.run(
             """
@@ -711,9 +1989,9 @@ class OntologyGraph:
         """,
             {
                 "aoi_name": aoi_name,
-                "elem_name": elem_name,
-                "criticality": criticality,
-                "reason": reason,
+                "elem_name": row["name"],
+                "criticality": row["criticality"],
+                "reason": row["reason"],
             },
         )
 
@@ -728,6 +2006,7 @@ class OntologyGraph:
         rel_type: str = "INSTANTIATES",
         via_tag: str = "",
         description: str = "",
+        session: Optional[Session] = None,
     ) -> bool:
         """
         Create a dependency relationship between two AOI/FB nodes.
@@ -739,6 +2018,7 @@ class OntologyGraph:
             via_tag:   The variable name that caused the dependency
                        (e.g. 'valve1' whose type is 'ValveStatus').
             description: Optional human-readable note.
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if the relationship was created, False if either node is missing.
@@ -746,7 +2026,7 @@ class OntologyGraph:
         if rel_type not in ("INSTANTIATES", "USES_TYPE"):
             rel_type = "INSTANTIATES"
 
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 f"""
                 MATCH (a:AOI {{name: $from_aoi}})
@@ -766,7 +2046,9 @@ class OntologyGraph:
             return result.single() is not None
 
     def create_aoi_dependencies_batch(
-        self, dependencies: List[Dict]
+        self,
+        dependencies: List[Dict],
+        session: Optional[Session] = None,
     ) -> int:
         """
         Batch-create AOI dependency relationships.
@@ -780,7 +2062,7 @@ class OntologyGraph:
         if not dependencies:
             return 0
 
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 UNWIND $deps AS d
@@ -827,7 +2109,7 @@ class OntologyGraph:
         Returns:
             List of dicts with from_aoi, to_aoi, rel_type, via_tag, description.
         """
-        with self.session() as session:
+        with self.read_session() as session:
             if name:
                 result = session.run(
                     """
@@ -857,7 +2139,7 @@ class OntologyGraph:
         Return name and type for every AOI node.
         Useful for building a lookup table for cross-referencing.
         """
-        with self.session() as session:
+        with self.read_session() as session:
             result = session.run(
                 """
                 MATCH (a:AOI)
@@ -869,123 +2151,200 @@ class OntologyGraph:
 
     def get_aoi(self, name: str) -> Optional[Dict]:
         """Get an AOI with all its related data."""
-        with self.session() as session:
-            # Get main AOI
-            result = session.run(
-                """
-                MATCH (a:AOI {name: $name})
-                RETURN a
-            """,
-                {"name": name},
-            )
-            record = result.single()
-            if not record:
-                return None
+        with self.read_session() as session:
+            return session.execute_read(self._read_aoi, name)
 
-            aoi_node = dict(record["a"])
+    def get_aoi_by_analysis_hash(self, analysis_hash: str) -> Optional[Dict]:
+        """Get the AOI whose stored analysis was produced from this input hash."""
+        with self.read_session() as session:
+            return session.execute_read(self._read_aoi_by_hash, analysis_hash)
 
-            # Get tags
-            tags_result = session.run(
-                """
-                MATCH (a:AOI {name: $name})-[:HAS_TAG]->(t:Tag)
-                RETURN t.name as name, t.description as description
-            """,
-                {"name": name},
-            )
-            tags = {}
-            for r in tags_result:
-                tag_name = r["name"]
-                # Handle case where name might be a list (shouldn't happen but be defensive)
-                if isinstance(tag_name, list):
-                    tag_name = tag_name[0] if tag_name else "unknown"
-                if tag_name:
-                    tags[tag_name] = r["description"] or ""
-
-            # Get tag relationships
-            rels_result = session.run(
-                """
-                MATCH (a:AOI {name: $name})-[:HAS_TAG]->(from:Tag)-[r]->(to:Tag)
-                WHERE type(r) <> 'HAS_TAG'
-                RETURN from.name as from_tag, to.name as to_tag, 
-                       type(r) as rel_type, r.description as description
-            """,
-                {"name": name},
-            )
-            relationships = [
-                {
-                    "from": r["from_tag"],
-                    "to": r["to_tag"],
-                    "relationship_type": r["rel_type"],
-                    "description": r["description"],
-                }
-                for r in rels_result
-            ]
+    @staticmethod
+    def _read_aoi_by_hash(tx, analysis_hash: str) -> Optional[Dict]:
+        record = tx.run(
+            """
+            MATCH (a:AOI {analysis_hash: $analysis_hash})
+            RETURN a.name as name
+            LIMIT 1
+        """,
+            {"analysis_hash": analysis_hash},
+        ).single()
+        if not record:
+            return None
+        return OntologyGraph._read_aoi(tx, record["name"])
+
+    @staticmethod
+    def _read_aoi(tx, name: str) -> Optional[Dict]:
+        """Read an AOI and its related nodes inside one read transaction."""
+        # Get main AOI
+        result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})
+            RETURN a
+        """,
+            {"name": name},
+        )
+        record = result.single()
+        if not record:
+            return None
 
-            # Get patterns
-            patterns_result = session.run(
-                """
-                MATCH (a:AOI {name: $name})-[:HAS_PATTERN]->(p:ControlPattern)
-                RETURN p.name as name, p.description as description
-            """,
-                {"name": name},
-            )
-            patterns = [
-                {"pattern": r["name"], "description": r["description"]}
-                for r in patterns_result
-            ]
+        aoi_node = dict(record["a"])
 
-            # Get data flows
-            flows_result = session.run(
-                """
-                MATCH (a:AOI {name: $name})-[:HAS_FLOW]->(f:DataFlow)
-                RETURN f.path as path, f.description as description
-            """,
-                {"name": name},
-            )
-            flows = [
-                {"path": r["path"], "description": r["description"]}
-                for r in flows_result
-            ]
+        # Get tags
+        tags_result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})-[:HAS_TAG]->(t:Tag)
+            RETURN t.name as name, t.description as description
+        """,
+            {"name": name},
+        )
+        tags = OntologyGraph._tags_to_dict(tags_result.data())
 
-            # Get safety elements
-            safety_result = session.run(
-                """
-                MATCH (a:AOI {name: $name})-[:SAFETY_CRITICAL]->(s:SafetyElement)
-                RETURN s.name as element, s.criticality as criticality, s.reason as reason
-            """,
-                {"name": name},
-            )
-            safety = [dict(r) for r in safety_result]
+        # Get tag relationships
+        rels_result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})-[:HAS_TAG]->(from:Tag)-[r]->(to:Tag)
+            WHERE type(r) <> 'HAS_TAG'
+            RETURN from.name as `from`, to.name as to,
+                   type(r) as relationship_type, r.description as description
+        """,
+            {"name": name},
+        )
+        relationships = rels_result.data()
 
-            return {
-                "name": aoi_node.get("name"),
-                "type": aoi_node.get("type"),
-                "source_file": aoi_node.get("source_file"),
-                "metadata": {
-                    "revision": aoi_node.get("revision"),
-                    "vendor": aoi_node.get("vendor"),
-                    "description": aoi_node.get("description"),
-                },
-                "analysis": {
-                    "purpose": aoi_node.get("purpose"),
-                    "tags": tags,
-                    "relationships": relationships,
-                    "control_patterns": patterns,
-                    "data_flows": flows,
-                    "safety_critical": safety,
-                },
-            }
+        # Get patterns
+        patterns_result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})-[:HAS_PATTERN]->(p:ControlPattern)
+            RETURN p.name as pattern, p.description as description
+        """,
+            {"name": name},
+        )
+        patterns = patterns_result.data()
+
+        # Get data flows
+        flows_result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})-[:HAS_FLOW]->(f:DataFlow)
+            RETURN f.path as path, f.description as description
+        """,
+            {"name": name},
+        )
+        flows = flows_result.data()
+
+        # Get safety elements
+        safety_result = tx.run(
+            """
+            MATCH (a:AOI {name: $name})-[:SAFETY_CRITICAL]->(s:SafetyElement)
+            RETURN s.name as element, s.criticality as criticality, s.reason as reason
+        """,
+            {"name": name},
+        )
+        safety = safety_result.data()
+
+        return OntologyGraph._assemble_aoi(
+            aoi_node, tags, relationships, patterns, flows, safety
+        )
+
+    @staticmethod
+    def _tags_to_dict(tag_rows) -> Dict[str, str]:
+        """Build the {tag_name: description} map from name/description rows."""
+        tags = {}
+        for r in tag_rows:
+            tag_name = r["name"]
+            # Handle case where name might be a list (shouldn't happen but be defensive)
+            if isinstance(tag_name, list):
+                tag_name = tag_name[0] if tag_name else "unknown"
+            if tag_name:
+                tags[tag_name] = r["description"] or ""
+        return tags
+
+    @staticmethod
+    def _assemble_aoi(
+        aoi_node: Dict,
+        tags: Dict[str, str],
+        relationships: List[Dict],
+        patterns: List[Dict],
+        flows: List[Dict],
+        safety: List[Dict],
+    ) -> Dict:
+        """Shape AOI node properties and related rows into the ontology dict."""
+        return {
+            "name": aoi_node.get("name"),
+            "type": aoi_node.get("type"),
+            "source_file": aoi_node.get("source_file"),
+            "metadata": {
+                "revision": aoi_node.get("revision"),
+                "vendor": aoi_node.get("vendor"),
+                "description": aoi_node.get("description"),
+            },
+            "analysis": {
+                "purpose": aoi_node.get("purpose"),
+                "tags": tags,
+                "relationships": relationships,
+                "control_patterns": patterns,
+                "data_flows": flows,
+                "safety_critical": safety,
+            },
+        }
+
+    def iter_all_aois(self, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """Yield every AOI with its data, one at a time.
+
+        A single query gathers each AOI's related nodes with pattern
+        comprehensions; records are streamed from the driver so memory stays
+        flat regardless of the number of AOIs.
+
+        With *page_size*, AOIs are instead read in name order, page_size per
+        short read transaction (keyset paging on the name constraint, so the
+        one parameterized plan is reused and no long transaction is held).
+        """
+        if page_size:
+            yield from self._iter_aoi_pages(page_size)
+            return
+        # Each row carries an AOI's nested lists, so pull fewer per round-trip
+        with self.read_session(fetch_size=STREAM_FETCH_SIZE) as session:
+            result = session.run(_ITER_ALL_AOIS)
+            for record in result:
+                yield self._assemble_aoi_row(record)
+
+    def _iter_aoi_pages(self, page_size: int) -> Iterator[Dict]:
+        """Yield AOIs page by page, see iter_all_aois."""
+        after = ""
+        while True:
+            with self.read_session() as session:
+                rows = session.execute_read(
+                    self._run_rows,
+                    _PAGE_ALL_AOIS,
+                    {"after": after, "limit": page_size},
+                )
+            for row in rows:
+                yield self._assemble_aoi_row(row)
+            if len(rows) < page_size:
+                return
+            after = rows[-1]["a"]["name"]
+
+    @classmethod
+    def _assemble_aoi_row(cls, record: Any) -> Dict:
+        """Assemble one _ALL_AOIS_PROJECTION row into the ontology dict."""
+        return cls._assemble_aoi(
+            dict(record["a"]),
+            cls._tags_to_dict(record["tags"]),
+            record["relationships"],
+            record["patterns"],
+            record["flows"],
+            record["safety"],
+        )
 
     def get_all_aois(self) -> List[Dict]:
         """Get all AOIs with their data."""
-        with self.session() as session:
-            result = session.run("MATCH (a:AOI) RETURN a.name as name")
-            names = [r["name"] for r in result]
-
-        return [self.get_aoi(name) for name in names]
+        return list(self.iter_all_aois())
 
     def delete_aoi(self, name: str) -> bool:
         """Delete an AOI and all its related nodes."""
+        # Other items' contexts can include the AOI's SCADA mappings
+        self._invalidate_items("AOI")
+        self._trouble_cache.pop(name, None)
         with self.session() as session:
             result = session.run(
                 """
@@ -1008,258 +2367,189 @@ class OntologyGraph:
     # Troubleshooting Operations
     # =========================================================================
 
-    def add_troubleshooting(self, aoi_name: str, troubleshooting: Dict) -> None:
-        """Add troubleshooting data to an AOI and mark it as enriched."""
-        with self.session() as session:
-            # Mark AOI as enriched
-            session.run(
-                """
-                MATCH (a:AOI {name: $aoi_name})
-                SET a.troubleshooting_enriched = true,
-                    a.enriched_at = datetime()
-                """,
-                {"aoi_name": aoi_name},
-            )
+    def add_troubleshooting(
+        self,
+        aoi_name: str,
+        troubleshooting: Dict,
+        session: Optional[Session] = None,
+    ) -> None:
+        """Add troubleshooting data to an AOI and mark it as enriched.
 
-            # Fault tree
-            fault_tree = troubleshooting.get("fault_tree", [])
-            for fault in fault_tree:
-                self._create_fault_symptom(session, aoi_name, fault)
+        All writes for the AOI are committed together in one transaction.
+        """
+        self._trouble_cache.pop(aoi_name, None)
+        self._execute_write(
+            session, self._write_troubleshooting, aoi_name, troubleshooting
+        )
+
+    def _write_troubleshooting(self, tx, aoi_name: str, troubleshooting: Dict) -> None:
+        """Transaction function for add_troubleshooting."""
+        # Mark AOI as enriched and store expected states in the same statement
+        expected_states = troubleshooting.get("expected_states", {})
+        tx.run(
+            _MARK_TROUBLESHOOTING_ENRICHED,
+            {
+                "aoi_name": aoi_name,
+                "enriched_at": datetime.now(timezone.utc),
+                "states": json.dumps(expected_states) if expected_states else None,
+            },
+        )
 
-            # Intents
-            intents = troubleshooting.get("intents", {})
-            for intent_name, intent_data in intents.items():
-                self._create_intent(session, aoi_name, intent_name, intent_data)
+        # Fault tree
+        fault_tree = troubleshooting.get("fault_tree", [])
+        if fault_tree:
+            self._create_fault_symptoms(tx, aoi_name, fault_tree)
 
-            # Operator phrases
-            phrases = troubleshooting.get("operator_phrases", [])
-            for phrase in phrases:
-                self._create_operator_phrase(session, aoi_name, phrase)
+        # Intents
+        intents = troubleshooting.get("intents", {})
+        if intents:
+            self._create_intents(tx, aoi_name, intents)
 
-            # Expected states
-            expected_states = troubleshooting.get("expected_states", {})
-            if expected_states:
-                session.run(
-                    """
-                    MATCH (a:AOI {name: $aoi_name})
-                    SET a.expected_states = $states
-                """,
-                    {
-                        "aoi_name": aoi_name,
-                        "states": str(expected_states),
-                    },
-                )
+        # Operator phrases
+        phrases = troubleshooting.get("operator_phrases", [])
+        if phrases:
+            self._create_operator_phrases(tx, aoi_name, phrases)
 
-            # Diagnostic tags
-            diagnostic_tags = troubleshooting.get("diagnostic_tags", [])
-            for diag in diagnostic_tags:
-                self._create_diagnostic_tag(session, aoi_name, diag)
+        # Diagnostic tags
+        diagnostic_tags = troubleshooting.get("diagnostic_tags", [])
+        if diagnostic_tags:
+            self._create_diagnostic_tags(tx, aoi_name, diagnostic_tags)
 
-    def _create_fault_symptom(
-        self, session: Session, aoi_name: str, fault: Dict
+    def _create_fault_symptoms(
+        self, session: Session, aoi_name: str, fault_tree: List[Dict]
     ) -> None:
-        """Create fault symptom and its causes."""
-        symptom = fault.get("symptom", "")
-        plc_indicators = fault.get("plc_indicators", [])
-        scada_indicators = fault.get("scada_indicators", [])
-        resolution_steps = fault.get("resolution_steps", [])
+        """Create all fault symptoms of an AOI and their causes in one statement."""
+        faults = [
+            {
+                "symptom": fault.get("symptom", ""),
+                "plc_indicators": fault.get("plc_indicators", []),
+                "scada_indicators": fault.get("scada_indicators", []),
+                "resolution_steps": fault.get("resolution_steps", []),
+                "possible_causes": [
+                    {
+                        "cause": cause_data.get("cause", ""),
+                        "likelihood": cause_data.get("likelihood", "unknown"),
+                        "check": cause_data.get("check", ""),
+                    }
+                    for cause_data in fault.get("possible_causes", [])
+                ],
+            }
+            for fault in fault_tree
+        ]
 
-        # Create symptom node
         session.run(
-            """
-            MATCH (a:AOI {name: $aoi_name})
-            MERGE (s:FaultSymptom {symptom: $symptom, aoi_name: $aoi_name})
-            SET s.plc_indicators = $plc_indicators,
-                s.scada_indicators = $scada_indicators,
-                s.resolution_steps = $resolution_steps
-            MERGE (a)-[:HAS_SYMPTOM]->(s)
-        """,
-            {
-                "aoi_name": aoi_name,
-                "symptom": symptom,
-                "plc_indicators": plc_indicators,
-                "scada_indicators": scada_indicators,
-                "resolution_steps": resolution_steps,
-            },
+            _CREATE_FAULT_SYMPTOMS,
+            {"aoi_name": aoi_name, "faults": faults},
         )
 
-        # Create causes
-        for cause_data in fault.get("possible_causes", []):
-            cause = cause_data.get("cause", "")
-            likelihood = cause_data.get("likelihood", "unknown")
-            check = cause_data.get("check", "")
-
-            session.run(
-                """
-                MATCH (s:FaultSymptom {symptom: $symptom, aoi_name: $aoi_name})
-                MERGE (c:FaultCause {cause: $cause, aoi_name: $aoi_name})
-                SET c.likelihood = $likelihood, c.check = $check
-                MERGE (s)-[:CAUSED_BY {likelihood: $likelihood}]->(c)
-            """,
-                {
-                    "aoi_name": aoi_name,
-                    "symptom": symptom,
-                    "cause": cause,
-                    "likelihood": likelihood,
-                    "check": check,
-                },
-            )
-
-    def _create_intent(
-        self, session: Session, aoi_name: str, intent_name: str, intent_data: Dict
+    def _create_intents(
+        self, session: Session, aoi_name: str, intents: Dict[str, Dict]
     ) -> None:
-        """Create an intent node."""
-        session.run(
-            """
-            MATCH (a:AOI {name: $aoi_name})
-            MERGE (i:Intent {name: $intent_name, aoi_name: $aoi_name})
-            SET i.what = $what,
-                i.why = $why,
-                i.consequence_if_missing = $consequence,
-                i.failure_symptom = $failure
-            MERGE (a)-[:HAS_INTENT]->(i)
-        """,
+        """Create all intent nodes of an AOI in one statement."""
+        rows = [
             {
-                "aoi_name": aoi_name,
-                "intent_name": intent_name,
+                "name": intent_name,
                 "what": intent_data.get("what", ""),
                 "why": intent_data.get("why", ""),
                 "consequence": intent_data.get("consequence_if_missing", ""),
                 "failure": intent_data.get("failure_symptom", ""),
-            },
+            }
+            for intent_name, intent_data in intents.items()
+        ]
+        session.run(
+            _CREATE_INTENTS,
+            {"aoi_name": aoi_name, "rows": rows},
         )
 
-    def _create_operator_phrase(
-        self, session: Session, aoi_name: str, phrase_data: Dict
+    def _create_operator_phrases(
+        self, session: Session, aoi_name: str, phrases: List[Dict]
     ) -> None:
-        """Create an operator phrase mapping."""
-        session.run(
-            """
-            MATCH (a:AOI {name: $aoi_name})
-            MERGE (p:OperatorPhrase {phrase: $phrase, aoi_name: $aoi_name})
-            SET p.means = $means,
-                p.check_first = $check_first,
-                p.related_tags = $related_tags
-            MERGE (a)-[:HAS_PHRASE]->(p)
-        """,
+        """Create all operator phrase mappings of an AOI in one statement."""
+        rows = [
             {
-                "aoi_name": aoi_name,
                 "phrase": phrase_data.get("phrase", ""),
                 "means": phrase_data.get("means", ""),
                 "check_first": phrase_data.get("check_first", ""),
                 "related_tags": phrase_data.get("related_tags", []),
-            },
+            }
+            for phrase_data in phrases
+        ]
+        session.run(
+            _CREATE_OPERATOR_PHRASES,
+            {"aoi_name": aoi_name, "rows": rows},
         )
 
-    def _create_diagnostic_tag(
-        self, session: Session, aoi_name: str, diag: Dict
+    def _create_diagnostic_tags(
+        self, session: Session, aoi_name: str, diagnostic_tags: List[Dict]
     ) -> None:
-        """Create a diagnostic tag entry."""
-        tag_name = diag.get("tag", "")
-        session.run(
-            """
-            MATCH (a:AOI {name: $aoi_name})
-            MERGE (t:Tag {name: $tag_name, aoi_name: $aoi_name})
-            SET t.normal_value = $normal_value,
-                t.meaning_if_abnormal = $meaning
-            MERGE (a)-[:HAS_TAG]->(t)
-        """,
+        """Create all diagnostic tag entries of an AOI in one statement."""
+        rows = [
             {
-                "aoi_name": aoi_name,
-                "tag_name": tag_name,
+                "tag": diag.get("tag", ""),
                 "normal_value": diag.get("normal_value", ""),
                 "meaning": diag.get("meaning_if_abnormal", ""),
-            },
+            }
+            for diag in diagnostic_tags
+        ]
+        session.run(
+            _CREATE_DIAGNOSTIC_TAGS,
+            {"aoi_name": aoi_name, "rows": rows},
         )
 
     def get_troubleshooting(self, aoi_name: str) -> Dict:
-        """Get troubleshooting data for an AOI."""
-        with self.session() as session:
-            # Fault tree
-            fault_result = session.run(
-                """
-                MATCH (a:AOI {name: $aoi_name})-[:HAS_SYMPTOM]->(s:FaultSymptom)
-                OPTIONAL MATCH (s)-[:CAUSED_BY]->(c:FaultCause)
-                RETURN s, collect(c) as causes
-            """,
-                {"aoi_name": aoi_name},
-            )
-
-            fault_tree = []
-            for record in fault_result:
-                symptom = dict(record["s"])
-                causes = [dict(c) for c in record["causes"] if c]
-                fault_tree.append(
-                    {
-                        "symptom": symptom.get("symptom"),
-                        "plc_indicators": symptom.get("plc_indicators", []),
-                        "scada_indicators": symptom.get("scada_indicators", []),
-                        "resolution_steps": symptom.get("resolution_steps", []),
-                        "possible_causes": [
-                            {
-                                "cause": c.get("cause"),
-                                "likelihood": c.get("likelihood"),
-                                "check": c.get("check"),
-                            }
-                            for c in causes
-                        ],
-                    }
-                )
+        """Get troubleshooting data for an AOI.
 
-            # Intents
-            intent_result = session.run(
-                """
-                MATCH (a:AOI {name: $aoi_name})-[:HAS_INTENT]->(i:Intent)
-                RETURN i
-            """,
-                {"aoi_name": aoi_name},
-            )
-            intents = {
-                r["i"]["name"]: {
-                    "what": r["i"].get("what"),
-                    "why": r["i"].get("why"),
-                    "consequence_if_missing": r["i"].get("consequence_if_missing"),
-                    "failure_symptom": r["i"].get("failure_symptom"),
-                }
-                for r in intent_result
+        Results are cached per AOI for TROUBLESHOOTING_CACHE_TTL seconds;
+        add_troubleshooting() invalidates the entry.
+        """
+        cached = _cache_lookup(
+            self._trouble_cache, aoi_name, TROUBLESHOOTING_CACHE_TTL
+        )
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        data = self._fetch_troubleshooting(aoi_name)
+        _cache_store(self._trouble_cache, aoi_name, data, TROUBLESHOOTING_CACHE_SIZE)
+        return copy.deepcopy(data)
+
+    def _fetch_troubleshooting(self, aoi_name: str) -> Dict:
+        """Read troubleshooting data for an AOI from Neo4j."""
+        with self.read_session() as session:
+            record = session.execute_read(self._read_troubleshooting, aoi_name)
+        return self._troubleshooting_from_record(record)
+
+    @staticmethod
+    def _read_troubleshooting(tx, aoi_name: str):
+        """Transaction function for get_troubleshooting."""
+        return tx.run(_GET_TROUBLESHOOTING, {"aoi_name": aoi_name}).single()
+
+    @staticmethod
+    def _troubleshooting_from_record(record) -> Dict:
+        """Build the get_troubleshooting dict from a _GET_TROUBLESHOOTING row."""
+        if not record:
+            return {
+                "fault_tree": [],
+                "intents": {},
+                "operator_phrases": [],
+                "diagnostic_tags": [],
+                "expected_states": {},
             }
 
-            # Operator phrases
-            phrase_result = session.run(
-                """
-                MATCH (a:AOI {name: $aoi_name})-[:HAS_PHRASE]->(p:OperatorPhrase)
-                RETURN p
-            """,
-                {"aoi_name": aoi_name},
-            )
-            phrases = [
-                {
-                    "phrase": r["p"].get("phrase"),
-                    "means": r["p"].get("means"),
-                    "check_first": r["p"].get("check_first"),
-                    "related_tags": r["p"].get("related_tags", []),
-                }
-                for r in phrase_result
-            ]
+        # Fields are projected in Cypher; rows only need converting to dicts
+        fault_tree = [dict(fault) for fault in record["faults"]]
+        intents = {i["name"]: dict(i["intent"]) for i in record["intents"]}
+        phrases = [dict(p) for p in record["phrases"]]
 
-            # Diagnostic tags
-            diag_result = session.run(
-                """
-                MATCH (a:AOI {name: $aoi_name})-[:HAS_TAG]->(t:Tag)
-                WHERE t.normal_value IS NOT NULL
-                RETURN t.name as tag, t.normal_value as normal_value, 
-                       t.meaning_if_abnormal as meaning_if_abnormal
-            """,
-                {"aoi_name": aoi_name},
-            )
-            diagnostic_tags = [dict(r) for r in diag_result]
+        # Expected states are stored as a JSON string on the AOI
+        expected_states = _load_json_property(record["expected_states"])
 
-            return {
-                "fault_tree": fault_tree,
-                "intents": intents,
-                "operator_phrases": phrases,
-                "diagnostic_tags": diagnostic_tags,
-            }
+        return {
+            "fault_tree": fault_tree,
+            "intents": intents,
+            "operator_phrases": phrases,
+            "diagnostic_tags": [dict(t) for t in record["diagnostic_tags"]],
+            "expected_states": expected_states or {},
+        }
 
     # =========================================================================
     # SCADA/Ignition Operations
@@ -1277,6 +2567,7 @@ class OntologyGraph:
         parent: Optional[str] = None,
         enabled: bool = True,
         inheritable: bool = False,
+        session: Optional[Session] = None,
     ) -> str:
         """Create a Project node with optional inheritance relationship.
 
@@ -1287,11 +2578,12 @@ class OntologyGraph:
             parent: Name of parent project for inheritance
             enabled: Whether project is enabled
             inheritable: Whether project can be inherited from
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Project name
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             # Create or update the project node
             session.run(
                 """
@@ -1512,6 +2804,7 @@ class OntologyGraph:
         scope: str = "A",
         script_text: str = "",
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a Script node and link to project.
 
@@ -1522,11 +2815,12 @@ class OntologyGraph:
             scope: Script scope (A=All, G=Gateway, C=Client, D=Designer)
             script_text: Full script code from code.py file
             semantic_status: Analysis status
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Script name
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (s:Script {name: $name})
@@ -1558,6 +2852,7 @@ class OntologyGraph:
         event_name: Optional[str] = None,
         script_preview: str = "",
         delay: Optional[int] = None,
+        session: Optional[Session] = None,
     ) -> str:
         """Create a GatewayEvent node and link to project.
 
@@ -1568,11 +2863,12 @@ class OntologyGraph:
             event_name: Name for timer/message handler
             script_preview: Preview of script code
             delay: Delay in ms for timer scripts
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Event name
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (e:GatewayEvent {name: $name})
@@ -1605,6 +2901,7 @@ class OntologyGraph:
         query_text: str = "",
         database: str = "",
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a NamedQuery node and link to project.
 
@@ -1616,11 +2913,12 @@ class OntologyGraph:
             query_text: Full SQL from query.sql file
             database: DB connection name this query targets
             semantic_status: Analysis status
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Query name
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (q:NamedQuery {name: $name})
@@ -1661,6 +2959,7 @@ class OntologyGraph:
         translator: str = "",
         max_active: int = 8,
         validation_query: str = "SELECT 1",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a DatabaseConnection node.
 
@@ -1674,11 +2973,12 @@ class OntologyGraph:
             translator: SQL translator type
             max_active: Max active connections in pool
             validation_query: Query used to validate connections
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Connection name
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (d:DatabaseConnection {name: $name})
@@ -1750,59 +3050,102 @@ class OntologyGraph:
         source_file: str = "",
         members: Optional[List[Dict]] = None,
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a UDT node.
 
         Args:
             name: UDT name
             purpose: Semantic description (empty if not yet analyzed)
-            source_file: Source file path
-            members: List of member tag definitions
-            semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
-        """
-        with self.session() as session:
-            # Only update semantic_status if purpose is being set (analysis complete)
-            # or if this is a new node
-            session.run(
-                """
-                MERGE (u:UDT {name: $name})
-                SET u.source_file = $source_file
-                WITH u
-                // Set semantic_status to 'pending' only if not already set
-                SET u.semantic_status = COALESCE(u.semantic_status, $semantic_status)
-                WITH u
-                // Update purpose and mark complete if purpose is provided
-                FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
-                    SET u.purpose = $purpose,
-                        u.semantic_status = 'complete',
-                        u.analyzed_at = datetime()
-                )
-            """,
-                {
-                    "name": name,
-                    "purpose": purpose,
-                    "source_file": source_file,
-                    "semantic_status": semantic_status,
-                },
+            source_file: Source file path
+            members: List of member tag definitions
+            semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
+            session: Optional session or transaction to run in (see bulk())
+        """
+        self._invalidate_items("UDT")
+        self._execute_write(
+            session,
+            self._write_udt,
+            name,
+            purpose,
+            source_file,
+            members,
+            semantic_status,
+        )
+        return name
+
+    @staticmethod
+    def _write_udt(
+        tx,
+        name: str,
+        purpose: str,
+        source_file: str,
+        members: Optional[List[Dict]],
+        semantic_status: str,
+    ) -> None:
+        """Transaction function for create_udt: UDT node plus all member tags."""
+        # Only update semantic_status if purpose is being set (analysis complete)
+        # or if this is a new node
+        tx.run(
+            _CREATE_UDT,
+            {
+                "name": name,
+                "purpose": purpose,
+                "source_file": source_file,
+                "semantic_status": semantic_status,
+            },
+        )
+
+        # Create member tags
+        if members:
+            tx.run(
+                _CREATE_UDT_MEMBERS,
+                {"udt_name": name, "members": _udt_member_rows(members)},
             )
 
-            # Create member tags
-            for member in members or []:
-                session.run(
-                    """
-                    MATCH (u:UDT {name: $udt_name})
-                    MERGE (t:Tag {name: $tag_name, udt_name: $udt_name})
-                    SET t.data_type = $data_type, t.tag_type = $tag_type
-                    MERGE (u)-[:HAS_MEMBER]->(t)
-                """,
-                    {
-                        "udt_name": name,
-                        "tag_name": member.get("name", ""),
-                        "data_type": member.get("data_type", ""),
-                        "tag_type": member.get("tag_type", ""),
-                    },
-                )
-        return name
+    def create_udts_bulk(
+        self,
+        udts: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many UDT nodes and their member tags with two statements.
+
+        Args:
+            udts: Dicts with name and optional purpose, source_file, members,
+                semantic_status (same meaning as create_udt's arguments)
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of UDTs written
+        """
+        rows = [
+            {
+                "name": udt["name"],
+                "purpose": udt.get("purpose") or "",
+                "source_file": udt.get("source_file") or "",
+                "semantic_status": udt.get("semantic_status") or "pending",
+            }
+            for udt in udts
+            if udt.get("name")
+        ]
+        if not rows:
+            return 0
+        members = [
+            {"udt": udt["name"], **member}
+            for udt in udts
+            if udt.get("name")
+            for member in _udt_member_rows(udt.get("members") or [])
+        ]
+        self._invalidate_items("UDT")
+        self._execute_write(session, self._write_udts, rows, members)
+        return len(rows)
+
+    @staticmethod
+    def _write_udts(tx, rows: List[Dict], members: List[Dict]) -> None:
+        """Transaction function for create_udts_bulk."""
+        tx.run(_CREATE_UDTS_BULK, {"udts": rows})
+        if members:
+            tx.run(_CREATE_UDT_MEMBERS_BULK, {"members": members})
 
     def create_equipment(
         self,
@@ -1811,6 +3154,7 @@ class OntologyGraph:
         purpose: str,
         udt_name: Optional[str] = None,
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an equipment instance node.
 
@@ -1820,43 +3164,66 @@ class OntologyGraph:
             purpose: Semantic description (empty if not yet analyzed)
             udt_name: Name of the UDT this equipment instantiates
             semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
+            session: Optional session or transaction to run in (see bulk())
         """
-        with self.session() as session:
-            session.run(
-                """
-                MERGE (e:Equipment {name: $name})
-                SET e.type = $type
-                WITH e
-                SET e.semantic_status = COALESCE(e.semantic_status, $semantic_status)
-                WITH e
-                FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
-                    SET e.purpose = $purpose,
-                        e.semantic_status = 'complete',
-                        e.analyzed_at = datetime()
-                )
-            """,
-                {
-                    "name": name,
-                    "type": equipment_type,
-                    "purpose": purpose,
-                    "semantic_status": semantic_status,
-                },
-            )
-
-            if udt_name:
-                session.run(
-                    """
-                    MATCH (e:Equipment {name: $equip_name})
-                    MATCH (u:UDT {name: $udt_name})
-                    MERGE (e)-[:INSTANCE_OF]->(u)
-                """,
-                    {
-                        "equip_name": name,
-                        "udt_name": udt_name,
-                    },
-                )
+        self._invalidate_items("Equipment")
+        self._execute_write(
+            session,
+            self._write_equipment,
+            {
+                "name": name,
+                "type": equipment_type,
+                "purpose": purpose,
+                "semantic_status": semantic_status,
+                "udt_name": udt_name or "",
+            },
+        )
         return name
 
+    @staticmethod
+    def _write_equipment(tx, params: Dict) -> None:
+        """Transaction function for create_equipment."""
+        tx.run(_CREATE_EQUIPMENT, params)
+
+    def create_equipment_bulk(
+        self,
+        equipment: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many equipment instance nodes with UNWIND batches.
+
+        Args:
+            equipment: Dicts with name and optional type, purpose, udt_name,
+                semantic_status (same meaning as create_equipment's arguments)
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of equipment nodes written
+        """
+        rows = [
+            {
+                "name": e["name"],
+                "type": e.get("type") or "",
+                "purpose": e.get("purpose") or "",
+                "udt_name": e.get("udt_name") or "",
+                "semantic_status": e.get("semantic_status") or "pending",
+            }
+            for e in equipment
+            if e.get("name")
+        ]
+        if rows:
+            self._invalidate_items("Equipment")
+            self._execute_write(
+                session, self._write_batches, _CREATE_EQUIPMENT_BULK, rows
+            )
+        return len(rows)
+
+    @staticmethod
+    def _write_batches(tx, query: str, rows: List[Dict]) -> None:
+        """Transaction function: *query* over $rows, BULK_BATCH_SIZE at a time."""
+        for start in range(0, len(rows), BULK_BATCH_SIZE):
+            tx.run(query, {"rows": rows[start : start + BULK_BATCH_SIZE]})
+
     def create_view(
         self,
         name: str,
@@ -1864,6 +3231,7 @@ class OntologyGraph:
         purpose: str,
         project: Optional[str] = None,
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a SCADA view node with optional project association.
 
@@ -1873,46 +3241,73 @@ class OntologyGraph:
             purpose: Semantic description (empty if not yet analyzed)
             project: Project name (creates BELONGS_TO relationship)
             semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
+            session: Optional session or transaction to run in (see bulk())
         """
-        with self.session() as session:
-            session.run(
-                """
-                MERGE (v:View {name: $name})
-                SET v.path = $path,
-                    v.project = $project
-                WITH v
-                SET v.semantic_status = COALESCE(v.semantic_status, $semantic_status)
-                WITH v
-                FOREACH (_ IN CASE WHEN $purpose <> '' THEN [1] ELSE [] END |
-                    SET v.purpose = $purpose,
-                        v.semantic_status = 'complete',
-                        v.analyzed_at = datetime()
-                )
-            """,
-                {
-                    "name": name,
-                    "path": path,
-                    "purpose": purpose,
-                    "project": project,
-                    "semantic_status": semantic_status,
-                },
+        self._invalidate_items("View")
+        self._execute_write(
+            session,
+            self._write_view,
+            {
+                "name": name,
+                "path": path,
+                "purpose": purpose,
+                "project": project,
+                "semantic_status": semantic_status,
+            },
+        )
+        return name
+
+    @staticmethod
+    def _write_view(tx, params: Dict) -> None:
+        """Transaction function for create_view: View node plus project link."""
+        tx.run(_CREATE_VIEW, params)
+
+        # Create BELONGS_TO relationship if project specified
+        if params["project"]:
+            tx.run(
+                _LINK_VIEW_PROJECT,
+                {"name": params["name"], "project": params["project"]},
             )
 
-            # Create BELONGS_TO relationship if project specified
-            if project:
-                session.run(
-                    """
-                    MATCH (v:View {name: $name})
-                    MATCH (p:Project {name: $project})
-                    MERGE (v)-[:BELONGS_TO]->(p)
-                """,
-                    {"name": name, "project": project},
-                )
+    def create_views_bulk(
+        self,
+        views: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many SCADA view nodes (and project links) with UNWIND batches.
 
-        return name
+        Args:
+            views: Dicts with name and optional path, purpose, project,
+                semantic_status (same meaning as create_view's arguments)
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of views written
+        """
+        rows = [
+            {
+                "name": v["name"],
+                "path": v.get("path") or "",
+                "purpose": v.get("purpose") or "",
+                "project": v.get("project"),
+                "semantic_status": v.get("semantic_status") or "pending",
+            }
+            for v in views
+            if v.get("name")
+        ]
+        if rows:
+            self._invalidate_items("View")
+            self._execute_write(
+                session, self._write_batches, _CREATE_VIEWS_BULK, rows
+            )
+        return len(rows)
 
     def create_view_udt_mapping(
-        self, view_name: str, udt_name: str, binding_type: str = "displays"
+        self,
+        view_name: str,
+        udt_name: str,
+        binding_type: str = "displays",
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a DISPLAYS relationship between a View and a UDT.
 
@@ -1920,29 +3315,34 @@ class OntologyGraph:
             view_name: Name of the view
             udt_name: Name of the UDT the view displays/controls
             binding_type: Type of binding (displays, controls, monitors)
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created, False if nodes not found
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (v:View {name: $view_name})
                 MATCH (u:UDT {name: $udt_name})
                 MERGE (v)-[r:DISPLAYS]->(u)
-                SET r.binding_type = $binding_type
+                SET r += $props
                 RETURN v.name as view, u.name as udt
             """,
                 {
                     "view_name": view_name,
                     "udt_name": udt_name,
-                    "binding_type": binding_type,
+                    "props": {"binding_type": binding_type},
                 },
             )
             return result.single() is not None
 
     def create_view_equipment_mapping(
-        self, view_name: str, equipment_name: str, binding_type: str = "displays"
+        self,
+        view_name: str,
+        equipment_name: str,
+        binding_type: str = "displays",
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a DISPLAYS relationship between a View and Equipment.
 
@@ -1950,23 +3350,24 @@ class OntologyGraph:
             view_name: Name of the view
             equipment_name: Name of the equipment the view displays/controls
             binding_type: Type of binding (displays, controls, monitors)
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created, False if nodes not found
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (v:View {name: $view_name})
                 MATCH (e:Equipment {name: $equipment_name})
                 MERGE (v)-[r:DISPLAYS]->(e)
-                SET r.binding_type = $binding_type
+                SET r += $props
                 RETURN v.name as view, e.name as equipment
             """,
                 {
                     "view_name": view_name,
                     "equipment_name": equipment_name,
-                    "binding_type": binding_type,
+                    "props": {"binding_type": binding_type},
                 },
             )
             return result.single() is not None
@@ -1983,6 +3384,7 @@ class OntologyGraph:
         expression: str = "",
         initial_value: str = "",
         semantic_status: str = "pending",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a standalone SCADA tag node.
 
@@ -1997,40 +3399,96 @@ class OntologyGraph:
             expression: Expression for expression tags
             initial_value: Initial value for memory tags
             semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Tag name
         """
-        with self.session() as session:
+        props = _scada_tag_props(
+            tag_type,
+            {
+                "folder_name": folder_name,
+                "data_type": data_type,
+                "datasource": datasource,
+                "query": query,
+                "opc_item_path": opc_item_path,
+                "expression": expression,
+                "initial_value": initial_value,
+            },
+        )
+        with self._use_session(session) as session:
             session.run(
-                """
-                MERGE (t:ScadaTag {name: $name})
-                SET t.tag_type = $tag_type,
-                    t.folder_name = $folder_name,
-                    t.data_type = $data_type,
-                    t.datasource = $datasource,
-                    t.query = $query,
-                    t.opc_item_path = $opc_item_path,
-                    t.expression = $expression,
-                    t.initial_value = $initial_value
-                WITH t
-                SET t.semantic_status = COALESCE(t.semantic_status, $semantic_status)
-                """,
+                "WITH $row AS r" + _MERGE_SCADA_TAG_ROW,
                 {
-                    "name": name,
-                    "tag_type": tag_type,
-                    "folder_name": folder_name or "",
-                    "data_type": data_type or "",
-                    "datasource": datasource or "",
-                    "query": query or "",
-                    "opc_item_path": opc_item_path or "",
-                    "expression": expression or "",
-                    "initial_value": str(initial_value) if initial_value else "",
-                    "semantic_status": semantic_status,
+                    "row": {
+                        "name": name,
+                        "props": props,
+                        "semantic_status": semantic_status,
+                    }
                 },
             )
         return name
 
+    def create_scada_tags_bulk(
+        self,
+        tags: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many standalone SCADA tag nodes.
+
+        Rows are keyed like create_scada_tag's arguments. With APOC the rows
+        are streamed through apoc.periodic.iterate in parallel batches of
+        BULK_BATCH_SIZE; otherwise each batch is one UNWIND statement.
+
+        Args:
+            tags: Dicts with name, tag_type and the optional tag fields
+            session: Optional session or transaction to run in (see bulk());
+                a caller transaction always uses plain UNWIND batches
+
+        Returns:
+            Number of tags written
+        """
+        # Last definition wins for duplicate names, as with sequential calls;
+        # unique names also keep parallel batches from contending on a node
+        by_name: Dict[str, Dict] = {}
+        for tag in tags:
+            if not tag.get("name"):
+                continue
+            by_name[tag["name"]] = {
+                "name": tag["name"],
+                "props": _scada_tag_props(tag.get("tag_type") or "", tag),
+                "semantic_status": tag.get("semantic_status") or "pending",
+            }
+        rows = list(by_name.values())
+        if not rows:
+            return 0
+
+        use_apoc = session is None and len(rows) > BULK_BATCH_SIZE
+        with self._use_session(session) as session:
+            if use_apoc and self._apoc_available(session):
+                session.run(
+                    """
+                    CALL apoc.periodic.iterate(
+                        'UNWIND $rows AS r RETURN r', $inner,
+                        {batchSize: $batch_size, parallel: true,
+                         params: {rows: $rows}})
+                    YIELD batches
+                    RETURN batches
+                    """,
+                    {
+                        "rows": rows,
+                        "inner": _MERGE_SCADA_TAG_ROW,
+                        "batch_size": BULK_BATCH_SIZE,
+                    },
+                ).consume()
+            else:
+                for start in range(0, len(rows), BULK_BATCH_SIZE):
+                    session.run(
+                        "UNWIND $rows AS r" + _MERGE_SCADA_TAG_ROW,
+                        {"rows": rows[start : start + BULK_BATCH_SIZE]},
+                    )
+        return len(rows)
+
     def create_view_component(
         self,
         view_name: str,
@@ -2042,6 +3500,7 @@ class OntologyGraph:
         semantic_status: str = "pending",
         unresolved_bindings: list = None,
         event_scripts: list = None,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a ViewComponent node and link it to a View.
 
@@ -2055,11 +3514,12 @@ class OntologyGraph:
             semantic_status: One of 'pending', 'in_progress', 'complete', 'review'
             unresolved_bindings: Bindings that couldn't resolve to a known entity
             event_scripts: Event script text extracted from this component
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if component was created and linked
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (v:View {name: $view_name})
@@ -2070,10 +3530,8 @@ class OntologyGraph:
                     c.props = $props,
                     c.unresolved_bindings = $unresolved_bindings,
                     c.event_scripts = $event_scripts
-                WITH c
+                WITH v, c
                 SET c.semantic_status = COALESCE(c.semantic_status, $semantic_status)
-                WITH c
-                MATCH (v:View {name: $view_name})
                 MERGE (v)-[:HAS_COMPONENT]->(c)
                 RETURN c.path as created
             """,
@@ -2091,6 +3549,67 @@ class OntologyGraph:
             )
             return result.single() is not None
 
+    def create_view_components_bulk(
+        self,
+        view_name: str,
+        components: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """Create many ViewComponent nodes of one View with a single UNWIND.
+
+        Args:
+            view_name: Name of the parent view
+            components: Dicts keyed like create_view_component's arguments
+                (component_name, component_type, component_path, ...)
+            session: Optional session or transaction to run in (see bulk())
+
+        Returns:
+            Number of components created and linked
+        """
+        rows = [
+            {
+                "component_name": comp.get("component_name", ""),
+                "component_type": comp.get("component_type", ""),
+                "component_path": comp.get("component_path", ""),
+                "inferred_purpose": comp.get("inferred_purpose", ""),
+                "props": json.dumps(comp.get("props") or {}),
+                "semantic_status": comp.get("semantic_status", "pending"),
+                "unresolved_bindings": (
+                    json.dumps(comp["unresolved_bindings"])
+                    if comp.get("unresolved_bindings")
+                    else None
+                ),
+                "event_scripts": (
+                    json.dumps(comp["event_scripts"])
+                    if comp.get("event_scripts")
+                    else None
+                ),
+            }
+            for comp in components
+        ]
+        if not rows:
+            return 0
+
+        with self._use_session(session) as session:
+            record = session.run(
+                """
+                MATCH (v:View {name: $view_name})
+                UNWIND $rows AS r
+                MERGE (c:ViewComponent {view: $view_name, path: r.component_path})
+                SET c.name = r.component_name,
+                    c.type = r.component_type,
+                    c.inferred_purpose = r.inferred_purpose,
+                    c.props = r.props,
+                    c.unresolved_bindings = r.unresolved_bindings,
+                    c.event_scripts = r.event_scripts,
+                    c.semantic_status = COALESCE(c.semantic_status, r.semantic_status)
+                MERGE (v)-[:HAS_COMPONENT]->(c)
+                RETURN count(c) as created
+            """,
+                {"view_name": view_name, "rows": rows},
+            ).single()
+            return record["created"] if record else 0
+
     def create_component_udt_binding(
         self,
         view_name: str,
@@ -2101,6 +3620,7 @@ class OntologyGraph:
         binding_type: str = "",
         target_text: str = "",
         bidirectional: bool = False,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a BINDS_TO relationship between a ViewComponent and a UDT.
 
@@ -2113,32 +3633,31 @@ class OntologyGraph:
             binding_type: Type of binding (tag, expression, query, property)
             target_text: Full binding target as-written
             bidirectional: Whether the binding is bidirectional
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (c:ViewComponent {view: $view_name, path: $component_path})
                 MATCH (u:UDT {name: $udt_name})
                 MERGE (c)-[r:BINDS_TO]->(u)
-                SET r.property = $binding_property,
-                    r.tag_path = $tag_path,
-                    r.binding_type = $binding_type,
-                    r.target_text = $target_text,
-                    r.bidirectional = $bidirectional
+                SET r += $props
                 RETURN c.path as component, u.name as udt
             """,
                 {
                     "view_name": view_name,
                     "component_path": component_path,
                     "udt_name": udt_name,
-                    "binding_property": binding_property,
-                    "tag_path": tag_path,
-                    "binding_type": binding_type,
-                    "target_text": target_text,
-                    "bidirectional": bidirectional,
+                    "props": {
+                        "property": binding_property,
+                        "tag_path": tag_path,
+                        "binding_type": binding_type,
+                        "target_text": target_text,
+                        "bidirectional": bidirectional,
+                    },
                 },
             )
             return result.single() is not None
@@ -2153,6 +3672,7 @@ class OntologyGraph:
         binding_type: str = "",
         target_text: str = "",
         bidirectional: bool = False,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a BINDS_TO relationship between a ViewComponent and a ScadaTag.
 
@@ -2165,32 +3685,31 @@ class OntologyGraph:
             binding_type: Type of binding (tag, expression, query, property)
             target_text: Full binding target as-written
             bidirectional: Whether the binding is bidirectional
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (c:ViewComponent {view: $view_name, path: $component_path})
                 MATCH (t:ScadaTag {name: $tag_name})
                 MERGE (c)-[r:BINDS_TO]->(t)
-                SET r.property = $binding_property,
-                    r.tag_path = $tag_path,
-                    r.binding_type = $binding_type,
-                    r.target_text = $target_text,
-                    r.bidirectional = $bidirectional
+                SET r += $props
                 RETURN c.path as component, t.name as tag
             """,
                 {
                     "view_name": view_name,
                     "component_path": component_path,
                     "tag_name": tag_name,
-                    "binding_property": binding_property,
-                    "tag_path": tag_path,
-                    "binding_type": binding_type,
-                    "target_text": target_text,
-                    "bidirectional": bidirectional,
+                    "props": {
+                        "property": binding_property,
+                        "tag_path": tag_path,
+                        "binding_type": binding_type,
+                        "target_text": target_text,
+                        "bidirectional": bidirectional,
+                    },
                 },
             )
             return result.single() is not None
@@ -2200,6 +3719,7 @@ class OntologyGraph:
         source_tag: str,
         target_tag: str,
         reference_type: str = "expression",
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a REFERENCES relationship between two ScadaTags.
 
@@ -2209,23 +3729,24 @@ class OntologyGraph:
             source_tag: Name of the tag that contains the reference
             target_tag: Name of the tag being referenced
             reference_type: Type of reference (expression, derived, etc.)
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (s:ScadaTag {name: $source})
                 MATCH (t:ScadaTag {name: $target})
                 MERGE (s)-[r:REFERENCES]->(t)
-                SET r.type = $ref_type
+                SET r += $props
                 RETURN s.name as source, t.name as target
             """,
                 {
                     "source": source_tag,
                     "target": target_tag,
-                    "ref_type": reference_type,
+                    "props": {"type": reference_type},
                 },
             )
             return result.single() is not None
@@ -2235,6 +3756,7 @@ class OntologyGraph:
         parent_udt: str,
         member_name: str,
         child_udt: str,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a CONTAINS_TYPE relationship when a UDT member is another UDT.
 
@@ -2242,23 +3764,24 @@ class OntologyGraph:
             parent_udt: Name of the parent UDT
             member_name: Name of the member that uses the nested UDT
             child_udt: Name of the nested UDT type
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (p:UDT {name: $parent})
                 MATCH (c:UDT {name: $child})
                 MERGE (p)-[r:CONTAINS_TYPE]->(c)
-                SET r.member_name = $member
+                SET r += $props
                 RETURN p.name as parent, c.name as child
             """,
                 {
                     "parent": parent_udt,
-                    "member": member_name,
                     "child": child_udt,
+                    "props": {"member_name": member_name},
                 },
             )
             return result.single() is not None
@@ -2268,6 +3791,7 @@ class OntologyGraph:
         udt_name: str,
         member_name: str,
         tag_name: str,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a REFERENCES relationship when a UDT member references a ScadaTag.
 
@@ -2275,23 +3799,24 @@ class OntologyGraph:
             udt_name: Name of the UDT
             member_name: Name of the member that references the tag
             tag_name: Name of the ScadaTag being referenced
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             result = session.run(
                 """
                 MATCH (u:UDT {name: $udt})
                 MATCH (t:ScadaTag {name: $tag})
                 MERGE (u)-[r:REFERENCES]->(t)
-                SET r.member_name = $member
+                SET r += $props
                 RETURN u.name as udt, t.name as tag
             """,
                 {
                     "udt": udt_name,
-                    "member": member_name,
                     "tag": tag_name,
+                    "props": {"member_name": member_name},
                 },
             )
             return result.single() is not None
@@ -2307,6 +3832,7 @@ class OntologyGraph:
         target_script: str,
         function_name: str = "",
         source_project: str = "",
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a CALLS_SCRIPT relationship between entities.
 
@@ -2316,11 +3842,12 @@ class OntologyGraph:
             target_script: Name/path of the target script module
             function_name: Optional function being called
             source_project: Project context for the source (needed for Views)
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             # Build source match based on type
             if source_type == "View":
                 # Views use project-qualified names
@@ -2361,6 +3888,7 @@ class OntologyGraph:
         source_name: str,
         query_path: str,
         source_project: str = "",
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a USES_QUERY relationship between an entity and a NamedQuery.
 
@@ -2369,11 +3897,12 @@ class OntologyGraph:
             source_name: Name of the calling entity. For ViewComponent, use format "view_name/component_path"
             query_path: Path of the named query (e.g., "GIS/GetAreaById")
             source_project: Project context for the source
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             # Build source match based on type
             if source_type == "View":
                 source_match = "MATCH (s:View {name: $source})"
@@ -2435,6 +3964,7 @@ class OntologyGraph:
         component_path: str,
         event_type: str,
         script_text: str,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a HAS_EVENT_SCRIPT relationship for view components with scripts.
 
@@ -2445,11 +3975,12 @@ class OntologyGraph:
             component_path: Path to the component within the view
             event_type: Type of event (onClick, onChange, etc.)
             script_text: The script code
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             True if relationship was created
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             # Create or update the component node and relationship
             result = session.run(
                 """
@@ -2481,6 +4012,7 @@ class OntologyGraph:
         scada_component: str,
         mapping_type: str,
         description: str,
+        session: Optional[Session] = None,
     ) -> None:
         """Create a mapping between PLC and SCADA components.
 
@@ -2489,56 +4021,99 @@ class OntologyGraph:
         - Valve_Solenoid (AOI) -> ValveSolenoidControl (UDT)
         - Motor_Reversing (AOI) -> MotorReversingControl (UDT)
         """
-        with self.session() as session:
-            # First try exact match
+        self.create_plc_scada_mappings(
+            [
+                {
+                    "plc_component": plc_component,
+                    "scada_component": scada_component,
+                    "mapping_type": mapping_type,
+                    "description": description,
+                }
+            ],
+            session=session,
+        )
+
+    def create_plc_scada_mappings(
+        self,
+        mappings: List[Dict],
+        session: Optional[Session] = None,
+    ) -> None:
+        """Create many PLC-to-SCADA mappings with two statements.
+
+        Args:
+            mappings: Dicts with plc_component, scada_component, mapping_type
+                and description (the shape of plc_to_scada_mappings)
+            session: Optional session or transaction to run in (see bulk())
+        """
+        pairs = []
+        for idx, mapping in enumerate(mappings):
+            plc = mapping.get("plc_component", "")
+            scada = mapping.get("scada_component", "")
+            pairs.append(
+                {
+                    "idx": idx,
+                    "plc": plc,
+                    "scada": scada,
+                    "plc_words": _fuzzy_words(plc),
+                    "scada_words": _fuzzy_words(scada),
+                    "mapping_type": mapping.get("mapping_type", ""),
+                    "description": mapping.get("description", ""),
+                }
+            )
+        if not pairs:
+            return
+
+        with self._use_session(session) as session:
+            # First try exact matches for every pair
             result = session.run(
                 """
-                OPTIONAL MATCH (plc:AOI {name: $plc})
-                OPTIONAL MATCH (scada:UDT {name: $scada})
-                OPTIONAL MATCH (scada2:Equipment {name: $scada})
-                WITH plc, COALESCE(scada, scada2) as scada_node
+                UNWIND $pairs AS p
+                OPTIONAL MATCH (plc:AOI {name: p.plc})
+                OPTIONAL MATCH (scada:UDT {name: p.scada})
+                OPTIONAL MATCH (scada2:Equipment {name: p.scada})
+                WITH p, plc, COALESCE(scada, scada2) as scada_node
                 WHERE plc IS NOT NULL AND scada_node IS NOT NULL
                 MERGE (plc)-[r:MAPS_TO_SCADA]->(scada_node)
-                SET r.mapping_type = $mapping_type, r.description = $description
-                RETURN plc.name as plc_name
+                SET r.mapping_type = p.mapping_type, r.description = p.description
+                RETURN DISTINCT p.idx as idx
             """,
-                {
-                    "plc": plc_component,
-                    "scada": scada_component,
-                    "mapping_type": mapping_type,
-                    "description": description,
-                },
+                {"pairs": pairs},
             )
-
-            # If exact match found, we're done
-            if result.single():
+            matched = {record["idx"] for record in result}
+            unmatched = [p for p in pairs if p["idx"] not in matched]
+            if not unmatched:
                 return
 
-            # Try fuzzy matching: extract key words from component names
-            # e.g., "Valve_Solenoid" -> ["valve", "solenoid"]
-            plc_words = [w.lower() for w in plc_component.replace("_", " ").split()]
-            scada_words = [w.lower() for w in scada_component.replace("_", " ").split()]
-
-            # Find AOI where name contains key words
+            # Fuzzy matching: scan AOIs and UDT/Equipment once, then test
+            # every unmatched pair's key words against the collected names.
+            # SCADA candidates are only filtered for pairs with a PLC hit.
+            # UDT and Equipment are read by label in a UNION rather than an
+            # OR predicate over all nodes.
             session.run(
                 """
                 MATCH (plc:AOI)
-                WHERE any(word IN $plc_words WHERE toLower(plc.name) CONTAINS word)
-                WITH plc
-                MATCH (scada)
-                WHERE (scada:UDT OR scada:Equipment)
-                  AND any(word IN $scada_words WHERE toLower(scada.name) CONTAINS word)
-                MERGE (plc)-[r:MAPS_TO_SCADA]->(scada)
-                SET r.mapping_type = $mapping_type, 
-                    r.description = $description,
+                WITH collect({node: plc, name: toLower(plc.name)}) as plcs
+                CALL {
+                    MATCH (scada:UDT) RETURN scada
+                    UNION
+                    MATCH (scada:Equipment) RETURN scada
+                }
+                WITH plcs, collect({node: scada, name: toLower(scada.name)}) as scadas
+                UNWIND $pairs AS p
+                WITH p, scadas,
+                     [x IN plcs WHERE any(word IN p.plc_words WHERE x.name CONTAINS word)][..$limit] as plc_hits
+                WHERE size(plc_hits) > 0
+                WITH p, plc_hits,
+                     [x IN scadas WHERE any(word IN p.scada_words WHERE x.name CONTAINS word)][..$limit] as scada_hits
+                UNWIND plc_hits AS plc
+                UNWIND scada_hits AS scada
+                WITH p, plc.node as plc_node, scada.node as scada_node
+                MERGE (plc_node)-[r:MAPS_TO_SCADA]->(scada_node)
+                SET r.mapping_type = p.mapping_type,
+                    r.description = p.description,
                     r.fuzzy_match = true
             """,
-                {
-                    "plc_words": plc_words,
-                    "scada_words": scada_words,
-                    "mapping_type": mapping_type,
-                    "description": description,
-                },
+                {"pairs": unmatched, "limit": FUZZY_MATCH_LIMIT},
             )
 
     def create_system_overview(
@@ -2546,9 +4121,10 @@ class OntologyGraph:
         overview: str,
         safety_architecture: Dict = None,
         control_responsibilities: Dict = None,
+        session: Optional[Session] = None,
     ) -> None:
         """Create/update the system overview node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (s:SystemOverview {id: 'main'})
@@ -2558,18 +4134,25 @@ class OntologyGraph:
             """,
                 {
                     "overview": overview,
-                    "safety": str(safety_architecture) if safety_architecture else "",
+                    "safety": (
+                        json.dumps(safety_architecture) if safety_architecture else ""
+                    ),
                     "control": (
-                        str(control_responsibilities)
+                        json.dumps(control_responsibilities)
                         if control_responsibilities
                         else ""
                     ),
                 },
             )
 
-    def create_end_to_end_flow(self, flow_name: str, flow_data: Dict) -> None:
+    def create_end_to_end_flow(
+        self,
+        flow_name: str,
+        flow_data: Dict,
+        session: Optional[Session] = None,
+    ) -> None:
         """Create an end-to-end data flow."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (f:EndToEndFlow {name: $name})
@@ -2580,8 +4163,10 @@ class OntologyGraph:
                 {
                     "name": flow_name,
                     "description": flow_data.get("description", ""),
-                    "path": str(flow_data.get("path", flow_data.get("stages", []))),
-                    "data": str(flow_data),
+                    "path": json.dumps(
+                        flow_data.get("path", flow_data.get("stages", []))
+                    ),
+                    "data": json.dumps(flow_data),
                 },
             )
 
@@ -2589,13 +4174,19 @@ class OntologyGraph:
     # Operator Dictionary
     # =========================================================================
 
-    def create_common_phrase(self, phrase_key: str, phrase_data: Dict) -> None:
+    def create_common_phrase(
+        self,
+        phrase_key: str,
+        phrase_data: Dict,
+        session: Optional[Session] = None,
+    ) -> None:
         """Create a common operator phrase in the dictionary."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (p:CommonPhrase {key: $key})
                 SET p.variations = $variations,
+                    p.variations_lower = [v IN $variations | toLower(v)],
                     p.means = $means,
                     p.scada_check = $scada_check,
                     p.plc_check = $plc_check,
@@ -2626,132 +4217,25 @@ class OntologyGraph:
             limit: Maximum number of items to return
 
         Returns:
-            List of dicts with 'name' and other relevant properties
+            List of dicts with 'name' and other relevant properties.
+            Cached for PENDING_ITEMS_CACHE_TTL seconds per (item_type, limit).
         """
-        valid_types = {
-            "AOI",
-            "UDT",
-            "View",
-            "Equipment",
-            "ViewComponent",
-            "ScadaTag",
-            "Script",
-            "NamedQuery",
-            "GatewayEvent",
-            # Siemens TIA Portal types
-            "HMIScript",
-            "HMIAlarm",
-            "HMIScreen",
-            "PLCTag",
-        }
-        if item_type not in valid_types:
-            raise ValueError(f"item_type must be one of {valid_types}")
+        query = _PENDING_ITEMS_QUERIES.get(item_type)
+        if query is None:
+            raise ValueError(f"item_type must be one of {set(_VALID_ITEM_TYPES)}")
 
-        with self.session() as session:
-            if item_type == "ViewComponent":
-                result = session.run(
-                    f"""
-                    MATCH (n:{item_type})
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                      AND (n.deleted IS NULL OR n.deleted = false)
-                    RETURN n.view as view, n.path as path, n.name as name, 
-                           n.type as type, n.props as props,
-                           n.inferred_purpose as inferred_purpose,
-                           n.unresolved_bindings as unresolved_bindings,
-                           n.event_scripts as event_scripts
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            elif item_type == "ScadaTag":
-                result = session.run(
-                    """
-                    MATCH (n:ScadaTag)
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                      AND (n.deleted IS NULL OR n.deleted = false)
-                    RETURN n.name as name, n.tag_type as tag_type, 
-                           n.data_type as data_type, n.folder_name as folder_name,
-                           n.query as query, n.datasource as datasource,
-                           n.opc_item_path as opc_item_path, n.expression as expression
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            elif item_type == "HMIScript":
-                result = session.run(
-                    """
-                    MATCH (n:HMIScript)
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                    RETURN n.name as name, n.hmi as hmi, n.project as project,
-                           n.script_file as script_file,
-                           n.functions as functions,
-                           n.script_text as script_text
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            elif item_type == "HMIAlarm":
-                result = session.run(
-                    """
-                    MATCH (n:HMIAlarm)
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                    RETURN n.name as name, n.hmi as hmi, n.project as project,
-                           n.alarm_type as alarm_type,
-                           n.alarm_class as alarm_class,
-                           n.origin as origin, n.priority as priority,
-                           n.raised_state_tag as raised_state_tag,
-                           n.trigger_bit_address as trigger_bit_address,
-                           n.trigger_mode as trigger_mode,
-                           n.condition as condition,
-                           n.condition_value as condition_value
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            elif item_type == "HMIScreen":
-                result = session.run(
-                    """
-                    MATCH (n:HMIScreen)
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                    RETURN n.name as name, n.hmi as hmi, n.project as project,
-                           n.folder as folder
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            elif item_type == "PLCTag":
-                result = session.run(
-                    """
-                    MATCH (n:PLCTag)
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                    RETURN n.name as name, n.table as table_name,
-                           n.plc as plc, n.project as project,
-                           n.data_type as data_type,
-                           n.logical_address as logical_address,
-                           n.comment as comment
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
-            else:
-                result = session.run(
-                    f"""
-                    MATCH (n:{item_type})
-                    WHERE (n.semantic_status = 'pending' OR n.semantic_status IS NULL)
-                      AND (n.deleted IS NULL OR n.deleted = false)
-                    RETURN n.name as name, n.source_file as source_file, 
-                           n.type as type, n.path as path
-                    LIMIT $limit
-                    """,
-                    {"limit": limit},
-                )
-                return [dict(r) for r in result]
+        cached = _cache_lookup(
+            self._pending_cache, (item_type, limit), PENDING_ITEMS_CACHE_TTL
+        )
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        if not self._schema_ready:
+            query = _UNHINTED_PENDING_ITEMS_QUERIES[item_type]
+        with self.read_session() as session:
+            items = session.execute_read(self._run_rows, query, {"limit": limit})
+        _cache_store(self._pending_cache, (item_type, limit), items)
+        return copy.deepcopy(items)
 
     def set_semantic_status(
         self, item_type: str, name: str, status: str, purpose: str = None
@@ -2768,58 +4252,41 @@ class OntologyGraph:
         Returns:
             True if item was found and updated
         """
-        valid_types = {
-            "AOI",
-            "UDT",
-            "View",
-            "Equipment",
-            "ViewComponent",
-            "ScadaTag",
-            "Script",
-            "NamedQuery",
-            "GatewayEvent",
-            # Siemens TIA Portal types
-            "HMIScript",
-            "HMIAlarm",
-            "HMIScreen",
-            "PLCTag",
-        }
-        valid_statuses = {"pending", "in_progress", "complete", "review"}
+        update = {"name": name, "status": status, "purpose": purpose}
+        return self.set_semantic_statuses(item_type, [update]) > 0
+
+    def set_semantic_statuses(self, item_type: str, updates: List[Dict]) -> int:
+        """Update the semantic status of many items of one type in one statement.
+
+        Args:
+            item_type: Same values as set_semantic_status()
+            updates: Dicts with 'name', 'status' and optional 'purpose'
+
+        Returns:
+            Number of items found and updated
+        """
+        query = _SET_STATUS_QUERIES.get(item_type)
+        if query is None:
+            raise ValueError(f"item_type must be one of {set(_VALID_ITEM_TYPES)}")
+        rows = [
+            {"name": u["name"], "status": u["status"], "purpose": u.get("purpose")}
+            for u in updates
+        ]
+        for row in rows:
+            if row["status"] not in _VALID_STATUSES:
+                raise ValueError(f"status must be one of {set(_VALID_STATUSES)}")
+        if not rows:
+            return 0
 
-        if item_type not in valid_types:
-            raise ValueError(f"item_type must be one of {valid_types}")
-        if status not in valid_statuses:
-            raise ValueError(f"status must be one of {valid_statuses}")
+        self.ensure_schema()
+        if not self._schema_ready:
+            query = _UNHINTED_SET_STATUS_QUERIES[item_type]
+        self._invalidate_items(item_type, [row["name"] for row in rows])
 
-        with self.session() as session:
-            if item_type == "ViewComponent":
-                # ViewComponent uses path as identifier
-                result = session.run(
-                    f"""
-                    MATCH (n:{item_type} {{path: $name}})
-                    SET n.semantic_status = $status
-                    WITH n
-                    FOREACH (_ IN CASE WHEN $purpose IS NOT NULL THEN [1] ELSE [] END |
-                        SET n.purpose = $purpose, n.analyzed_at = datetime()
-                    )
-                    RETURN n.path as name
-                    """,
-                    {"name": name, "status": status, "purpose": purpose},
-                )
-            else:
-                result = session.run(
-                    f"""
-                    MATCH (n:{item_type} {{name: $name}})
-                    SET n.semantic_status = $status
-                    WITH n
-                    FOREACH (_ IN CASE WHEN $purpose IS NOT NULL THEN [1] ELSE [] END |
-                        SET n.purpose = $purpose, n.analyzed_at = datetime()
-                    )
-                    RETURN n.name as name
-                    """,
-                    {"name": name, "status": status, "purpose": purpose},
-                )
-            return result.single() is not None
+        result = self._execute_write(
+            None, self._run_rows, query, {"updates": rows}
+        )
+        return result[0]["updated"] if result else 0
 
     def get_semantic_status_counts(
         self, include_deleted: bool = False
@@ -2832,40 +4299,21 @@ class OntologyGraph:
         Returns:
             Dict like {'UDT': {'pending': 5, 'complete': 3, 'deleted': 1}, ...}
         """
-        with self.session() as session:
-            result = {}
-            for item_type in [
-                "AOI",
-                "UDT",
-                "View",
-                "Equipment",
-                "ViewComponent",
-                "ScadaTag",
-                # Siemens TIA Portal types
-                "HMIScript",
-                "HMIAlarm",
-                "HMIScreen",
-                "PLCTag",
-            ]:
-                if include_deleted:
-                    counts_result = session.run(
-                        f"""
-                        MATCH (n:{item_type})
-                        WITH COALESCE(n.semantic_status, 'pending') as status
-                        RETURN status, count(*) as count
-                        """
-                    )
-                else:
-                    counts_result = session.run(
-                        f"""
-                        MATCH (n:{item_type})
-                        WHERE n.deleted IS NULL OR n.deleted = false
-                        WITH COALESCE(n.semantic_status, 'pending') as status
-                        RETURN status, count(*) as count
-                        """
-                    )
-                result[item_type] = {r["status"]: r["count"] for r in counts_result}
-            return result
+        query = (
+            _STATUS_COUNTS_ALL if include_deleted else _STATUS_COUNTS_ACTIVE
+        )
+        result: Dict[str, Dict[str, int]] = {lbl: {} for lbl in _STATUS_COUNT_LABELS}
+        with self.read_session() as session:
+            rows = session.execute_read(self._run_rows, query)
+        for r in rows:
+            result[r["label"]][r["status"]] = r["count"]
+        return result
+
+    @staticmethod
+    def _run_rows(tx, query: str, params: Optional[Dict] = None) -> List[Dict]:
+        """Transaction function returning all rows of *query* as dicts
+        (used with both execute_read and execute_write)."""
+        return tx.run(query, params or {}).data()
 
     def get_enrichment_status_counts(self) -> Dict[str, Dict[str, int]]:
         """Get counts of items by troubleshooting enrichment status.
@@ -2873,40 +4321,22 @@ class OntologyGraph:
         Returns:
             Dict like {'AOI': {'enriched': 5, 'pending': 3}, 'View': {'enriched': 2, 'pending': 4}}
         """
-        with self.session() as session:
-            result = {}
-
-            # AOI enrichment status
-            aoi_result = session.run(
-                """
-                MATCH (a:AOI)
-                RETURN 
-                    sum(CASE WHEN a.troubleshooting_enriched = true THEN 1 ELSE 0 END) as enriched,
-                    sum(CASE WHEN a.troubleshooting_enriched IS NULL OR a.troubleshooting_enriched = false THEN 1 ELSE 0 END) as pending
-            """
-            )
-            aoi_record = aoi_result.single()
-            result["AOI"] = {
-                "enriched": aoi_record["enriched"] if aoi_record else 0,
-                "pending": aoi_record["pending"] if aoi_record else 0,
-            }
-
-            # View enrichment status
-            view_result = session.run(
-                """
-                MATCH (v:View)
-                RETURN 
-                    sum(CASE WHEN v.troubleshooting_enriched = true THEN 1 ELSE 0 END) as enriched,
-                    sum(CASE WHEN v.troubleshooting_enriched IS NULL OR v.troubleshooting_enriched = false THEN 1 ELSE 0 END) as pending
-            """
-            )
-            view_record = view_result.single()
-            result["View"] = {
-                "enriched": view_record["enriched"] if view_record else 0,
-                "pending": view_record["pending"] if view_record else 0,
+        with self.read_session() as session:
+            return session.execute_read(self._read_enrichment_counts)
+
+    @staticmethod
+    def _read_enrichment_counts(tx) -> Dict[str, Dict[str, int]]:
+        """Transaction function for get_enrichment_status_counts."""
+        result = {
+            "AOI": {"enriched": 0, "pending": 0},
+            "View": {"enriched": 0, "pending": 0},
+        }
+        for record in tx.run(_ENRICHMENT_COUNTS):
+            result[record["label"]] = {
+                "enriched": record["enriched"],
+                "pending": record["pending"],
             }
-
-            return result
+        return result
 
     def get_item_with_context(
         self, item_type: str, name: str
@@ -2923,102 +4353,31 @@ class OntologyGraph:
             name: Name of the item
 
         Returns:
-            Dict with item data and context, or None if not found
+            Dict with item data and context, or None if not found.
+            Results are cached (LRU, ITEM_CONTEXT_CACHE_SIZE entries) and
+            dropped by the writers that change the item.
         """
-        with self.session() as session:
-            if item_type == "AOI":
-                result = session.run(
-                    """
-                    MATCH (a:AOI {name: $name})
-                    OPTIONAL MATCH (a)-[:HAS_TAG]->(t:Tag)
-                    OPTIONAL MATCH (a)-[:HAS_PATTERN]->(p:ControlPattern)
-                    OPTIONAL MATCH (a)-[:MAPS_TO_SCADA]->(s)
-                    RETURN a as item,
-                           collect(DISTINCT {name: t.name, description: t.description}) as tags,
-                           collect(DISTINCT p.name) as patterns,
-                           collect(DISTINCT s.name) as scada_mappings
-                    """,
-                    {"name": name},
-                )
-            elif item_type == "UDT":
-                result = session.run(
-                    """
-                    MATCH (u:UDT {name: $name})
-                    OPTIONAL MATCH (u)<-[:DISPLAYS]-(v:View)
-                    OPTIONAL MATCH (u)<-[:INSTANCE_OF]-(e:Equipment)
-                    OPTIONAL MATCH (u)<-[:MAPS_TO_SCADA]-(a:AOI)
-                    OPTIONAL MATCH (u)-[:HAS_MEMBER]->(t:Tag)
-                    RETURN u as item,
-                           collect(DISTINCT v.name) as views,
-                           collect(DISTINCT e.name) as equipment,
-                           collect(DISTINCT a.name) as aois,
-                           collect(DISTINCT {name: t.name, data_type: t.data_type}) as members
-                    """,
-                    {"name": name},
-                )
-            elif item_type == "View":
-                result = session.run(
-                    """
-                    MATCH (v:View {name: $name})
-                    OPTIONAL MATCH (v)-[:DISPLAYS]->(u:UDT)
-                    OPTIONAL MATCH (v)-[:HAS_COMPONENT]->(c:ViewComponent)
-                    RETURN v as item,
-                           collect(DISTINCT u.name) as udts,
-                           collect(DISTINCT {name: c.name, type: c.type, path: c.path}) as components
-                    """,
-                    {"name": name},
-                )
-            elif item_type == "Equipment":
-                result = session.run(
-                    """
-                    MATCH (e:Equipment {name: $name})
-                    OPTIONAL MATCH (e)-[:INSTANCE_OF]->(u:UDT)
-                    OPTIONAL MATCH (e)<-[:DISPLAYS]-(v:View)
-                    RETURN e as item,
-                           u.name as udt_type,
-                           collect(DISTINCT v.name) as views
-                    """,
-                    {"name": name},
-                )
-            elif item_type == "ViewComponent":
-                # For ViewComponent, name is actually the path
-                result = session.run(
-                    """
-                    MATCH (c:ViewComponent {path: $name})
-                    OPTIONAL MATCH (c)-[:BINDS_TO]->(u:UDT)
-                    OPTIONAL MATCH (c)-[:BINDS_TO]->(t:ScadaTag)
-                    OPTIONAL MATCH (v:View)-[:HAS_COMPONENT]->(c)
-                    RETURN c as item,
-                           v.name as parent_view,
-                           collect(DISTINCT u.name) as bound_udts,
-                           collect(DISTINCT t.name) as bound_tags
-                    """,
-                    {"name": name},
-                )
-            elif item_type == "ScadaTag":
-                result = session.run(
-                    """
-                    MATCH (t:ScadaTag {name: $name})
-                    OPTIONAL MATCH (t)-[:REFERENCES]->(ref:ScadaTag)
-                    OPTIONAL MATCH (t)<-[:BINDS_TO]-(c:ViewComponent)
-                    OPTIONAL MATCH (v:View)-[:HAS_COMPONENT]->(c)
-                    RETURN t as item,
-                           collect(DISTINCT ref.name) as referenced_tags,
-                           collect(DISTINCT c.path) as bound_components,
-                           collect(DISTINCT v.name) as used_in_views
-                    """,
-                    {"name": name},
-                )
-            else:
-                return None
-
-            record = result.single()
-            if not record:
-                return None
-
-            item_data = dict(record["item"])
-            context = {k: v for k, v in dict(record).items() if k != "item"}
-            return {"item": item_data, "context": context}
+        query = _ITEM_CONTEXT_QUERIES.get(item_type)
+        if query is None:
+            return None
+
+        key = (item_type, name)
+        cached = _cache_lookup(self._context_cache, key, ITEM_CONTEXT_CACHE_TTL)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        if not self._schema_ready:
+            query = _UNHINTED_ITEM_CONTEXT_QUERIES[item_type]
+        with self.read_session() as session:
+            rows = session.execute_read(self._run_rows, query, {"name": name})
+        if not rows:
+            return None
+
+        item_data = dict(rows[0]["item"])
+        context = {k: v for k, v in rows[0].items() if k != "item"}
+        data = {"item": item_data, "context": context}
+        _cache_store(self._context_cache, key, data, ITEM_CONTEXT_CACHE_SIZE)
+        return copy.deepcopy(data)
 
     # =========================================================================
     # Process-Semantic Layer Write Helpers
@@ -3028,9 +4387,10 @@ class OntologyGraph:
         self, name: str, category: str = "", phase: str = "",
         description: str = "", purpose: str = "",
         evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge a ProcessMedium node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:ProcessMedium {name: $name})
@@ -3054,9 +4414,10 @@ class OntologyGraph:
         self, name: str, category: str = "",
         description: str = "", purpose: str = "",
         evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge a UnitOperation node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:UnitOperation {name: $name})
@@ -3082,9 +4443,10 @@ class OntologyGraph:
         high_warning: float = None, high_limit: float = None,
         trip_low: float = None, trip_high: float = None,
         description: str = "", evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge an OperatingEnvelope node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:OperatingEnvelope {name: $name})
@@ -3126,9 +4488,10 @@ class OntologyGraph:
     def create_physical_principle(
         self, name: str, category: str = "", unit_family: str = "",
         description: str = "", evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge a PhysicalPrinciple node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:PhysicalPrinciple {name: $name})
@@ -3152,9 +4515,10 @@ class OntologyGraph:
         self, name: str, category: str = "", cas_number: str = "",
         molecular_formula: str = "", description: str = "",
         evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge a ChemicalSpecies node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:ChemicalSpecies {name: $name})
@@ -3178,9 +4542,10 @@ class OntologyGraph:
     def create_reaction(
         self, name: str, category: str = "", description: str = "",
         conditions: str = "", evidence_json: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create or merge a Reaction node with provenance."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (n:Reaction {name: $name})
@@ -3205,6 +4570,7 @@ class OntologyGraph:
         target_label: str, target_name: str,
         rel_type: str, evidence_json: str = "",
         properties: dict = None,
+        session: Optional[Session] = None,
     ) -> bool:
         """Create a process-semantic relationship with provenance.
 
@@ -3227,7 +4593,7 @@ class OntologyGraph:
                 prop_sets += f", r.{k} = ${param_key}"
                 params[param_key] = v
 
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 f"""
                 MATCH (src:{source_label} {{name: $src_name}})
@@ -3300,84 +4666,74 @@ class OntologyGraph:
 
     def find_by_symptom(self, symptom_text: str) -> List[Dict]:
         """Find AOIs by fault symptom text (fuzzy match)."""
-        with self.session() as session:
-            result = session.run(
+        with self.read_session() as session:
+            return session.execute_read(
+                self._run_rows,
                 """
                 MATCH (a:AOI)-[:HAS_SYMPTOM]->(s:FaultSymptom)
-                WHERE toLower(s.symptom) CONTAINS toLower($text)
+                WHERE s.symptom_lower CONTAINS $text
                 RETURN a.name as aoi, s.symptom as symptom, 
                        s.resolution_steps as steps
             """,
-                {"text": symptom_text},
+                {"text": symptom_text.lower()},
             )
-            return [dict(r) for r in result]
 
     def find_by_operator_phrase(self, phrase: str) -> List[Dict]:
         """Find matches for operator language."""
-        with self.session() as session:
-            # Check common phrases
-            common_result = session.run(
-                """
-                MATCH (p:CommonPhrase)
-                WHERE any(v IN p.variations WHERE toLower(v) CONTAINS toLower($phrase))
-                RETURN p.key as key, p.means as means, p.scada_check as scada_check,
-                       p.plc_check as plc_check, p.follow_up_questions as follow_up
-            """,
-                {"phrase": phrase},
-            )
-            common = [dict(r) for r in common_result]
+        with self.read_session() as session:
+            return session.execute_read(self._read_operator_phrases, phrase.lower())
+
+    @staticmethod
+    def _read_operator_phrases(tx, phrase: str) -> Dict[str, List[Dict]]:
+        """Transaction function for find_by_operator_phrase (*phrase* lower-cased)."""
+        # Check common phrases
+        common_result = tx.run(
+            """
+            MATCH (p:CommonPhrase)
+            WHERE any(v IN p.variations_lower WHERE v CONTAINS $phrase)
+            RETURN p.key as key, p.means as means, p.scada_check as scada_check,
+                   p.plc_check as plc_check, p.follow_up_questions as follow_up
+        """,
+            {"phrase": phrase},
+        )
+        common = common_result.data()
 
-            # Check AOI-specific phrases
-            aoi_result = session.run(
-                """
-                MATCH (a:AOI)-[:HAS_PHRASE]->(p:OperatorPhrase)
-                WHERE toLower(p.phrase) CONTAINS toLower($phrase)
-                RETURN a.name as aoi, p.phrase as phrase, p.means as means,
-                       p.check_first as check_first, p.related_tags as related_tags
-            """,
-                {"phrase": phrase},
-            )
-            aoi_phrases = [dict(r) for r in aoi_result]
+        # Check AOI-specific phrases
+        aoi_result = tx.run(
+            """
+            MATCH (a:AOI)-[:HAS_PHRASE]->(p:OperatorPhrase)
+            WHERE p.phrase_lower CONTAINS $phrase
+            RETURN a.name as aoi, p.phrase as phrase, p.means as means,
+                   p.check_first as check_first, p.related_tags as related_tags
+        """,
+            {"phrase": phrase},
+        )
+        aoi_phrases = aoi_result.data()
 
-            return {"common_phrases": common, "aoi_phrases": aoi_phrases}
+        return {"common_phrases": common, "aoi_phrases": aoi_phrases}
 
     def trace_tag_influence(
         self, aoi_name: str, tag_name: str, depth: int = 3
     ) -> List[Dict]:
         """Trace what a tag influences (downstream effects)."""
-        with self.session() as session:
-            result = session.run(
-                """
-                MATCH path = (start:Tag {name: $tag_name, aoi_name: $aoi_name})-[*1..$depth]->(end:Tag)
-                RETURN [n IN nodes(path) | n.name] as path,
-                       [r IN relationships(path) | type(r)] as relationships
-            """,
-                {
-                    "tag_name": tag_name,
-                    "aoi_name": aoi_name,
-                    "depth": depth,
-                },
-            )
-            return [dict(r) for r in result]
+        return self._trace_tag(_TRACE_DOWNSTREAM, aoi_name, tag_name, depth)
 
     def trace_tag_dependencies(
         self, aoi_name: str, tag_name: str, depth: int = 3
     ) -> List[Dict]:
         """Trace what influences a tag (upstream dependencies)."""
-        with self.session() as session:
-            result = session.run(
-                """
-                MATCH path = (start:Tag)-[*1..$depth]->(end:Tag {name: $tag_name, aoi_name: $aoi_name})
-                RETURN [n IN nodes(path) | n.name] as path,
-                       [r IN relationships(path) | type(r)] as relationships
-            """,
-                {
-                    "tag_name": tag_name,
-                    "aoi_name": aoi_name,
-                    "depth": depth,
-                },
+        return self._trace_tag(_TRACE_UPSTREAM, aoi_name, tag_name, depth)
+
+    def _trace_tag(
+        self, queries: Dict[int, str], aoi_name: str, tag_name: str, depth: int
+    ) -> List[Dict]:
+        query = queries.get(depth)
+        if query is None:
+            raise ValueError(f"depth must be between 1 and {MAX_TRACE_DEPTH}")
+        with self.read_session() as session:
+            return session.execute_read(
+                self._run_rows, query, {"tag_name": tag_name, "aoi_name": aoi_name}
             )
-            return [dict(r) for r in result]
 
     def export_full_database(self) -> Dict:
         """Export the entire database to a serializable dict for backup.
@@ -3537,17 +4893,19 @@ class OntologyGraph:
         self,
         name: str,
         directory: str,
+        session: Optional[Session] = None,
     ) -> str:
         """Create a TiaProject node.
 
         Args:
             name: Project name (e.g. "ECar_Demo")
             directory: Source directory path
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             The project name.
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (tp:TiaProject {name: $name})
@@ -3564,6 +4922,7 @@ class OntologyGraph:
         name: str,
         project_name: str,
         dir_name: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a PLCDevice node and link to its TiaProject.
 
@@ -3571,11 +4930,12 @@ class OntologyGraph:
             name: PLC name (e.g. "PLC_1")
             project_name: Parent TiaProject name
             dir_name: Directory name (e.g. "PLC_PLC_1")
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             The device name.
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (pd:PLCDevice {name: $name, project: $project})
@@ -3594,6 +4954,7 @@ class OntologyGraph:
         name: str,
         project_name: str,
         dir_name: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIDevice node and link to its TiaProject.
 
@@ -3601,11 +4962,12 @@ class OntologyGraph:
             name: HMI name (e.g. "HMI_RT_1")
             project_name: Parent TiaProject name
             dir_name: Directory name (e.g. "HMI_HMI_RT_1")
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             The device name.
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (hd:HMIDevice {name: $name, project: $project})
@@ -3629,6 +4991,7 @@ class OntologyGraph:
         communication_driver: str = "",
         node: str = "",
         address: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIConnection node and link HMI->PLC.
 
@@ -3641,11 +5004,12 @@ class OntologyGraph:
             communication_driver: Driver string
             node: Node/CPU description
             address: Raw address string
+            session: Optional session or transaction to run in (see bulk())
 
         Returns:
             Connection name.
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (hc:HMIConnection {name: $name, hmi: $hmi, project: $project})
@@ -3696,9 +5060,10 @@ class OntologyGraph:
         priority: str = "0",
         state_machine: str = "",
         is_system: bool = False,
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIAlarmClass node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (hac:HMIAlarmClass {name: $name, hmi: $hmi, project: $project})
@@ -3734,9 +5099,10 @@ class OntologyGraph:
         trigger_mode: str = "",
         condition: str = "",
         condition_value: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIAlarm node and link to HMI device and alarm class."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (ha:HMIAlarm {name: $name, hmi: $hmi, project: $project})
@@ -3794,9 +5160,10 @@ class OntologyGraph:
         hmi_name: str,
         project_name: str,
         folder: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMITagTable node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (ht:HMITagTable {name: $name, hmi: $hmi, project: $project})
@@ -3822,9 +5189,10 @@ class OntologyGraph:
         script_file: str = "",
         functions: Optional[List[str]] = None,
         script_text: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIScript node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (hs:HMIScript {name: $name, hmi: $hmi, project: $project})
@@ -3852,9 +5220,10 @@ class OntologyGraph:
         name: str,
         hmi_name: str,
         project_name: str,
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMITextList node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (htl:HMITextList {name: $name, hmi: $hmi, project: $project})
@@ -3876,9 +5245,10 @@ class OntologyGraph:
         hmi_name: str,
         project_name: str,
         folder: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create an HMIScreen node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (hsc:HMIScreen {name: $name, hmi: $hmi, project: $project})
@@ -3902,9 +5272,10 @@ class OntologyGraph:
         name: str,
         plc_name: str,
         project_name: str,
+        session: Optional[Session] = None,
     ) -> str:
         """Create a PLCTagTable node."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (pt:PLCTagTable {name: $name, plc: $plc, project: $project})
@@ -3929,9 +5300,10 @@ class OntologyGraph:
         data_type: str = "Bool",
         logical_address: str = "",
         comment: str = "",
+        session: Optional[Session] = None,
     ) -> str:
         """Create a PLCTag node and link to its tag table."""
-        with self.session() as session:
+        with self._use_session(session) as session:
             session.run(
                 """
                 MERGE (ptg:PLCTag {name: $name, table: $table, plc: $plc, project: $project})
@@ -3962,12 +5334,13 @@ class OntologyGraph:
         project_name: str,
         members: Optional[List[Dict]] = None,
         is_failsafe: bool = False,
+        session: Optional[Session] = None,
     ) -> str:
         """Create a PLC UDT/struct type node and link to PLC device.
 
         Also creates a UDT node for cross-referencing compatibility.
         """
-        with self.session() as session:
+        with self._use_session(session) as session:
             # Create or merge the UDT node (for cross-ref compatibility)
             session.run(
                 """
@@ -4384,55 +5757,195 @@ class OntologyGraph:
             return resources
 
     def get_graph_for_visualization(self) -> Dict:
-        """Get nodes and edges for visualization."""
-        with self.session() as session:
-            # Get all nodes (including Siemens TIA project nodes)
-            nodes_result = session.run(
-                """
-                MATCH (n)
-                WHERE n:AOI OR n:UDT OR n:Equipment OR n:View OR n:EndToEndFlow
-                   OR n:TiaProject OR n:PLCDevice OR n:HMIDevice
-                   OR n:HMIConnection OR n:HMIAlarm OR n:HMIScript
-                RETURN elementId(n) as id, labels(n)[0] as type, 
-                       coalesce(n.name, n.key, 'unknown') as label,
-                       properties(n) as props
-            """
+        """Get nodes and edges for visualization.
+
+        Node details are limited to _VIZ_DETAIL_KEYS rather than every
+        property, which keeps dense nodes from inflating the payload; use
+        get_node_details() to expand a single node.
+        """
+        with self.read_session() as session:
+            rows = session.execute_read(self._run_rows, _GRAPH_FOR_VISUALIZATION)
+
+        nodes = []
+        edges = []
+        for n in rows:
+            node_id = str(n["id"])
+            nodes.append(
+                {
+                    "id": node_id,
+                    "type": n["type"].lower(),
+                    "label": n["label"],
+                    "details": {k: v for k, v in n["details"].items() if v is not None},
+                }
             )
-            nodes = [
+            edges.extend(
                 {
-                    "id": str(r["id"]),
-                    "type": r["type"].lower(),
-                    "label": r["label"],
-                    "details": dict(r["props"]),
+                    "source": node_id,
+                    "target": str(e["target"]),
+                    "type": e["type"],
+                    "label": e["label"] or e["type"],
                 }
-                for r in nodes_result
-            ]
+                for e in n["edges"]
+            )
+        return {"nodes": nodes, "edges": edges}
 
-            # Get relationships between main nodes
-            edges_result = session.run(
-                """
-                MATCH (a)-[r]->(b)
-                WHERE (a:AOI OR a:UDT OR a:Equipment OR a:View
-                       OR a:TiaProject OR a:PLCDevice OR a:HMIDevice
-                       OR a:HMIConnection OR a:HMIAlarm OR a:HMIScript)
-                  AND (b:AOI OR b:UDT OR b:Equipment OR b:View
-                       OR b:TiaProject OR b:PLCDevice OR b:HMIDevice
-                       OR b:HMIConnection OR b:HMIAlarm OR b:HMIScript)
-                RETURN elementId(a) as source, elementId(b) as target, type(r) as type,
-                       properties(r) as props
-            """
+    def get_node_details(self, element_id: str) -> Optional[Dict[str, Any]]:
+        """Get all properties of one node from get_graph_for_visualization().
+
+        Args:
+            element_id: The node's 'id' as returned in the visualization data
+
+        Returns:
+            Dict with 'labels' and 'details', or None if the node is gone
+        """
+        with self.read_session() as session:
+            rows = session.execute_read(
+                self._run_rows, _NODE_DETAILS, {"id": element_id}
             )
-            edges = [
+        if not rows:
+            return None
+        return {"labels": rows[0]["labels"], "details": rows[0]["props"]}
+
+
+class AsyncOntologyGraph:
+    """Async counterpart of OntologyGraph for event-loop (e.g. ASGI) callers.
+
+    Mirrors the core SCADA upserts and troubleshooting read with the same
+    Cypher, so a server can keep many graph queries in flight without a
+    thread per query. Schema setup stays with OntologyGraph.ensure_schema().
+    """
+
+    def __init__(self, config: Optional[Neo4jConfig] = None):
+        """Initialize Neo4j connection settings."""
+        self.config = config or Neo4jConfig()
+        self._driver = None
+
+    async def connect(self) -> None:
+        """Create the async driver (once)."""
+        if self._driver is None:
+            self._driver = AsyncGraphDatabase.driver(
+                self.config.uri,
+                auth=(self.config.user, self.config.password),
+                max_connection_pool_size=self.config.max_connection_pool_size,
+                connection_acquisition_timeout=self.config.connection_acquisition_timeout,
+                fetch_size=self.config.fetch_size,
+                max_transaction_retry_time=self.config.max_transaction_retry_time,
+                keep_alive=True,
+            )
+
+    async def close(self) -> None:
+        """Close the async driver."""
+        if self._driver:
+            await self._driver.close()
+            self._driver = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def session(self, **kwargs):
+        """Async context manager for Neo4j sessions."""
+        if self._driver is None:
+            await self.connect()
+        async with self._driver.session(
+            database=self.config.database, **kwargs
+        ) as session:
+            yield session
+
+    async def create_udt(
+        self,
+        name: str,
+        purpose: str,
+        source_file: str = "",
+        members: Optional[List[Dict]] = None,
+        semantic_status: str = "pending",
+    ) -> str:
+        """Create a UDT node and its member tags (see OntologyGraph.create_udt)."""
+
+        async def work(tx):
+            await tx.run(
+                _CREATE_UDT,
                 {
-                    "source": str(r["source"]),
-                    "target": str(r["target"]),
-                    "type": r["type"],
-                    "label": r["props"].get("mapping_type", r["type"]),
-                }
-                for r in edges_result
-            ]
+                    "name": name,
+                    "purpose": purpose,
+                    "source_file": source_file,
+                    "semantic_status": semantic_status,
+                },
+            )
+            if members:
+                await tx.run(
+                    _CREATE_UDT_MEMBERS,
+                    {"udt_name": name, "members": _udt_member_rows(members)},
+                )
+
+        async with self.session() as session:
+            await session.execute_write(work)
+        return name
 
-            return {"nodes": nodes, "edges": edges}
+    async def create_equipment(
+        self,
+        name: str,
+        equipment_type: str,
+        purpose: str,
+        udt_name: Optional[str] = None,
+        semantic_status: str = "pending",
+    ) -> str:
+        """Create an equipment instance node (see OntologyGraph.create_equipment)."""
+
+        async def work(tx):
+            await tx.run(
+                _CREATE_EQUIPMENT,
+                {
+                    "name": name,
+                    "type": equipment_type,
+                    "purpose": purpose,
+                    "semantic_status": semantic_status,
+                    "udt_name": udt_name or "",
+                },
+            )
+
+        async with self.session() as session:
+            await session.execute_write(work)
+        return name
+
+    async def create_view(
+        self,
+        name: str,
+        path: str,
+        purpose: str,
+        project: Optional[str] = None,
+        semantic_status: str = "pending",
+    ) -> str:
+        """Create a SCADA view node and its project link in one transaction."""
+
+        async def work(tx):
+            await tx.run(
+                _CREATE_VIEW,
+                {
+                    "name": name,
+                    "path": path,
+                    "purpose": purpose,
+                    "project": project,
+                    "semantic_status": semantic_status,
+                },
+            )
+            if project:
+                await tx.run(_LINK_VIEW_PROJECT, {"name": name, "project": project})
+
+        async with self.session() as session:
+            await session.execute_write(work)
+        return name
+
+    async def get_troubleshooting(self, aoi_name: str) -> Dict:
+        """Get troubleshooting data for an AOI (uncached)."""
+        async with self.session(default_access_mode=READ_ACCESS) as session:
+            result = await session.run(_GET_TROUBLESHOOTING, {"aoi_name": aoi_name})
+            record = await result.single()
+        return OntologyGraph._troubleshooting_from_record(record)
 
 
 # =========================================================================
@@ -4444,64 +5957,92 @@ def get_ontology_graph(config: Optional[Neo4jConfig] = None) -> OntologyGraph:
     """Get a connected OntologyGraph instance."""
     graph = OntologyGraph(config)
     graph.connect()
-    graph.create_indexes()
+    graph.ensure_schema()
     return graph
 
 
 def import_json_ontology(json_path: str, graph: Optional[OntologyGraph] = None) -> None:
-    """Import an existing JSON ontology into Neo4j."""
-    import json
-    from pathlib import Path
+    """Import an existing JSON ontology into Neo4j.
+
+    AOIs are written AOI_WRITE_BATCH per transaction. L5X ontologies (a
+    top-level list of AOIs) are streamed batch by batch when ijson is
+    installed; other shapes are loaded whole.
+    """
+    with open(json_path, "rb") as f:
+        if ijson is not None and _starts_with_array(f):
+            data = ijson.items(f, "item", use_float=True)
+        else:
+            data = json.load(f)
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        close_after = False
+        if graph is None:
+            graph = get_ontology_graph()
+            close_after = True
 
-    close_after = False
-    if graph is None:
-        graph = get_ontology_graph()
-        close_after = True
+        try:
+            # Detect ontology type
+            if not isinstance(data, dict):
+                # L5X ontology (list of AOIs)
+                _import_aois(graph, data)
+            elif data.get("type") == "troubleshooting_ontology":
+                # Troubleshooting ontology
+                aois = data.get("aois", [])
+                _import_aois(graph, aois)
+                for aoi in aois:
+                    if "troubleshooting" in aoi:
+                        graph.add_troubleshooting(aoi["name"], aoi["troubleshooting"])
+                # Operator dictionary
+                op_dict = data.get("operator_dictionary", {})
+                for key, phrase_data in op_dict.get("common_phrases", {}).items():
+                    graph.create_common_phrase(key, phrase_data)
+            elif data.get("type") == "unified_system_ontology":
+                # Unified ontology
+                _import_unified(graph, data)
+            elif data.get("source") == "ignition":
+                # Ignition ontology
+                _import_ignition(graph, data)
+            else:
+                # Single AOI or unknown
+                _import_aoi(graph, data)
 
-    try:
-        # Detect ontology type
-        if isinstance(data, list):
-            # L5X ontology (list of AOIs)
-            for aoi in data:
-                _import_aoi(graph, aoi)
-        elif data.get("type") == "troubleshooting_ontology":
-            # Troubleshooting ontology
-            for aoi in data.get("aois", []):
-                _import_aoi(graph, aoi)
-                if "troubleshooting" in aoi:
-                    graph.add_troubleshooting(aoi["name"], aoi["troubleshooting"])
-            # Operator dictionary
-            op_dict = data.get("operator_dictionary", {})
-            for key, phrase_data in op_dict.get("common_phrases", {}).items():
-                graph.create_common_phrase(key, phrase_data)
-        elif data.get("type") == "unified_system_ontology":
-            # Unified ontology
-            _import_unified(graph, data)
-        elif data.get("source") == "ignition":
-            # Ignition ontology
-            _import_ignition(graph, data)
-        else:
-            # Single AOI or unknown
-            _import_aoi(graph, data)
+            print(f"[OK] Imported {json_path} into Neo4j")
+        finally:
+            if close_after:
+                graph.close()
+
+
+def _starts_with_array(f) -> bool:
+    """Whether the JSON document in binary file *f* is a top-level array."""
+    head = f.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")
+    f.seek(0)
+    return head.startswith(b"[")
 
-        print(f"[OK] Imported {json_path} into Neo4j")
-    finally:
-        if close_after:
-            graph.close()
+
+def _import_aois(graph: OntologyGraph, aois: Iterable[Dict]) -> None:
+    """Import AOIs into the graph, AOI_WRITE_BATCH per transaction.
+
+    *aois* may be a lazy stream (e.g. from ijson); only one batch is held.
+    """
+    aois = iter(aois)
+    while True:
+        batch = [
+            {
+                "name": aoi.get("name", "Unknown"),
+                "type": aoi.get("type", "AOI"),
+                "source_file": aoi.get("source_file", ""),
+                "metadata": aoi.get("metadata", {}),
+                "analysis": aoi.get("analysis", {}),
+            }
+            for aoi in itertools.islice(aois, AOI_WRITE_BATCH)
+        ]
+        if not batch:
+            return
+        graph.create_aois_bulk(batch)
 
 
 def _import_aoi(graph: OntologyGraph, aoi: Dict) -> None:
     """Import a single AOI into the graph."""
-    graph.create_aoi(
-        name=aoi.get("name", "Unknown"),
-        aoi_type=aoi.get("type", "AOI"),
-        source_file=aoi.get("source_file", ""),
-        metadata=aoi.get("metadata", {}),
-        analysis=aoi.get("analysis", {}),
-    )
+    _import_aois(graph, [aoi])
 
 
 def _import_unified(graph: OntologyGraph, data: Dict) -> None:
@@ -4518,34 +6059,18 @@ def _import_unified(graph: OntologyGraph, data: Dict) -> None:
     # PLC components
     plc_ontology = data.get("component_ontologies", {}).get("plc", [])
     if isinstance(plc_ontology, list):
-        for aoi in plc_ontology:
-            _import_aoi(graph, aoi)
+        _import_aois(graph, plc_ontology)
 
     # SCADA components
     scada_ontology = data.get("component_ontologies", {}).get("scada", {})
     scada_analysis = scada_ontology.get("analysis", {})
 
-    for udt_name, udt_purpose in scada_analysis.get("udt_semantics", {}).items():
-        graph.create_udt(udt_name, udt_purpose, scada_ontology.get("source_file", ""))
-
-    for equip in scada_analysis.get("equipment_instances", []):
-        graph.create_equipment(
-            equip.get("name", ""),
-            equip.get("type", ""),
-            equip.get("purpose", ""),
-        )
-
-    for view_name, view_purpose in scada_analysis.get("view_purposes", {}).items():
-        graph.create_view(view_name, "", view_purpose)
+    _import_scada_analysis(
+        graph, scada_analysis, scada_ontology.get("source_file", "")
+    )
 
     # PLC-to-SCADA mappings
-    for mapping in ua.get("plc_to_scada_mappings", []):
-        graph.create_plc_scada_mapping(
-            mapping.get("plc_component", ""),
-            mapping.get("scada_component", ""),
-            mapping.get("mapping_type", ""),
-            mapping.get("description", ""),
-        )
+    graph.create_plc_scada_mappings(ua.get("plc_to_scada_mappings", []))
 
     # End-to-end flows
     for flow in ua.get("end_to_end_flows", []):
@@ -4555,20 +6080,28 @@ def _import_unified(graph: OntologyGraph, data: Dict) -> None:
 
 def _import_ignition(graph: OntologyGraph, data: Dict) -> None:
     """Import an Ignition ontology."""
-    analysis = data.get("analysis", {})
-
-    for udt_name, udt_purpose in analysis.get("udt_semantics", {}).items():
-        graph.create_udt(udt_name, udt_purpose, data.get("source_file", ""))
+    _import_scada_analysis(
+        graph, data.get("analysis", {}), data.get("source_file", "")
+    )
 
-    for equip in analysis.get("equipment_instances", []):
-        graph.create_equipment(
-            equip.get("name", ""),
-            equip.get("type", ""),
-            equip.get("purpose", ""),
-        )
 
-    for view_name, view_purpose in analysis.get("view_purposes", {}).items():
-        graph.create_view(view_name, "", view_purpose)
+def _import_scada_analysis(
+    graph: OntologyGraph, analysis: Dict, source_file: str
+) -> None:
+    """Import the UDTs, equipment and views of an Ignition analysis in bulk."""
+    graph.create_udts_bulk(
+        [
+            {"name": name, "purpose": purpose, "source_file": source_file}
+            for name, purpose in analysis.get("udt_semantics", {}).items()
+        ]
+    )
+    graph.create_equipment_bulk(analysis.get("equipment_instances", []))
+    graph.create_views_bulk(
+        [
+            {"name": name, "purpose": purpose}
+            for name, purpose in analysis.get("view_purposes", {}).items()
+        ]
+    )
 
 
 # =========================================================================
@@ -7,46 +7,130 @@ Includes edge cases: zero good count, high planned downtime, performance bottlen
 Converted from Ignition Jython to standalone Python 3.
 """
 
+import os
+import threading
 import pyodbc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 import sys
 
-# Database connection settings
-# You can modify these or pass via command line / environment variables
-DB_SERVER = "20.127.233.148"
-DB_DATABASE = "model"  # Change this to your target database
-DB_USERNAME = "leor"  # Fill in your username
-DB_PASSWORD = "leortest1!!!"  # Fill in your password
+# Let the ODBC driver manager keep closed connections for reuse; this must be
+# set before the first pyodbc.connect()
+pyodbc.pooling = True
 
-# Global connection object
-_connection = None
 
+@dataclass(frozen=True)
+class DBConfig:
+    """SQL Server connection settings (defaults come from OEE_DB_* variables)."""
 
-def get_connection():
-    """Get or create database connection."""
-    global _connection
-    if _connection is None:
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_DATABASE};"
-            f"UID={DB_USERNAME};"
-            f"PWD={DB_PASSWORD}"
+    server: str = os.getenv("OEE_DB_SERVER", "20.127.233.148")
+    database: str = os.getenv("OEE_DB_DATABASE", "model")
+    username: str = os.getenv("OEE_DB_USERNAME", "")
+    password: str = os.getenv("OEE_DB_PASSWORD", "")
+    driver: str = os.getenv("OEE_DB_DRIVER", "ODBC Driver 17 for SQL Server")
+
+    def connection_string(self):
+        return (
+            f"DRIVER={{{self.driver}}};"
+            f"SERVER={self.server};"
+            f"DATABASE={self.database};"
+            f"UID={self.username};"
+            f"PWD={self.password}"
         )
-        _connection = pyodbc.connect(conn_str)
-        _connection.autocommit = True
-    return _connection
+
+
+# SQL Server accepts at most 2100 parameters and 1000 row constructors
+MAX_PARAMS_PER_STATEMENT = 2100
+MAX_ROWS_PER_INSERT = 1000
+
+# Settings for the current run; each thread keeps its own connection and
+# cursor so the child-table loaders can run side by side
+_config = DBConfig()
+_local = threading.local()
+
+# Reference time all generated timestamps are offset from (set per run)
+_now = None
+
+
+def get_connection():
+    """Get or create this thread's database connection."""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        conn = _local.connection = pyodbc.connect(_config.connection_string())
+    return conn
+
+
+def get_cursor():
+    """Get or create the cursor shared by this thread's statements."""
+    cursor = getattr(_local, "cursor", None)
+    if cursor is None:
+        cursor = _local.cursor = get_connection().cursor()
+    return cursor
+
+
+def close_connection(commit=False):
+    """Commit or roll back, then close this thread's cursor and connection."""
+    cursor = getattr(_local, "cursor", None)
+    if cursor is not None:
+        cursor.close()
+        _local.cursor = None
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        if not conn.autocommit:
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        conn.close()
+        _local.connection = None
+
+
+def run_in_transaction(populate):
+    """
+    Run one populate function on its own connection and transaction.
+    Commits if it succeeds, rolls back otherwise.
+    """
+    committed = False
+    try:
+        get_connection().autocommit = False
+        committed = populate()
+        return committed
+    finally:
+        close_connection(commit=committed)
 
 
 def run_update_query(query, params=None):
     """Execute an update query (INSERT, UPDATE, DELETE, CREATE, DROP)."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    cursor = get_cursor()
     if params:
         cursor.execute(query, params)
     else:
         cursor.execute(query)
-    cursor.close()
+
+
+def run_many(insertHead, rows):
+    """
+    Insert many rows with multi-row INSERT ... VALUES (...), (...) statements.
+    insertHead is the "INSERT INTO table (columns)" part; rows are tuples.
+    """
+    if not rows:
+        return
+    width = len(rows[0])
+    rowsPerInsert = min(MAX_ROWS_PER_INSERT, (MAX_PARAMS_PER_STATEMENT - 1) // width)
+    placeholders = "(" + ", ".join(["?"] * width) + ")"
+    # pyodbc only re-prepares when it is handed a different SQL object than the
+    # cursor's last statement, so every full chunk reuses this one string and
+    # the driver prepares it once; only a short final chunk needs its own text
+    fullQuery = insertHead + " VALUES " + ", ".join([placeholders] * rowsPerInsert)
+    cursor = get_cursor()
+    for start in range(0, len(rows), rowsPerInsert):
+        chunk = rows[start : start + rowsPerInsert]
+        if len(chunk) == rowsPerInsert:
+            query = fullQuery
+        else:
+            query = insertHead + " VALUES " + ", ".join([placeholders] * len(chunk))
+        cursor.execute(query, [value for row in chunk for value in row])
 
 
 def createTables():
@@ -140,13 +224,9 @@ def populateMachineData():
 
         insertQuery = """
         INSERT INTO machine (machine_id, machine_name, ideal_cycle_time, description)
-        VALUES (?, ?, ?, ?)
         """
 
-        for machine in machines:
-            run_update_query(
-                insertQuery, [machine[0], machine[1], machine[2], machine[3]]
-            )
+        run_many(insertQuery, machines)
 
         return True
     except Exception as e:
@@ -156,9 +236,10 @@ def populateMachineData():
 
 def getTimestamp(hoursOffset, minutesOffset=0):
     """
-    Helper function to generate timestamps relative to now
+    Helper function to generate timestamps relative to the run's start time
     """
-    return datetime.now() + timedelta(hours=hoursOffset, minutes=minutesOffset)
+    now = _now if _now is not None else datetime.now()
+    return now + timedelta(hours=hoursOffset, minutes=minutesOffset)
 
 
 def populateProductionData():
@@ -347,21 +428,17 @@ def populateProductionData():
 
         insertQuery = """
         INSERT INTO production (machine_id, timestamp, good_count, reject_count, total_count)
-        VALUES (?, ?, ?, ?, ?)
         """
 
-        for machineId in range(1, 7):
-            machineData = allMachineData[machineId - 1]
-            for hour in range(24):
-                goodCount = machineData[hour][0]
-                rejectCount = machineData[hour][1]
-                totalCount = goodCount + rejectCount
-                timestamp = getTimestamp(-24 + hour, 30)  # Set to half-past each hour
+        # Half-past each hour, shared by all machines
+        timestamps = [getTimestamp(-24 + hour, 30) for hour in range(24)]
+        rows = [
+            (machineId, timestamp, goodCount, rejectCount, goodCount + rejectCount)
+            for machineId, machineData in enumerate(allMachineData, 1)
+            for timestamp, (goodCount, rejectCount) in zip(timestamps, machineData)
+        ]
 
-                run_update_query(
-                    insertQuery,
-                    [machineId, timestamp, goodCount, rejectCount, totalCount],
-                )
+        run_many(insertQuery, rows)
 
         return True
     except Exception as e:
@@ -376,7 +453,6 @@ def populateRuntimeData():
     try:
         insertQuery = """
         INSERT INTO runtime (machine_id, start_time, end_time, duration_minutes)
-        VALUES (?, ?, ?, ?)
         """
 
         # Machine 1: Normal 3 shift operation
@@ -434,13 +510,16 @@ def populateRuntimeData():
             ]
         )
 
+        rows = []
         for runtime in runtimes:
             machineId = runtime[0]
             startTime = getTimestamp(runtime[1], runtime[2])
             endTime = getTimestamp(runtime[3], runtime[4])
             duration = runtime[5]
 
-            run_update_query(insertQuery, [machineId, startTime, endTime, duration])
+            rows.append((machineId, startTime, endTime, duration))
+
+        run_many(insertQuery, rows)
 
         return True
     except Exception as e:
@@ -456,7 +535,6 @@ def populateDowntimeData():
     try:
         insertQuery = """
         INSERT INTO downtime (machine_id, start_time, end_time, duration_minutes, downtime_type, reason)
-        VALUES (?, ?, ?, ?, ?, ?)
         """
 
         downtimes = [
@@ -487,6 +565,7 @@ def populateDowntimeData():
             (6, -4, 0, -2, 0, 120, "Unplanned", "Quality inspection failure"),
         ]
 
+        rows = []
         for downtime in downtimes:
             machineId = downtime[0]
             startTime = getTimestamp(downtime[1], downtime[2])
@@ -495,53 +574,63 @@ def populateDowntimeData():
             downtimeType = downtime[6]
             reason = downtime[7]
 
-            run_update_query(
-                insertQuery,
-                [machineId, startTime, endTime, duration, downtimeType, reason],
+            rows.append(
+                (machineId, startTime, endTime, duration, downtimeType, reason)
             )
 
+        run_many(insertQuery, rows)
+
         return True
     except Exception as e:
         print(f"Error populating downtime data: {e}")
         return False
 
 
-def generateAllData():
+def generateAllData(config=None):
     """
     Main function to create tables and populate all OEE sample data
+    config: DBConfig to connect with (defaults to the OEE_DB_* environment)
     """
+    global _now, _config
+    if config is not None:
+        _config = config
     try:
         print("Starting OEE sample data generation...")
+        conn = get_connection()
+        _now = datetime.now()
 
-        # Create tables
+        # Create tables (DDL runs outside the data transactions)
+        conn.autocommit = True
         if not createTables():
             print("Failed to create tables")
             return False
         print("Tables created successfully")
+        close_connection()
 
-        # Populate machine data
-        if not populateMachineData():
+        # Machine rows are the FK parent, so they are committed first
+        if not run_in_transaction(populateMachineData):
             print("Failed to populate machine data")
             return False
         print("Machine data populated successfully")
 
-        # Populate production data
-        if not populateProductionData():
-            print("Failed to populate production data")
-            return False
-        print("Production data populated successfully")
-
-        # Populate runtime data
-        if not populateRuntimeData():
-            print("Failed to populate runtime data")
-            return False
-        print("Runtime data populated successfully")
-
-        # Populate downtime data
-        if not populateDowntimeData():
-            print("Failed to populate downtime data")
-            return False
-        print("Downtime data populated successfully")
+        # The child tables are independent: load them concurrently, each in
+        # its own transaction
+        loaders = {
+            populateProductionData: "Production",
+            populateRuntimeData: "Runtime",
+            populateDowntimeData: "Downtime",
+        }
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = {
+                executor.submit(run_in_transaction, loader): name
+                for loader, name in loaders.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                if not future.result():
+                    print(f"Failed to populate {name.lower()} data")
+                    return False
+                print(f"{name} data populated successfully")
 
         print("OEE sample data generation complete!")
         return True
@@ -551,23 +640,20 @@ def generateAllData():
         return False
     finally:
         # Close connection when done
-        global _connection
-        if _connection:
-            _connection.close()
-            _connection = None
+        close_connection()
 
 
 if __name__ == "__main__":
     # Allow passing credentials via command line args
+    config = DBConfig()
     if len(sys.argv) >= 3:
-        DB_USERNAME = sys.argv[1]
-        DB_PASSWORD = sys.argv[2]
+        config = replace(config, username=sys.argv[1], password=sys.argv[2])
     if len(sys.argv) >= 4:
-        DB_DATABASE = sys.argv[3]
+        config = replace(config, database=sys.argv[3])
 
-    if not DB_USERNAME or not DB_PASSWORD:
+    if not config.username or not config.password:
         print("Usage: python oee_sample_data.py <username> <password> [database]")
-        print("  database defaults to 'master' if not specified")
+        print("  or set OEE_DB_USERNAME / OEE_DB_PASSWORD (and OEE_DB_SERVER, OEE_DB_DATABASE)")
         sys.exit(1)
 
-    generateAllData()
+    generateAllData(config)
@@ -10,17 +10,338 @@ Uses tool calls to query existing ontology data, enabling Claude to build
 on existing knowledge rather than starting from scratch.
 """
 
+from __future__ import annotations
+
 import os
 import json
-from typing import Dict, List, Optional, Any
+import hashlib
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from pathlib import Path
 
-from sc_parser import SCParser, SCFile, Tag
-from siemens_parser import SiemensSTParser
-from tia_xml_parser import TiaXmlParser
-from siemens_project_parser import SiemensProjectParser, TiaProject
-from neo4j_ontology import OntologyGraph, get_ontology_graph
-from claude_client import ClaudeClient, get_claude_client
+from neo4j_ontology import AOI_WRITE_BATCH, OntologyGraph, get_ontology_graph
+
+# Parsers and the Claude client (which pulls in anthropic, most of the
+# startup time) are imported where they are used, so Neo4j-only commands
+# like --status, --list, --get and --export start quickly
+if TYPE_CHECKING:
+    from neo4j import Session
+
+    from claude_client import ClaudeClient
+    from sc_parser import SCFile, Tag
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, faster ontology dumps
+    orjson = None
+
+try:
+    from tqdm import tqdm
+except ImportError:  # pragma: no cover - optional, directory scan progress bars
+    tqdm = None
+
+# Default max Claude analyses in flight at once during a directory scan
+ANALYSIS_CONCURRENCY = 8
+
+# Worker processes for parsing PLC source files during a directory scan
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Output token budget per analysis call: scaled from the input size (~4 chars
+# per token) so small components don't reserve the full ceiling. The answer
+# is a forced emit_ontology call with no surrounding prose, so the budget is
+# sized for typical analyses; a call cut off by it is retried with double the
+# budget, up to ANALYSIS_TOKENS_CEILING
+ANALYSIS_MAX_TOKENS = 8192
+ANALYSIS_MIN_TOKENS = 4096
+ANALYSIS_TOKENS_CEILING = 20000
+
+# Analysis context is assembled to fit a token budget (~4 chars per token):
+# tag interfaces always go in full, locals get a capped share, and the rest
+# is split between routines (each gets at least MIN_ROUTINE_CHARS)
+DEFAULT_CONTEXT_BUDGET = 8000
+CHARS_PER_TOKEN = 4
+LOCAL_TAGS_BUDGET_SHARE = 0.15
+MIN_ROUTINE_CHARS = 1500
+
+# Undescribed components with fewer logic units (rungs, ST lines and local
+# tags) than this get a synthesized analysis instead of a Claude call
+TRIVIAL_COMPLEXITY_THRESHOLD = 3
+
+# AOIs per read transaction when exporting the ontology
+EXPORT_PAGE_SIZE = 1000
+
+# Seconds between status checks while a Message Batch is processing
+BATCH_POLL_INTERVAL = 30.0
+
+# Requests and request JSON per Message Batch, under the API's limits of
+# 100,000 requests and 256 MB so large directories are split across batches
+BATCH_MAX_REQUESTS = 10000
+BATCH_MAX_BYTES = 200 * 1024 * 1024
+
+# Default on-disk cache of Claude analyses, keyed by a hash of the LLM input.
+# Bump ANALYSIS_CACHE_VERSION when the prompts or result schema change.
+DEFAULT_ANALYSIS_CACHE_DIR = ".ontology_cache"
+ANALYSIS_CACHE_VERSION = 1
+
+# How an analysis was produced, hashed into its cache key. Only a tool-based
+# analysis (Claude explored the graph) stands in for the other variants.
+ANALYSIS_VARIANT_TOOLS = "tools"
+ANALYSIS_VARIANT_NO_TOOLS = "no-tools"
+ANALYSIS_VARIANT_SCHEMA = "schema"
+ANALYSIS_VARIANT_BATCH = "batch"
+
+# Claude hands back its final analysis as this tool's input, so the ontology
+# arrives as a dict instead of JSON text that has to be fished out of fences
+ONTOLOGY_RESULT_TOOL = {
+    "name": "emit_ontology",
+    "description": (
+        "Submit the final semantic ontology for the analyzed PLC component. "
+        "Call this exactly once, after exploring the existing ontology."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "purpose": {
+                "type": "string",
+                "description": "Functional purpose of the component",
+            },
+            "tags": {
+                "type": "object",
+                "description": "Tag name -> semantic description",
+                "additionalProperties": {"type": "string"},
+            },
+            "relationships": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "from": {"type": "string"},
+                        "to": {"type": "string"},
+                        "relationship_type": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                },
+            },
+            "control_patterns": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "pattern": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                },
+            },
+            "data_flows": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                },
+            },
+            "safety_critical": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "element": {"type": "string"},
+                        "criticality": {"type": "string"},
+                        "reason": {"type": "string"},
+                    },
+                },
+            },
+        },
+        "required": ["purpose", "tags"],
+    },
+}
+
+# Analysis prompts, built once at import so every request sends byte-identical
+# text and the prompt-cache prefix stays stable. The batch variants drop the
+# graph-exploration instructions: batched requests cannot call the Neo4j tools.
+_SYSTEM_PROMPT_INTRO = """You are an expert PLC (Programmable Logic Controller) engineer specializing in analyzing industrial control logic from both Rockwell/Allen-Bradley and Siemens platforms. Your task is to analyze PLC code and generate semantic ontologies that explain what tags (variables) mean and how the PLC manipulates them.
+
+You understand both platforms:
+- Rockwell: Add-On Instructions (AOIs), UDTs, ladder logic (RLL), structured text (ST)
+- Siemens: Function Blocks (CLASS), Types (STRUCT/UDT), Programs (PROGRAM), Configurations, Methods, SCL/ST
+
+"""
+_SYSTEM_PROMPT_TOOLS = """You have access to tools that let you query the existing ontology database:
+- get_schema: Discover what node types and relationships exist
+- run_query: Execute Cypher queries to explore existing data
+- get_node: Get details of a specific node
+
+USE THESE TOOLS to explore what already exists before analyzing new components. This helps you:
+- Maintain consistent naming and descriptions
+- Identify relationships to existing components
+- Build on existing knowledge rather than starting from scratch
+- Use established terminology and relationship types from the codebase
+
+"""
+_SYSTEM_PROMPT_OUTPUT = """For each PLC component, provide:
+1. **Functional Purpose**: High-level description of what this component does
+2. **Tag Semantics**: For each important tag, explain its semantic meaning
+3. **Relationships**: How tags influence each other (use consistent relationship types)
+4. **Control Patterns**: Identify patterns (use existing pattern names when applicable)
+5. **Data Flow**: Key paths showing how inputs lead to outputs
+6. **Safety-Critical Elements**: Any tags or logic related to safety"""
+
+# With --schema-in-prompt the graph schema is inlined here instead of being
+# fetched through tool rounds (the snapshot is taken once per analyzer)
+_SYSTEM_PROMPT_SCHEMA = """The existing ontology database has this schema (node labels, relationship types and patterns). Keep your naming and relationship types consistent with it:
+<schema>
+{schema}
+</schema>
+
+"""
+
+_SYSTEM_PROMPT = _SYSTEM_PROMPT_INTRO + _SYSTEM_PROMPT_TOOLS + _SYSTEM_PROMPT_OUTPUT
+_BATCH_SYSTEM_PROMPT = _SYSTEM_PROMPT_INTRO + _SYSTEM_PROMPT_OUTPUT
+
+_USER_PROMPT_FIELDS = """ your analysis by calling the emit_ontology tool with these fields:
+- "purpose": string describing the functional purpose
+- "tags": object mapping tag names to their semantic descriptions
+- "relationships": array of {from, to, relationship_type, description} objects
+- "control_patterns": array of {pattern, description} objects (use existing pattern names when possible)
+- "data_flows": array of {path, description} objects
+- "safety_critical": array of {element, criticality, reason} objects
+
+Be concise but informative. Focus on the "why" and "what" rather than just restating the syntax.
+
+## Component to Analyze:
+
+"""
+_USER_PROMPT_PREFIX = (
+    """Analyze this PLC component and generate a semantic ontology.
+
+FIRST, use the available tools to explore the existing ontology:
+1. Use get_schema to understand what data exists
+2. Query for similar AOIs or tags that might be related
+3. Check existing control patterns and relationship types for consistency
+
+THEN, submit"""
+    + _USER_PROMPT_FIELDS
+)
+_BATCH_USER_PROMPT_PREFIX = (
+    """Analyze this PLC component and generate a semantic ontology.
+
+Submit"""
+    + _USER_PROMPT_FIELDS
+)
+
+
+def dump_json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def progress_bar(desc: str, total: Optional[int] = None) -> Optional[Any]:
+    """A tqdm progress bar when tqdm is installed and stdout is a terminal.
+
+    Returns None otherwise (piped output, CI logs, the Electron UI), in which
+    case callers keep printing one line per file.
+    """
+    if tqdm is None or not sys.stdout.isatty():
+        return None
+    return tqdm(desc=desc, total=total, unit="file")
+
+
+def progress_write(bar: Optional[Any], message: str) -> None:
+    """Print message without breaking bar's line (plain print if no bar)."""
+    if bar is not None:
+        bar.write(message)
+    else:
+        print(message)
+
+
+def write_json_array(f: BinaryIO, items: Iterable[Any]) -> int:
+    """Write items to a binary file as an indented JSON array, one at a time.
+
+    The layout matches json.dump(list(items), f, indent=2) without holding
+    the whole list. Returns the number of items written.
+    """
+    count = 0
+    for item in items:
+        f.write(b"[\n  " if count == 0 else b",\n  ")
+        f.write(dump_json_bytes(item, indent=True).replace(b"\n", b"\n  "))
+        count += 1
+    f.write(b"\n]" if count else b"[]")
+    return count
+
+
+def submit_bounded(
+    items: Iterable[Any], submit: Callable[[Any], Future], limit: int
+) -> Iterator[Tuple[Any, Future]]:
+    """Submit each item, at most limit in flight, yielding (item, future) as done.
+
+    items is only advanced when a slot frees up, so a huge or lazily
+    produced input is never queued (and held in memory) all at once.
+    """
+    pending: Dict[Future, Any] = {}
+    for item in items:
+        pending[submit(item)] = item
+        if len(pending) >= limit:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield pending.pop(future), future
+    for future in as_completed(pending):
+        yield pending[future], future
+
+
+def parse_plc_file(kind: str, path: str) -> List[SCFile]:
+    """Parse one PLC source file into blocks ("sc", "siemens" or "tia_xml").
+
+    Module-level so directory scans can run it in worker processes.
+    """
+    if kind == "tia_xml":
+        from tia_xml_parser import TiaXmlParser
+
+        return TiaXmlParser().parse_file(path) or []
+    if kind == "siemens":
+        # Siemens .st files can contain multiple blocks
+        from siemens_parser import SiemensSTParser
+
+        return SiemensSTParser().parse_file(path) or []
+    from sc_parser import SCParser
+
+    return [SCParser().parse_file(path)]
+
+
+def iter_ontologies(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield ontologies from an NDJSON file written by analyze_directory."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
 
 
 class OntologyAnalyzer:
@@ -32,6 +353,13 @@ class OntologyAnalyzer:
         model: str = "claude-sonnet-4-5-20250929",
         graph: Optional[OntologyGraph] = None,
         client: Optional[ClaudeClient] = None,
+        cache_dir: Optional[str] = None,
+        concurrency: int = ANALYSIS_CONCURRENCY,
+        context_budget: int = DEFAULT_CONTEXT_BUDGET,
+        force: bool = False,
+        trivial_threshold: int = TRIVIAL_COMPLEXITY_THRESHOLD,
+        schema_in_prompt: bool = False,
+        enable_tools: bool = True,
     ):
         """
         Initialize the analyzer.
@@ -40,31 +368,86 @@ class OntologyAnalyzer:
             api_key: Anthropic API key (uses env var if not provided)
             model: Claude model to use
             graph: Optional Neo4j connection (uses client's if not provided)
-            client: Optional ClaudeClient (created if not provided)
+            client: Optional ClaudeClient (created on first use if not
+                provided, so graph-only use never imports anthropic)
+            cache_dir: Optional directory for caching Claude analyses by content
+                hash, so unchanged files are not re-sent on later runs
+            concurrency: Max Claude analyses in flight during a directory scan;
+                lower it if the account's rate limits are hit
+            context_budget: Approximate input tokens of PLC code context per
+                component; locals and logic are trimmed to fit
+            force: Re-analyze every component, even when Neo4j or the disk
+                cache already holds an analysis of the same input
+            trivial_threshold: Components without a description and with fewer
+                logic units than this skip Claude (0 sends everything)
+            schema_in_prompt: Inline a one-time snapshot of the graph schema
+                into the system prompt and analyze in a single turn, instead
+                of letting Claude explore the graph through tool calls
+            enable_tools: Let analyses explore the graph through the Neo4j
+                tools (given to a client created here; part of the cache key)
         """
-        # Use provided client or create one
-        if client:
-            self._client = client
-            self._owns_client = False
-        else:
-            self._client = ClaudeClient(
-                api_key=api_key, model=model, graph=graph, enable_tools=True
-            )
-            self._owns_client = True
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.concurrency = max(1, concurrency)
+        self.context_budget = context_budget
+        self.force = force
+        self.trivial_threshold = trivial_threshold
+        self.schema_in_prompt = schema_in_prompt
+        self._schema_system_prompt: Optional[str] = None
+        self._schema_lock = threading.Lock()
+
+        # Use provided client or create one when Claude is first needed
+        self._client = client
+        self._owns_client = client is None
+        self._api_key = api_key
+        self.model = client.model if client else model
+        self.enable_tools = enable_tools
+        self._graph = graph
+        self._owns_graph = False
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> ClaudeClient:
+        """The Claude client, created (and anthropic imported) on first use."""
+        with self._client_lock:
+            if self._client is None:
+                from claude_client import ClaudeClient
+
+                self._client = ClaudeClient(
+                    api_key=self._api_key,
+                    model=self.model,
+                    graph=self._graph,
+                    enable_tools=self.enable_tools,
+                )
+            return self._client
 
     @property
     def graph(self) -> OntologyGraph:
-        """Access the Neo4j graph."""
-        return self._client.graph
+        """Access the Neo4j graph (connected on first use, once)."""
+        with self._client_lock:
+            if self._client is not None:
+                return self._client.graph
+            if self._graph is None:
+                self._graph = get_ontology_graph()
+                self._owns_graph = True
+            return self._graph
 
     def close(self):
         """Close resources if we own them."""
         if self._owns_client and self._client:
             self._client.close()
             self._client = None
+        if self._owns_graph and self._graph:
+            self._graph.close()
+            self._graph = None
 
     def analyze_sc_file(
-        self, sc_file: SCFile, verbose: bool = False, skip_ai: bool = False
+        self,
+        sc_file: SCFile,
+        verbose: bool = False,
+        skip_ai: bool = False,
+        session: Optional[Session] = None,
+        pending_writes: Optional[List[Dict[str, Any]]] = None,
+        notes: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Analyze a parsed SC file and store ontology in Neo4j.
 
@@ -72,6 +455,11 @@ class OntologyAnalyzer:
             sc_file: Parsed SC file
             verbose: Print detailed progress
             skip_ai: If True, skip AI analysis and just create the AOI node with pending status
+            session: Optional Neo4j session to write through
+            pending_writes: If given, the create_aois_bulk row for the ontology
+                is appended here instead of being written (see analyze_directory)
+            notes: If given, status lines are appended here for the caller to
+                report (e.g. above a progress bar) instead of being printed
         """
 
         if verbose:
@@ -83,10 +471,124 @@ class OntologyAnalyzer:
         else:
             # Build context for LLM
             context = self._build_analysis_context(sc_file)
-            # Generate analysis using Claude with tool support
-            analysis = self._query_llm(context, sc_file.name, verbose)
+            cache_keys = self._analysis_cache_keys(context, self._analysis_variant)
+
+            # Unchanged since it was last analyzed - already stored as-is
+            stored = self._stored_ontology(sc_file, cache_keys)
+            if stored is not None:
+                if verbose:
+                    print(f"[INFO] {sc_file.name} unchanged, keeping stored analysis")
+                return stored
+
+            analysis, cache_key = self._load_cached_analysis(cache_keys)
+            if analysis is not None:
+                if verbose:
+                    print(f"[INFO] Using cached analysis for {sc_file.name}")
+            else:
+                analysis = self._trivial_analysis(sc_file)
+                if analysis is not None:
+                    # Synthesized, so re-checked on every run
+                    cache_key = None
+                    note = (
+                        f"[INFO] Skipped LLM for trivial {sc_file.type} {sc_file.name}"
+                    )
+                    if notes is not None:
+                        notes.append(note)
+                    else:
+                        print(note)
+                else:
+                    # Generate analysis using Claude with tool support
+                    analysis = self._query_llm(context, sc_file.name, verbose)
+                    self._store_cached_analysis(cache_key, analysis)
+
+            return self._store_ontology(
+                sc_file,
+                analysis,
+                verbose=verbose,
+                session=session,
+                analysis_hash=cache_key,
+                pending_writes=pending_writes,
+            )
+
+        return self._store_ontology(
+            sc_file, analysis, skip_ai, verbose, session, pending_writes=pending_writes
+        )
+
+    def _stored_ontology(
+        self, sc_file: SCFile, cache_keys: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """The AOI already in Neo4j for this exact analysis input, if any."""
+        if self.force:
+            return None
+        for cache_key in cache_keys:
+            stored = self.graph.get_aoi_by_analysis_hash(cache_key)
+            if stored is not None and stored.get("name") == sc_file.name:
+                return stored
+        return None
+
+    @staticmethod
+    def _complexity(sc_file: SCFile) -> int:
+        """Logic units in a component: rungs, ST body lines and local tags."""
+        units = len(sc_file.local_tags)
+        for routine in sc_file.routines:
+            if routine.get("rungs"):
+                units += len(routine["rungs"])
+            else:
+                raw = routine.get("raw_content") or ""
+                units += sum(1 for line in raw.splitlines() if line.strip())
+        return units
+
+    def _trivial_analysis(self, sc_file: SCFile) -> Optional[Dict[str, Any]]:
+        """Synthesized analysis for a thin wrapper component, or None.
+
+        Undescribed components below trivial_threshold have too little logic
+        for Claude to add anything beyond the tag list, so that is all the
+        analysis records.
+        """
+        if sc_file.description:
+            return None
+        complexity = self._complexity(sc_file)
+        if complexity >= self.trivial_threshold:
+            return None
+
+        rungs = sum(len(r.get("rungs") or []) for r in sc_file.routines)
+        tags = {}
+        for attr in ("input_tags", "output_tags", "inout_tags", "local_tags"):
+            for tag in getattr(sc_file, attr):
+                tags[tag.name] = (
+                    f"{tag.data_type} - {tag.description}"
+                    if tag.description
+                    else tag.data_type
+                )
+        return {
+            "purpose": (
+                f"Pass-through/wrapper {sc_file.type} "
+                f"({rungs} rungs, {complexity} logic units)"
+            ),
+            "tags": tags,
+            "relationships": [],
+            "control_patterns": [],
+            "data_flows": [],
+            "safety_critical": [],
+        }
+
+    def _store_ontology(
+        self,
+        sc_file: SCFile,
+        analysis: Dict[str, Any],
+        skip_ai: bool = False,
+        verbose: bool = False,
+        session: Optional[Session] = None,
+        analysis_hash: Optional[str] = None,
+        pending_writes: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Structure an analysis into an ontology dict and store it in Neo4j.
 
-        # Structure the response
+        analysis_hash is recorded only for successful Claude analyses, so failed
+        ones are retried on the next run. skip_ai imports are written as pending
+        placeholders. With pending_writes the write is queued there as a bulk
+        row instead (see _flush_pending_writes).
+        """
         ontology = {
             "name": sc_file.name,
             "type": sc_file.type,
@@ -99,21 +601,120 @@ class OntologyAnalyzer:
             "analysis": analysis,
         }
 
-        # Store in Neo4j (with semantic_status='pending' if skip_ai)
-        self.graph.create_aoi(
-            name=ontology["name"],
-            aoi_type=ontology["type"],
-            source_file=ontology["source_file"],
-            metadata=ontology["metadata"],
-            analysis=ontology["analysis"],
-            semantic_status="pending" if skip_ai else "complete",
-        )
+        semantic_status = "pending" if skip_ai else "complete"
+        if "raw_response" in analysis:
+            analysis_hash = None
+        if pending_writes is not None:
+            pending_writes.append(
+                {
+                    **ontology,
+                    "semantic_status": semantic_status,
+                    "analysis_hash": analysis_hash,
+                }
+            )
+            return ontology
+
+        if skip_ai:
+            # Import only: a pending placeholder that keeps existing AOIs as-is
+            self.graph.create_aoi_stub(
+                ontology["name"],
+                ontology["type"],
+                ontology["source_file"],
+                ontology["metadata"],
+                session=session,
+            )
+        else:
+            self.graph.create_aoi(
+                name=ontology["name"],
+                aoi_type=ontology["type"],
+                source_file=ontology["source_file"],
+                metadata=ontology["metadata"],
+                analysis=ontology["analysis"],
+                semantic_status=semantic_status,
+                session=session,
+                analysis_hash=analysis_hash,
+            )
 
         if verbose:
             print(f"[OK] {'Created' if skip_ai else 'Stored'} {sc_file.name} in Neo4j")
 
         return ontology
 
+    @staticmethod
+    def _format_tag(tag: Tag) -> str:
+        """Format one tag as a context bullet line."""
+        if tag.description:
+            return f"- {tag.name}: {tag.data_type} // {tag.description}"
+        return f"- {tag.name}: {tag.data_type}"
+
+    @staticmethod
+    def _format_tag_length(tag: Tag) -> int:
+        """len(_format_tag(tag)), without building the line."""
+        length = len(tag.name) + len(tag.data_type) + 4
+        if tag.description:
+            length += len(tag.description) + 4
+        return length
+
+    # (heading, SCFile attribute, max tags listed) for each tag section
+    _TAG_SECTIONS = (
+        ("Input Parameters", "input_tags", None),
+        ("Output Parameters", "output_tags", None),
+        ("InOut Parameters", "inout_tags", None),
+        ("Local Variables", "local_tags", 10),
+    )
+
+    @classmethod
+    def _emit_tag_section(
+        cls,
+        parts: List[str],
+        title: str,
+        tags: List[Tag],
+        limit: Optional[int] = None,
+    ) -> None:
+        """Append a '## title' tag section to parts as one string (none if empty)."""
+        if not tags:
+            return
+        shown = tags if limit is None else tags[:limit]
+        lines = "\n".join(map(cls._format_tag, shown))
+        more = ""
+        if len(shown) < len(tags):
+            more = f"\n... and {len(tags) - len(shown)} more {title.lower()}"
+        parts.append(f"## {title}\n{lines}{more}\n")
+
+    @classmethod
+    def _tags_within(cls, tags: List[Tag], minimum: int, max_chars: int) -> int:
+        """How many leading tags to list: at least minimum, more if they fit."""
+        count = spent = 0
+        for tag in tags:
+            spent += cls._format_tag_length(tag) + 1
+            if count >= minimum and spent > max_chars:
+                break
+            count += 1
+        return count
+
+    @staticmethod
+    def _rungs_within(rungs: List[Any], max_chars: int) -> set:
+        """Indexes of the rungs to show within max_chars of context.
+
+        Commented rungs go first (the comments carry the intent), then the
+        shortest ones, so a budget covers as many rungs as possible. At least
+        one rung is always shown.
+        """
+        ranked = sorted(
+            range(len(rungs)),
+            key=lambda i: (not rungs[i].comment, len(rungs[i].logic)),
+        )
+        chosen: set = set()
+        spent = 0
+        for i in ranked:
+            rung = rungs[i]
+            cost = len(rung.logic) + len(rung.comment or "") + 20  # headers/fences
+            if chosen and spent + cost > max_chars:
+                continue
+            chosen.add(i)
+            spent += cost
+        return chosen
+
     def _build_analysis_context(self, sc_file: SCFile) -> str:
         """Build context string for LLM analysis."""
 
@@ -126,45 +727,26 @@ class OntologyAnalyzer:
             context_parts.append(f"Description: {sc_file.description}")
         context_parts.append("")
 
-        # Input parameters
-        if sc_file.input_tags:
-            context_parts.append("## Input Parameters")
-            for tag in sc_file.input_tags:
-                desc = f" // {tag.description}" if tag.description else ""
-                context_parts.append(f"- {tag.name}: {tag.data_type}{desc}")
-            context_parts.append("")
-
-        # Output parameters
-        if sc_file.output_tags:
-            context_parts.append("## Output Parameters")
-            for tag in sc_file.output_tags:
-                desc = f" // {tag.description}" if tag.description else ""
-                context_parts.append(f"- {tag.name}: {tag.data_type}{desc}")
-            context_parts.append("")
-
-        # InOut parameters
-        if sc_file.inout_tags:
-            context_parts.append("## InOut Parameters")
-            for tag in sc_file.inout_tags:
-                desc = f" // {tag.description}" if tag.description else ""
-                context_parts.append(f"- {tag.name}: {tag.data_type}{desc}")
-            context_parts.append("")
-
-        # Local tags (summarize if many)
-        if sc_file.local_tags:
-            context_parts.append("## Local Variables")
-            for tag in sc_file.local_tags[:10]:  # First 10
-                desc = f" // {tag.description}" if tag.description else ""
-                context_parts.append(f"- {tag.name}: {tag.data_type}{desc}")
-            if len(sc_file.local_tags) > 10:
-                context_parts.append(
-                    f"... and {len(sc_file.local_tags) - 10} more local variables"
+        budget_chars = self.context_budget * CHARS_PER_TOKEN
+
+        # Interface parameters and local tags. Locals list at least `limit`
+        # tags and more while they fit in their share of the budget
+        for title, attr, limit in self._TAG_SECTIONS:
+            tags = getattr(sc_file, attr)
+            if limit is not None:
+                limit = self._tags_within(
+                    tags, limit, int(budget_chars * LOCAL_TAGS_BUDGET_SHARE)
                 )
-            context_parts.append("")
+            self._emit_tag_section(context_parts, title, tags, limit)
 
-        # Logic implementation (rungs for RLL, raw content for ST)
+        # Logic implementation (rungs for RLL, raw content for ST); whatever
+        # budget is left is split evenly between the routines
         if sc_file.routines:
             context_parts.append("## Logic Implementation")
+            used = sum(len(part) + 1 for part in context_parts)
+            routine_chars = max(
+                MIN_ROUTINE_CHARS, (budget_chars - used) // len(sc_file.routines)
+            )
             for routine in sc_file.routines:
                 visibility = routine.get("visibility", "")
                 vis_str = f" [{visibility}]" if visibility else ""
@@ -173,19 +755,25 @@ class OntologyAnalyzer:
                 )
 
                 # Ladder logic rungs
-                if routine.get("rungs"):
-                    for rung in routine["rungs"][:15]:  # First 15 rungs
-                        if rung.comment:
-                            context_parts.append(
-                                f"\nRung {rung.number}: {rung.comment}"
-                            )
-                        else:
-                            context_parts.append(f"\nRung {rung.number}:")
-                        context_parts.append(f"```\n{rung.logic}\n```")
+                rungs = routine.get("rungs")
+                if rungs:
+                    chosen = self._rungs_within(rungs, routine_chars)
+                    for index, rung in enumerate(rungs):
+                        if index not in chosen:
+                            continue
+                        header = (
+                            f"\nRung {rung.number}: {rung.comment}"
+                            if rung.comment
+                            else f"\nRung {rung.number}:"
+                        )
+                        context_parts.append(header + "\n```\n" + rung.logic + "\n```")
 
-                    if len(routine["rungs"]) > 15:
+                    if len(chosen) < len(rungs):
+                        omitted = [r for i, r in enumerate(rungs) if i not in chosen]
+                        lines = sum(r.logic.count("\n") + 1 for r in omitted)
                         context_parts.append(
-                            f"\n... and {len(routine['rungs']) - 15} more rungs"
+                            f"\n... and {len(omitted)} more rungs "
+                            f"totaling {lines} lines"
                         )
 
                 # Structured Text body (Siemens methods / programs)
@@ -194,83 +782,151 @@ class OntologyAnalyzer:
                     local_tags = routine.get("local_tags", [])
                     if local_tags:
                         context_parts.append("Local variables:")
-                        for tag in local_tags[:10]:
-                            desc = f" // {tag.description}" if tag.description else ""
-                            context_parts.append(f"- {tag.name}: {tag.data_type}{desc}")
+                        context_parts.extend(map(self._format_tag, local_tags[:10]))
 
-                    # Truncate very long method bodies
+                    # Truncate method bodies longer than the routine's share
                     raw = routine["raw_content"]
-                    if len(raw) > 2000:
-                        raw = (
-                            raw[:2000]
-                            + f"\n... ({len(routine['raw_content'])} chars total)"
-                        )
-                    context_parts.append(f"```st\n{raw}\n```")
+                    if len(raw) > routine_chars:
+                        raw = raw[:routine_chars] + f"\n... ({len(raw)} chars total)"
+                    context_parts.append("```st\n" + raw + "\n```")
 
                 context_parts.append("")
 
         return "\n".join(context_parts)
 
-    def _query_llm(
-        self, context: str, component_name: str, verbose: bool = False
-    ) -> Dict[str, Any]:
-        """Query Claude API for analysis with tool support."""
-
-        system_prompt = """You are an expert PLC (Programmable Logic Controller) engineer specializing in analyzing industrial control logic from both Rockwell/Allen-Bradley and Siemens platforms. Your task is to analyze PLC code and generate semantic ontologies that explain what tags (variables) mean and how the PLC manipulates them.
-
-You understand both platforms:
-- Rockwell: Add-On Instructions (AOIs), UDTs, ladder logic (RLL), structured text (ST)
-- Siemens: Function Blocks (CLASS), Types (STRUCT/UDT), Programs (PROGRAM), Configurations, Methods, SCL/ST
-
-You have access to tools that let you query the existing ontology database:
-- get_schema: Discover what node types and relationships exist
-- run_query: Execute Cypher queries to explore existing data
-- get_node: Get details of a specific node
-
-USE THESE TOOLS to explore what already exists before analyzing new components. This helps you:
-- Maintain consistent naming and descriptions
-- Identify relationships to existing components
-- Build on existing knowledge rather than starting from scratch
-- Use established terminology and relationship types from the codebase
-
-For each PLC component, provide:
-1. **Functional Purpose**: High-level description of what this component does
-2. **Tag Semantics**: For each important tag, explain its semantic meaning
-3. **Relationships**: How tags influence each other (use consistent relationship types)
-4. **Control Patterns**: Identify patterns (use existing pattern names when applicable)
-5. **Data Flow**: Key paths showing how inputs lead to outputs
-6. **Safety-Critical Elements**: Any tags or logic related to safety"""
+    @property
+    def _analysis_variant(self) -> str:
+        """How analyze_sc_file has Claude produce an analysis."""
+        if self.schema_in_prompt:
+            return ANALYSIS_VARIANT_SCHEMA
+        if self.enable_tools:
+            return ANALYSIS_VARIANT_TOOLS
+        return ANALYSIS_VARIANT_NO_TOOLS
+
+    def _analysis_cache_key(self, context: str, variant: str) -> str:
+        """Hash everything that determines the LLM input for one component."""
+        digest = hashlib.sha256()
+        digest.update(
+            f"{ANALYSIS_CACHE_VERSION}\0{self.model}\0{variant}\0".encode()
+        )
+        digest.update(context.encode("utf-8"))
+        return digest.hexdigest()
 
-        user_prompt = f"""Analyze this PLC component and generate a semantic ontology.
+    def _analysis_cache_keys(self, context: str, variant: str) -> List[str]:
+        """Keys whose analyses a run of this variant may reuse, own key first.
 
-FIRST, use the available tools to explore the existing ontology:
-1. Use get_schema to understand what data exists
-2. Query for similar AOIs or tags that might be related
-3. Check existing control patterns and relationship types for consistency
+        A tool-based analysis is reused by every variant; analyses made
+        without exploring the graph only satisfy their own variant.
+        """
+        keys = [self._analysis_cache_key(context, variant)]
+        if variant != ANALYSIS_VARIANT_TOOLS:
+            keys.append(self._analysis_cache_key(context, ANALYSIS_VARIANT_TOOLS))
+        return keys
+
+    def _load_cached_analysis(
+        self, keys: List[str]
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Return (analysis, key) for the first cached key, or (None, keys[0])."""
+        if self.cache_dir is None or self.force:
+            return None, keys[0]
+        for key in keys:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f), key
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Ignoring unreadable analysis cache {path.name}: {e}")
+        return None, keys[0]
+
+    def _store_cached_analysis(self, key: str, analysis: Dict[str, Any]) -> None:
+        """Persist a successful analysis; failed ones are retried next run."""
+        if self.cache_dir is None or "raw_response" in analysis:
+            return
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(analysis, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Failed to write analysis cache {path.name}: {e}")
+
+    @staticmethod
+    def _analysis_prompts(context: str, explore: bool = True) -> Tuple[str, str]:
+        """Build the (system, user) prompts for analyzing one component.
+
+        explore=False drops the graph-exploration instructions, for requests
+        where Claude cannot call the Neo4j tools (Message Batches).
+        """
+        if explore:
+            return _SYSTEM_PROMPT, _USER_PROMPT_PREFIX + context
+        return _BATCH_SYSTEM_PROMPT, _BATCH_USER_PROMPT_PREFIX + context
 
-THEN, provide your analysis as a structured JSON object with these fields:
-- "purpose": string describing the functional purpose
-- "tags": object mapping tag names to their semantic descriptions
-- "relationships": array of {{from, to, relationship_type, description}} objects
-- "control_patterns": array of {{pattern, description}} objects (use existing pattern names when possible)
-- "data_flows": array of {{path, description}} objects
-- "safety_critical": array of {{element, criticality, reason}} objects
+    def _get_schema_system_prompt(self) -> str:
+        """Tool-free system prompt with the graph schema inlined, built once.
 
-Be concise but informative. Focus on the "why" and "what" rather than just restating the syntax.
+        Every analysis then sends the same bytes, so the prompt cache hits.
+        """
+        with self._schema_lock:
+            if self._schema_system_prompt is None:
+                schema = self.client.get_schema_summary()
+                schema.pop("tips", None)  # Query hints are for tool use
+                self._schema_system_prompt = (
+                    _SYSTEM_PROMPT_INTRO
+                    + _SYSTEM_PROMPT_SCHEMA.format(
+                        schema=json.dumps(schema, indent=2, default=str)
+                    )
+                    + _SYSTEM_PROMPT_OUTPUT
+                )
+            return self._schema_system_prompt
+
+    @staticmethod
+    def _analysis_max_tokens(context: str) -> int:
+        """Output token budget for one analysis, scaled from the input size."""
+        estimated_input_tokens = len(context) // 4
+        return max(
+            ANALYSIS_MIN_TOKENS,
+            min(ANALYSIS_MAX_TOKENS, 4 * estimated_input_tokens + 2000),
+        )
 
-## Component to Analyze:
+    @staticmethod
+    def _failed_analysis(error_msg: str, raw_text: str = "") -> Dict[str, Any]:
+        """Placeholder analysis stored when Claude's answer is unusable."""
+        return {
+            "purpose": f"Analysis failed - {error_msg}",
+            "raw_response": raw_text,
+            "tags": {},
+            "relationships": [],
+            "control_patterns": [],
+            "data_flows": [],
+            "safety_critical": [],
+        }
 
-{context}"""
+    def _query_llm(
+        self, context: str, component_name: str, verbose: bool = False
+    ) -> Dict[str, Any]:
+        """Query Claude API for analysis with tool support."""
+        if self.schema_in_prompt:
+            _, user_prompt = self._analysis_prompts(context, explore=False)
+            system_prompt = self._get_schema_system_prompt()
+        else:
+            system_prompt, user_prompt = self._analysis_prompts(context)
 
         if verbose:
             print("[INFO] Querying Claude API with tool support...")
 
-        result = self._client.query_json(
+        result = self.client.query_json(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            max_tokens=20000,
-            use_tools=True,
+            max_tokens=self._analysis_max_tokens(context),
+            use_tools=not self.schema_in_prompt,
             verbose=verbose,
+            result_tool=ONTOLOGY_RESULT_TOOL,
+            cache_prompt=True,
+            max_tokens_ceiling=ANALYSIS_TOKENS_CEILING,
         )
 
         if verbose and result.get("tool_calls"):
@@ -278,19 +934,10 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
 
         if result.get("data"):
             return result["data"]
-        else:
-            # Handle error
-            error_msg = result.get("error", "Unknown error")
-            print(f"[WARNING] Failed to parse JSON response: {error_msg}")
-            return {
-                "purpose": f"Analysis failed - {error_msg}",
-                "raw_response": result.get("raw_text", ""),
-                "tags": {},
-                "relationships": [],
-                "control_patterns": [],
-                "data_flows": [],
-                "safety_critical": [],
-            }
+        # Handle error
+        error_msg = result.get("error", "Unknown error")
+        print(f"[WARNING] Failed to parse JSON response: {error_msg}")
+        return self._failed_analysis(error_msg, result.get("raw_text", ""))
 
     def analyze_directory(
         self,
@@ -300,6 +947,7 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
         skip_ai: bool = False,
         siemens: bool = False,
         tia_xml: bool = False,
+        output_file: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Analyze all SC, ST, or TIA XML files in a directory and store in Neo4j.
 
@@ -310,116 +958,288 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
             skip_ai: If True, skip AI analysis (for incremental mode)
             siemens: If True, use Siemens .st parser instead of Rockwell .sc parser
             tia_xml: If True, use TIA Portal XML parser
+            output_file: If set, append each ontology to this NDJSON file as
+                soon as it completes instead of collecting them in memory
+                (the returned list is then empty; read back with
+                iter_ontologies)
         """
 
-        dir_path = Path(directory)
-        sc_files = list(dir_path.rglob(pattern))
-
-        if not sc_files:
-            print(f"[WARNING] No files matching '{pattern}' found in {directory}")
+        sc_files = self._iter_matching_paths(directory, pattern)
+        if sc_files is None:
             return []
 
         action = "import" if skip_ai else "analyze"
         if tia_xml:
-            platform = "Siemens TIA XML"
+            platform, kind = "Siemens TIA XML", "tia_xml"
         elif siemens:
-            platform = "Siemens"
+            platform, kind = "Siemens", "siemens"
         else:
-            platform = "Rockwell"
-        print(f"[INFO] Found {len(sc_files)} {platform} files to {action}")
+            platform, kind = "Rockwell", "sc"
+        print(f"[INFO] Scanning {directory} for {platform} files to {action}")
 
-        ontologies = []
         parsed_files: List[SCFile] = []  # Collect for cross-referencing
+        blocks = self._iter_parsed_blocks(sc_files, kind, parsed_files)
 
-        if tia_xml:
-            tia_parser = TiaXmlParser()
-            block_count = 0
-            for i, xml_path in enumerate(sc_files, 1):
-                print(f"\n[{i}/{len(sc_files)}] Processing {xml_path.name}...")
+        # Analyze with LLM and store in Neo4j
+        ontologies = []
+        if output_file:
+            count = 0
+            with open(output_file, "ab") as f:
+                for ontology in self._analyze_parsed_files(blocks, verbose, skip_ai):
+                    f.write(dump_json_bytes(ontology) + b"\n")
+                    f.flush()
+                    count += 1
+            print(f"[OK] Wrote {count} ontologies to {output_file}")
+        else:
+            ontologies.extend(self._analyze_parsed_files(blocks, verbose, skip_ai))
 
-                try:
-                    parsed_blocks = tia_parser.parse_file(str(xml_path))
+        # --- Cross-reference pass ---
+        if parsed_files:
+            xref_count = self.extract_cross_references(parsed_files, verbose=verbose)
+            if xref_count:
+                print(f"\n[INFO] Created {xref_count} cross-reference relationships")
 
-                    if not parsed_blocks:
-                        print(f"[WARNING] No parseable blocks in {xml_path.name}")
-                        continue
+        return ontologies
 
-                    for sc_file in parsed_blocks:
-                        block_count += 1
-                        parsed_files.append(sc_file)
-                        ontology = self.analyze_sc_file(
-                            sc_file, verbose, skip_ai=skip_ai
-                        )
-                        ontologies.append(ontology)
-                        print(f"  [OK] {sc_file.type}: {sc_file.name}")
+    @staticmethod
+    def _iter_matching_paths(directory: str, pattern: str) -> Optional[Iterator[Path]]:
+        """Lazily walk directory for files matching pattern, or None if none do.
 
-                    print(
-                        f"[OK] Completed {xml_path.name} ({len(parsed_blocks)} blocks)"
-                    )
+        Only the first match is looked up front, so parsing can start while
+        the rest of a large tree is still being walked.
+        """
+        paths = Path(directory).rglob(pattern)
+        first = next(paths, None)
+        if first is None:
+            print(f"[WARNING] No files matching '{pattern}' found in {directory}")
+            return None
+        return chain([first], paths)
+
+    @staticmethod
+    def _iter_parsed_blocks(
+        paths: Iterable[Path], kind: str, parsed_files: List[SCFile]
+    ) -> Iterator[SCFile]:
+        """Parse files on a process pool, yielding blocks as each file finishes.
+
+        Parsing is CPU-bound, so files are submitted as the paths iterable
+        produces them (at most a few per worker in flight) and each file's
+        blocks are yielded as soon as it is done - the consumer can start
+        Claude calls on early files while later ones are still being found
+        and parsed, and one slow file does not hold back the ones behind it.
+        Every yielded block is also appended to parsed_files. A single-file
+        scan is parsed in-process, skipping the cost of spawning workers.
+        """
+        paths = iter(paths)
+        head = list(islice(paths, 2))
+        paths = chain(head, paths)
+        if PARSE_WORKERS > 1 and len(head) > 1:
+            # spawn: the parent may already hold Neo4j/HTTP client threads
+            pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            done = OntologyAnalyzer._parse_on_pool(pool, paths, kind)
+        else:
+            pool = None
+            done = ((p, partial(parse_plc_file, kind, str(p))) for p in paths)
 
+        count = 0
+        bar = progress_bar("Parsing")
+        try:
+            for i, (path, parse) in enumerate(done, 1):
+                count = i
+                if bar is not None:
+                    bar.update()
+                try:
+                    parsed_blocks = parse()
                 except Exception as e:
-                    print(f"[ERROR] Failed to process {xml_path.name}: {e}")
+                    progress_write(bar, f"[ERROR] Failed to process {path.name}: {e}")
                     continue
 
-            if block_count > 0:
-                print(
-                    f"\n[INFO] Processed {block_count} blocks from {len(sc_files)} files"
-                )
-
-        elif siemens:
-            siemens_parser = SiemensSTParser()
-            block_count = 0
-            for i, st_path in enumerate(sc_files, 1):
-                print(f"\n[{i}/{len(sc_files)}] Processing {st_path.name}...")
+                if not parsed_blocks:
+                    progress_write(
+                        bar, f"[WARNING] No parseable blocks in {path.name}"
+                    )
+                    continue
 
-                try:
-                    # Siemens .st files can contain multiple blocks
-                    parsed_blocks = siemens_parser.parse_file(str(st_path))
+                if bar is None:
+                    print(f"[{i}] Parsed {path.name} ({len(parsed_blocks)} blocks)")
+                parsed_files.extend(parsed_blocks)
+                yield from parsed_blocks
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if bar is not None:
+                bar.close()
+        print(f"[INFO] Parsed {count} files")
+
+    @staticmethod
+    def _parse_on_pool(
+        pool: ProcessPoolExecutor, paths: Iterable[Path], kind: str
+    ) -> Iterator[Tuple[Path, Any]]:
+        """Yield (path, result getter) for each file as its parse finishes.
+
+        Submission is bounded to a few files per worker so a huge tree is not
+        queued (and held in memory) all at once.
+        """
+        jobs = submit_bounded(
+            paths,
+            lambda path: pool.submit(parse_plc_file, kind, str(path)),
+            4 * PARSE_WORKERS,
+        )
+        for path, future in jobs:
+            yield path, future.result
 
-                    if not parsed_blocks:
-                        print(f"[WARNING] No parseable blocks in {st_path.name}")
-                        continue
+    def _analyze_parsed_files(
+        self,
+        parsed_files: Iterable[SCFile],
+        verbose: bool = False,
+        skip_ai: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Run analyze_sc_file over parsed files, fanning LLM calls out to threads.
+
+        Each analysis is one long, network-bound Claude conversation, so up to
+        self.concurrency of them run at once on the shared client (whose
+        HTTP connection pool is reused across calls). Imports with skip_ai are
+        plain Neo4j writes and stay serial. Files are taken from the input
+        iterable only as analysis slots free up (a couple per worker), and
+        results are yielded as they complete; failed files are reported and
+        skipped.
+
+        Workers only queue their Neo4j writes; this thread flushes them with
+        create_aois_bulk every AOI_WRITE_BATCH components (and at the end), so
+        a scan commits once per batch instead of once per statement.
+        """
+        workers = 1 if skip_ai else self.concurrency
+        pending: List[Dict[str, Any]] = []
+        self.graph  # Connect here, not concurrently in the first workers
+
+        def analyze(
+            sc_file: SCFile,
+        ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
+            writes: List[Dict[str, Any]] = []
+            notes: List[str] = []
+            ontology = self.analyze_sc_file(
+                sc_file, verbose, skip_ai=skip_ai, pending_writes=writes, notes=notes
+            )
+            return ontology, writes, notes
 
-                    for sc_file in parsed_blocks:
-                        block_count += 1
-                        parsed_files.append(sc_file)
-                        ontology = self.analyze_sc_file(
-                            sc_file, verbose, skip_ai=skip_ai
+        bar = None
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                jobs = submit_bounded(
+                    parsed_files, partial(pool.submit, analyze), 2 * workers
+                )
+                bar = progress_bar("Importing" if skip_ai else "Analyzing")
+                for i, (sc_file, future) in enumerate(jobs, 1):
+                    try:
+                        ontology, writes, notes = future.result()
+                    except Exception as e:
+                        progress_write(
+                            bar, f"[ERROR] Failed to analyze {sc_file.name}: {e}"
                         )
-                        ontologies.append(ontology)
-                        print(f"  [OK] {sc_file.type}: {sc_file.name}")
+                        continue
+                    finally:
+                        if bar is not None:
+                            bar.update()
+                    for note in notes:
+                        progress_write(bar, note)
+                    pending.extend(writes)
+                    if len(pending) >= AOI_WRITE_BATCH:
+                        self._flush_pending_writes(pending, verbose, skip_ai)
+                    if bar is None:
+                        print(f"[{i}] [OK] {sc_file.type}: {sc_file.name}")
+                    yield ontology
+        finally:
+            if bar is not None:
+                bar.close()
+            self._flush_pending_writes(pending, verbose, skip_ai)
+
+    def _flush_pending_writes(
+        self,
+        pending: List[Dict[str, Any]],
+        verbose: bool = False,
+        skip_ai: bool = False,
+    ) -> None:
+        """Write queued ontologies in one Neo4j transaction and clear the queue.
 
-                    print(
-                        f"[OK] Completed {st_path.name} ({len(parsed_blocks)} blocks)"
-                    )
+        skip_ai imports are written as pending placeholders (create_aoi_stub).
+        """
+        if not pending:
+            return
+        write = (
+            self.graph.create_aoi_stubs_bulk if skip_ai else self.graph.create_aois_bulk
+        )
+        try:
+            count = write(pending)
+        except Exception as e:
+            names = ", ".join(row["name"] for row in pending[:5])
+            print(
+                f"[ERROR] Failed to store {len(pending)} ontologies "
+                f"({names}...): {e}"
+            )
+        else:
+            if verbose:
+                print(f"[OK] Stored {count} ontologies in Neo4j")
+        pending.clear()
 
-                except Exception as e:
-                    print(f"[ERROR] Failed to process {st_path.name}: {e}")
-                    continue
+    def analyze_directory_batched(
+        self,
+        directory: str,
+        pattern: str = "*.aoi.sc",
+        verbose: bool = False,
+        siemens: bool = False,
+        tia_xml: bool = False,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        output_file: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Analyze a directory through the Message Batches API and store in Neo4j.
 
-            if block_count > 0:
-                print(
-                    f"\n[INFO] Processed {block_count} blocks from {len(sc_files)} files"
-                )
-        else:
-            parser = SCParser()
-            for i, sc_path in enumerate(sc_files, 1):
-                print(f"\n[{i}/{len(sc_files)}] Processing {sc_path.name}...")
+        Components are submitted in batches of at most BATCH_MAX_REQUESTS
+        requests and BATCH_MAX_BYTES of JSON, billed at half the synchronous
+        rate, and results are stored once each batch has ended. Batched
+        requests cannot call the Neo4j exploration tools, so Claude analyzes
+        each component without looking at the existing graph - use
+        analyze_directory when consistency with existing nodes matters more
+        than cost. Cached analyses are reused and never resubmitted.
 
-                try:
-                    # Parse SC file
-                    sc_file = parser.parse_file(str(sc_path))
-                    parsed_files.append(sc_file)
+        Args:
+            directory: Directory path
+            pattern: File pattern to match
+            verbose: Print detailed progress
+            siemens: If True, use Siemens .st parser instead of Rockwell .sc parser
+            tia_xml: If True, use TIA Portal XML parser
+            poll_interval: Seconds between batch status checks
+            output_file: If set, append each ontology to this NDJSON file
+                instead of returning them (see analyze_directory)
+        """
+        sc_files = self._iter_matching_paths(directory, pattern)
+        if sc_files is None:
+            return []
 
-                    # Analyze with LLM and store in Neo4j
-                    ontology = self.analyze_sc_file(sc_file, verbose, skip_ai=skip_ai)
-                    ontologies.append(ontology)
+        if tia_xml:
+            kind = "tia_xml"
+        elif siemens:
+            kind = "siemens"
+        else:
+            kind = "sc"
+        print(f"[INFO] Scanning {directory} for files to analyze in batch mode")
 
-                    print(f"[OK] Completed {sc_path.name}")
+        parsed_files: List[SCFile] = []  # Collect for cross-referencing
+        blocks = self._iter_parsed_blocks(sc_files, kind, parsed_files)
+        results = self._analyze_parsed_files_batched(blocks, verbose, poll_interval)
 
-                except Exception as e:
-                    print(f"[ERROR] Failed to process {sc_path.name}: {e}")
-                    continue
+        ontologies = []
+        if output_file:
+            count = 0
+            with open(output_file, "ab") as f:
+                for ontology in results:
+                    f.write(dump_json_bytes(ontology) + b"\n")
+                    f.flush()
+                    count += 1
+            print(f"[OK] Wrote {count} ontologies to {output_file}")
+        else:
+            ontologies.extend(results)
 
         # --- Cross-reference pass ---
         if parsed_files:
@@ -429,6 +1249,145 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
 
         return ontologies
 
+    def _analyze_parsed_files_batched(
+        self,
+        blocks: Iterable[SCFile],
+        verbose: bool,
+        poll_interval: float,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield stored ontologies for blocks, analyzing uncached ones in batches.
+
+        A batch is submitted as soon as it is full, so only one batch of
+        requests is held at a time; results are collected once every batch
+        has been submitted.
+        """
+        reused = 0
+        submitted = 0
+        batch_ids: List[str] = []
+        requests: List[Dict[str, Any]] = []
+        request_bytes = 0
+        pending: Dict[str, Tuple[SCFile, str]] = {}  # custom_id -> (file, cache key)
+        for sc_file in blocks:
+            context = self._build_analysis_context(sc_file)
+            cache_keys = self._analysis_cache_keys(context, ANALYSIS_VARIANT_BATCH)
+            stored = self._stored_ontology(sc_file, cache_keys)
+            if stored is not None:
+                reused += 1
+                yield stored
+                continue
+            analysis, cache_key = self._load_cached_analysis(cache_keys)
+            if analysis is None:
+                analysis = self._trivial_analysis(sc_file)
+                if analysis is not None:
+                    cache_key = None  # Synthesized, so re-checked on every run
+            if analysis is not None:
+                reused += 1
+                yield self._store_ontology(
+                    sc_file, analysis, verbose=verbose, analysis_hash=cache_key
+                )
+                continue
+
+            # Block names aren't valid/unique custom_ids, so number the requests
+            custom_id = f"component-{submitted}"
+            submitted += 1
+            system_prompt, user_prompt = self._analysis_prompts(context, explore=False)
+            request = {
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.model,
+                    # No retry round in a batch, so allow the full ceiling
+                    "max_tokens": ANALYSIS_TOKENS_CEILING,
+                    "system": system_prompt,
+                    "messages": [{"role": "user", "content": user_prompt}],
+                    "tools": [ONTOLOGY_RESULT_TOOL],
+                    "tool_choice": {
+                        "type": "tool",
+                        "name": ONTOLOGY_RESULT_TOOL["name"],
+                    },
+                },
+            }
+            size = len(dump_json_bytes(request))
+            if requests and (
+                len(requests) >= BATCH_MAX_REQUESTS
+                or request_bytes + size > BATCH_MAX_BYTES
+            ):
+                batch_ids.append(self._submit_batch(requests))
+                requests, request_bytes = [], 0
+            requests.append(request)
+            request_bytes += size
+            pending[custom_id] = (sc_file, cache_key)
+
+        if requests:
+            batch_ids.append(self._submit_batch(requests))
+        if reused:
+            print(f"[INFO] Reused {reused} stored, cached or synthesized analyses")
+
+        for batch_id in batch_ids:
+            yield from self._collect_batch(batch_id, pending, verbose, poll_interval)
+
+        for sc_file, _ in pending.values():
+            print(f"[WARNING] No batch result for {sc_file.name}")
+
+    def _submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Create a Message Batch from requests and return its id."""
+        batch = self.client.client.messages.batches.create(requests=requests)
+        print(f"[INFO] Submitted batch {batch.id} with {len(requests)} components")
+        return batch.id
+
+    def _collect_batch(
+        self,
+        batch_id: str,
+        pending: Dict[str, Tuple[SCFile, str]],
+        verbose: bool,
+        poll_interval: float,
+    ) -> Iterator[Dict[str, Any]]:
+        """Wait for a batch to end, then store and yield its ontologies.
+
+        Each result's entry is popped from pending, so whatever is left
+        afterwards got no result.
+        """
+        batches = self.client.client.messages.batches
+        batch = batches.retrieve(batch_id)
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = batches.retrieve(batch_id)
+            if verbose:
+                counts = batch.request_counts
+                print(
+                    f"[INFO] Batch {batch_id}: {counts.processing} processing, "
+                    f"{counts.succeeded} succeeded, {counts.errored} errored"
+                )
+
+        with self.graph.session() as session:
+            for entry in batches.results(batch_id):
+                sc_file, cache_key = pending.pop(entry.custom_id)
+                analysis = self._batch_result_analysis(entry.result)
+                if "raw_response" in analysis:
+                    print(f"[WARNING] {sc_file.name}: {analysis['purpose']}")
+                self._store_cached_analysis(cache_key, analysis)
+                yield self._store_ontology(
+                    sc_file,
+                    analysis,
+                    verbose=verbose,
+                    session=session,
+                    analysis_hash=cache_key,
+                )
+                print(f"  [OK] {sc_file.type}: {sc_file.name}")
+
+    def _batch_result_analysis(self, result: Any) -> Dict[str, Any]:
+        """Extract the emit_ontology input from one Message Batches result."""
+        if result.type != "succeeded":
+            error = getattr(result, "error", None)
+            return self._failed_analysis(f"Batch request {result.type}: {error}")
+
+        for block in result.message.content:
+            if block.type == "tool_use" and block.name == ONTOLOGY_RESULT_TOOL["name"]:
+                return block.input
+        return self._failed_analysis(
+            f"No {ONTOLOGY_RESULT_TOOL['name']} call "
+            f"(stop_reason: {result.message.stop_reason})"
+        )
+
     # ------------------------------------------------------------------
     # Cross-reference extraction
     # ------------------------------------------------------------------
@@ -657,6 +1616,8 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
         parsed: List[SCFile] = []
 
         if tia_xml:
+            from tia_xml_parser import TiaXmlParser
+
             tia_parser = TiaXmlParser()
             for f in files:
                 try:
@@ -666,6 +1627,8 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
                     if verbose:
                         print(f"[WARNING] Could not parse {f.name}: {e}")
         elif siemens:
+            from siemens_parser import SiemensSTParser
+
             siemens_parser = SiemensSTParser()
             for f in files:
                 try:
@@ -675,6 +1638,8 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
                     if verbose:
                         print(f"[WARNING] Could not parse {f.name}: {e}")
         else:
+            from sc_parser import SCParser
+
             parser = SCParser()
             for f in files:
                 try:
@@ -719,6 +1684,8 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
         Returns:
             Summary dict with counts of ingested items
         """
+        from siemens_project_parser import SiemensProjectParser
+
         print(f"[INFO] Parsing TIA Portal project: {project_dir}")
         parser = SiemensProjectParser()
         project = parser.parse_project(project_dir)
@@ -998,6 +1965,15 @@ Be concise but informative. Focus on the "why" and "what" rather than just resta
         """Retrieve all AOI ontologies from Neo4j."""
         return self.graph.get_all_aois()
 
+    def iter_all_ontologies(
+        self, page_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream all AOI ontologies from Neo4j, one at a time.
+
+        With page_size, AOIs come in name order from short paged reads.
+        """
+        return self.graph.iter_all_aois(page_size=page_size)
+
     def get_ontology(self, name: str) -> Optional[Dict[str, Any]]:
         """Retrieve a specific AOI ontology from Neo4j."""
         return self.graph.get_aoi(name)
@@ -1031,6 +2007,55 @@ def main():
     parser.add_argument(
         "--export", metavar="FILE", help="Export all ontologies to JSON file"
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_ANALYSIS_CACHE_DIR,
+        help=f"Cache Claude analyses by content hash (default: {DEFAULT_ANALYSIS_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-query Claude, ignoring the analysis cache",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ANALYSIS_CONCURRENCY,
+        help=f"Directory mode: max concurrent Claude analyses (default: {ANALYSIS_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--context-budget",
+        type=int,
+        default=DEFAULT_CONTEXT_BUDGET,
+        help=f"Approximate tokens of PLC code context per component (default: {DEFAULT_CONTEXT_BUDGET})",
+    )
+    parser.add_argument(
+        "--trivial-threshold",
+        type=int,
+        default=TRIVIAL_COMPLEXITY_THRESHOLD,
+        help=f"Skip Claude for undescribed components with fewer logic units than this (default: {TRIVIAL_COMPLEXITY_THRESHOLD}, 0 to disable)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Directory mode: analyze via the Message Batches API (half price, slower, no graph tools)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-analyze components even if their stored analysis is up to date",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="Directory mode: append each ontology to an NDJSON file as it completes",
+    )
+    parser.add_argument(
+        "--schema-in-prompt",
+        action="store_true",
+        help="Inline the graph schema into the prompt and analyze without tool calls (fewer, cheaper Claude round trips)",
+    )
     parser.add_argument(
         "--no-tools",
         action="store_true",
@@ -1080,8 +2105,18 @@ def main():
 
     # Initialize analyzer
     try:
-        client = ClaudeClient(model=args.model, enable_tools=not args.no_tools)
-        analyzer = OntologyAnalyzer(client=client)
+        analyzer = OntologyAnalyzer(
+            model=args.model,
+            enable_tools=not args.no_tools,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            concurrency=args.concurrency,
+            context_budget=args.context_budget,
+            force=args.force,
+            trivial_threshold=args.trivial_threshold,
+            schema_in_prompt=args.schema_in_prompt,
+        )
+        if args.input and not args.skip_ai:
+            analyzer.client  # Fail fast on a missing API key
     except ValueError as e:
         print(f"[ERROR] {e}")
         print("[INFO] Please set ANTHROPIC_API_KEY in .env file or environment")
@@ -1121,16 +2156,19 @@ def main():
             # Get specific AOI
             aoi = analyzer.get_ontology(args.get)
             if aoi:
-                print(json.dumps(aoi, indent=2))
+                # Raw UTF-8 bytes: no str round trip, and no console
+                # encoding errors on non-ASCII descriptions
+                sys.stdout.flush()
+                sys.stdout.buffer.write(dump_json_bytes(aoi, indent=True) + b"\n")
             else:
                 print(f"[ERROR] AOI '{args.get}' not found in Neo4j")
 
         elif args.export:
-            # Export to JSON
-            aois = analyzer.get_all_ontologies()
-            with open(args.export, "w", encoding="utf-8") as f:
-                json.dump(aois, f, indent=2)
-            print(f"[OK] Exported {len(aois)} AOIs to {args.export}")
+            # Export to JSON, streaming AOI pages from Neo4j straight to the file
+            with open(args.export, "wb") as f:
+                aois = analyzer.iter_all_ontologies(page_size=EXPORT_PAGE_SIZE)
+                count = write_json_array(f, aois)
+            print(f"[OK] Exported {count} AOIs to {args.export}")
 
         elif args.tia_project and args.input:
             # Full TIA Portal project ingestion
@@ -1169,7 +2207,21 @@ def main():
             is_siemens = args.siemens or input_path.suffix.lower() == ".st"
 
             # Process directory or single file
-            if input_path.is_dir():
+            if input_path.is_dir() and args.batch and not args.skip_ai:
+                ontologies = analyzer.analyze_directory_batched(
+                    str(input_path),
+                    pattern=args.pattern,
+                    verbose=args.verbose,
+                    siemens=is_siemens,
+                    tia_xml=is_tia_xml,
+                    output_file=args.output,
+                )
+                if not args.output:
+                    print(
+                        f"\n[OK] Analyzed {len(ontologies)} blocks and stored in Neo4j"
+                    )
+
+            elif input_path.is_dir():
                 ontologies = analyzer.analyze_directory(
                     str(input_path),
                     pattern=args.pattern,
@@ -1177,6 +2229,7 @@ def main():
                     skip_ai=args.skip_ai,
                     siemens=is_siemens,
                     tia_xml=is_tia_xml,
+                    output_file=args.output,
                 )
                 action = "Imported" if args.skip_ai else "Analyzed"
                 if is_tia_xml:
@@ -1185,9 +2238,10 @@ def main():
                     platform = "Siemens"
                 else:
                     platform = "Rockwell"
-                print(
-                    f"\n[OK] {action} {len(ontologies)} {platform} blocks and stored in Neo4j"
-                )
+                if not args.output:
+                    print(
+                        f"\n[OK] {action} {len(ontologies)} {platform} blocks and stored in Neo4j"
+                    )
                 if args.skip_ai:
                     print(
                         "[INFO] Use incremental analyzer to add semantic descriptions"
@@ -1196,8 +2250,7 @@ def main():
             elif input_path.is_file():
                 if is_tia_xml:
                     # TIA Portal XML file
-                    tia_parser = TiaXmlParser()
-                    parsed_blocks = tia_parser.parse_file(str(input_path))
+                    parsed_blocks = parse_plc_file("tia_xml", str(input_path))
                     if not parsed_blocks:
                         print(f"[WARNING] No parseable blocks in {input_path.name}")
                     else:
@@ -1217,8 +2270,7 @@ def main():
 
                 elif is_siemens:
                     # Siemens .st file — may contain multiple blocks
-                    siemens_parser = SiemensSTParser()
-                    parsed_blocks = siemens_parser.parse_file(str(input_path))
+                    parsed_blocks = parse_plc_file("siemens", str(input_path))
                     if not parsed_blocks:
                         print(f"[WARNING] No parseable blocks in {input_path.name}")
                     else:
@@ -1237,8 +2289,7 @@ def main():
                             print(f"[OK] {action} in Neo4j")
                 else:
                     # Rockwell .sc file
-                    sc_parser_inst = SCParser()
-                    sc_file = sc_parser_inst.parse_file(str(input_path))
+                    [sc_file] = parse_plc_file("sc", str(input_path))
                     ontology = analyzer.analyze_sc_file(
                         sc_file, verbose=args.verbose, skip_ai=args.skip_ai
                     )
@@ -14,7 +14,12 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 from dotenv import load_dotenv
 
-from neo4j_ontology import OntologyGraph, get_ontology_graph, import_json_ontology
+from neo4j_ontology import (
+    OntologyGraph,
+    _load_json_property,
+    get_ontology_graph,
+    import_json_ontology,
+)
 from claude_client import ClaudeClient, get_claude_client
 
 
@@ -81,13 +86,9 @@ class UnifiedOntologyMerger:
         )
 
         # Store PLC-to-SCADA mappings
-        for mapping in unified_analysis.get("plc_to_scada_mappings", []):
-            self.graph.create_plc_scada_mapping(
-                mapping.get("plc_component", ""),
-                mapping.get("scada_component", ""),
-                mapping.get("mapping_type", ""),
-                mapping.get("description", ""),
-            )
+        self.graph.create_plc_scada_mappings(
+            unified_analysis.get("plc_to_scada_mappings", [])
+        )
 
         # Store end-to-end flows
         for flow in unified_analysis.get("end_to_end_flows", []):
@@ -264,8 +265,10 @@ Output ONLY valid JSON, no markdown formatting. Be comprehensive but concise.
             if record:
                 return {
                     "overview": record["overview"],
-                    "safety_architecture": record["safety"],
-                    "control_responsibilities": record["control"],
+                    "safety_architecture": _load_json_property(record["safety"]),
+                    "control_responsibilities": _load_json_property(
+                        record["control"]
+                    ),
                 }
         return None
 
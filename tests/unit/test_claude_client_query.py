@@ -0,0 +1,169 @@
+from types import SimpleNamespace
+
+from claude_client import ClaudeClient
+
+
+RESULT_TOOL = {
+    "name": "emit_ontology",
+    "description": "Submit the final ontology.",
+    "input_schema": {"type": "object"},
+}
+
+
+def _text(text):
+    return SimpleNamespace(type="text", text=text)
+
+
+def _tool_use(name, input, id="toolu_1"):
+    return SimpleNamespace(type="tool_use", name=name, input=input, id=id)
+
+
+def _response(stop_reason, *content):
+    usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+    return SimpleNamespace(stop_reason=stop_reason, content=list(content), usage=usage)
+
+
+class _FakeMessages:
+    """Hands out canned responses and records each messages.create() call."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0)
+
+
+class _FakeTools:
+    def __init__(self):
+        self.executed = []
+
+    def get_all_tool_definitions(self):
+        return [{"name": "run_query", "input_schema": {"type": "object"}}]
+
+    def execute(self, name, input):
+        self.executed.append((name, input))
+        return '[{"name": "Motor"}]'
+
+
+def _client(*responses, tools=None):
+    # enable_tools=False keeps the constructor away from Neo4j
+    client = ClaudeClient(api_key="test", graph=object(), enable_tools=False)
+    if tools is not None:
+        client._enable_tools = True
+        client._tools = tools
+    messages = _FakeMessages(responses)
+    client.client = SimpleNamespace(messages=messages)
+    return client, messages
+
+
+def test_result_tool_alone_is_forced_by_name():
+    client, messages = _client(
+        _response("tool_use", _tool_use("emit_ontology", {"purpose": "x"}))
+    )
+
+    result = client.query_json("sys", "user", max_tokens=100, result_tool=RESULT_TOOL)
+
+    assert result["data"] == {"purpose": "x"}
+    assert messages.calls[0]["tool_choice"] == {
+        "type": "tool",
+        "name": "emit_ontology",
+    }
+
+
+def test_exploration_then_result_tool_requires_tool_use_every_round():
+    tools = _FakeTools()
+    client, messages = _client(
+        _response("tool_use", _tool_use("run_query", {"query": "MATCH (n) RETURN n"})),
+        _response("tool_use", _tool_use("emit_ontology", {"purpose": "y"}, "toolu_2")),
+        tools=tools,
+    )
+
+    result = client.query_json("sys", "user", max_tokens=100, result_tool=RESULT_TOOL)
+
+    assert result["data"] == {"purpose": "y"}
+    assert tools.executed == [("run_query", {"query": "MATCH (n) RETURN n"})]
+    assert [c["tool_choice"] for c in messages.calls] == [{"type": "any"}] * 2
+    assert [t["name"] for t in messages.calls[0]["tools"]] == [
+        "run_query",
+        "emit_ontology",
+    ]
+    # The second round carries the tool result back
+    assert messages.calls[1]["messages"][-1]["content"][0]["type"] == "tool_result"
+
+
+def test_truncated_result_call_is_retried_with_double_the_budget():
+    client, messages = _client(
+        _response("max_tokens", _tool_use("emit_ontology", {"purpose": "cut"})),
+        _response("max_tokens", _tool_use("emit_ontology", {"purpose": "cut"})),
+        _response("tool_use", _tool_use("emit_ontology", {"purpose": "whole"})),
+    )
+
+    result = client.query_json(
+        "sys",
+        "user",
+        max_tokens=4096,
+        result_tool=RESULT_TOOL,
+        max_tokens_ceiling=10000,
+    )
+
+    assert result["data"] == {"purpose": "whole"}
+    assert [c["max_tokens"] for c in messages.calls] == [4096, 8192, 10000]
+    assert result["usage"]["output_tokens"] == 15
+
+
+def test_truncated_result_call_without_a_ceiling_returns_an_error():
+    client, messages = _client(
+        _response("max_tokens", _tool_use("emit_ontology", {"purpose": "cut"})),
+    )
+
+    result = client.query_json("sys", "user", max_tokens=100, result_tool=RESULT_TOOL)
+
+    assert result["data"] is None
+    assert result["error"] == "Result cut off at max_tokens"
+    assert len(messages.calls) == 1  # no text continuation of a tool call
+
+
+def test_truncated_result_call_at_the_ceiling_returns_an_error():
+    client, messages = _client(
+        _response("max_tokens", _tool_use("emit_ontology", {"purpose": "cut"})),
+        _response("max_tokens", _tool_use("emit_ontology", {"purpose": "cut"})),
+    )
+
+    result = client.query_json(
+        "sys", "user", max_tokens=4096, result_tool=RESULT_TOOL, max_tokens_ceiling=8192
+    )
+
+    assert result["error"] == "Result cut off at max_tokens"
+    assert [c["max_tokens"] for c in messages.calls] == [4096, 8192]
+
+
+def test_json_wrapped_in_prose_is_salvaged():
+    client, _ = _client(
+        _response(
+            "end_turn",
+            _text('Here is the ontology: {"purpose": "z", "tags": {}} Hope it helps!'),
+        )
+    )
+
+    result = client.query_json("sys", "user", use_tools=False)
+
+    assert result["data"] == {"purpose": "z", "tags": {}}
+
+
+def test_truncated_json_is_closed_and_parsed():
+    client, _ = _client(
+        _response("end_turn", _text('{"purpose": "z", "tags": {"Start": "BOOL",')),
+    )
+
+    result = client.query_json("sys", "user", use_tools=False)
+
+    assert result["data"] == {"purpose": "z", "tags": {"Start": "BOOL"}}
+
+
+def test_salvage_takes_the_first_object_and_gives_up_without_one():
+    client, _ = _client()
+    text = 'First {"a": 1} then {"b": 2}'
+    assert client._salvage_json_object(text) == {"a": 1}
+    assert client._salvage_json_object("no json here") is None
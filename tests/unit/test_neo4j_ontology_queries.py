@@ -0,0 +1,981 @@
+import json
+
+import pytest
+
+from neo4j_ontology import OntologyGraph, _fuzzy_words, _sanitize_rel_type
+
+
+class _FakeResult:
+    def __init__(self, rows=None):
+        self._rows = rows or []
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def single(self):
+        return self._rows[0] if self._rows else None
+
+    def data(self):
+        return [dict(r) for r in self._rows]
+
+    def consume(self):
+        return None
+
+
+class _FakeSession:
+    """Records every Cypher statement instead of talking to Neo4j."""
+
+    def __init__(self, calls, responses):
+        self.calls = calls
+        self.responses = responses
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {})
+        params.update(kwargs)
+        self.calls.append((query, params))
+        for marker, rows in self.responses:
+            if marker in query:
+                return _FakeResult(rows)
+        return _FakeResult()
+
+    def execute_read(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+    def execute_write(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+    def close(self):
+        pass
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.calls = []
+        self.sessions = []
+        # (query substring, rows) pairs returned by matching statements
+        self.responses = []
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return _FakeSession(self.calls, self.responses)
+
+    def close(self):
+        pass
+
+
+def _graph():
+    graph = OntologyGraph()
+    graph._driver = _FakeDriver()
+    graph._schema_ready = True  # schema statements are covered on their own
+    return graph
+
+
+def test_create_aoi_with_purpose_marks_complete_without_case_branch():
+    graph = _graph()
+    graph.create_aoi("Motor", "AOI", "motor.sc", analysis={"purpose": "Runs a motor"})
+
+    query, params = graph._driver.calls[0]
+    assert "FOREACH" not in query
+    assert "a.semantic_status = 'complete'" in query
+    assert params["purpose"] == "Runs a motor"
+    assert "semantic_status" not in params
+
+
+def test_create_aoi_without_purpose_keeps_existing_status():
+    graph = _graph()
+    graph.create_aoi("Motor", "AOI", "motor.sc")
+
+    query, params = graph._driver.calls[0]
+    assert "FOREACH" not in query
+    assert "COALESCE(a.semantic_status, $semantic_status)" in query
+    assert "a.purpose" not in query
+    assert params["semantic_status"] == "pending"
+
+
+def test_get_aoi_uses_read_session_and_returns_none_when_missing():
+    graph = _graph()
+
+    assert graph.get_aoi("Missing") is None
+    assert graph._driver.sessions[0].get("default_access_mode") == "READ"
+
+
+def test_add_troubleshooting_stores_expected_states_as_json():
+    graph = _graph()
+    states = {"running": "Motor on", "faulted": None, "interlocked": True}
+    graph.add_troubleshooting("Motor", {"expected_states": states})
+
+    stored = [
+        params["states"]
+        for query, params in graph._driver.calls
+        if "expected_states" in query
+    ]
+    assert stored and json.loads(stored[0]) == states
+
+
+def test_clear_plc_falls_back_to_single_transaction_without_apoc():
+    graph = _graph()
+    graph._has_apoc = False
+    counts = graph.clear_plc()
+
+    assert counts["AOI"] == 0
+    queries = [query for query, _ in graph._driver.calls]
+    assert all("apoc" not in q for q in queries)
+    assert any(q.startswith("MATCH (n:AOI) WITH DISTINCT n DETACH DELETE n") for q in queries)
+
+
+def test_clear_ignition_uses_periodic_iterate_when_apoc_available():
+    graph = _graph()
+    graph._has_apoc = True
+    graph.clear_ignition()
+
+    batched = [
+        params
+        for query, params in graph._driver.calls
+        if "apoc.periodic.iterate" in query
+    ]
+    assert batched
+    assert batched[0]["inner"] == "DELETE n"
+    assert batched[2]["outer"] == "MATCH (n:View) RETURN DISTINCT n"
+    assert batched[2]["inner"] == "DETACH DELETE n"
+    assert all(p["batch_size"] == 10000 for p in batched)
+
+
+def test_batched_delete_raises_when_apoc_batches_fail():
+    graph = _graph()
+    graph._has_apoc = True
+    graph._driver.responses.append(
+        (
+            "apoc.periodic.iterate",
+            [{"count": 10000, "failed": 500, "errors": {"LockTimeout": 1}}],
+        )
+    )
+
+    with pytest.raises(RuntimeError, match="LockTimeout"):
+        graph.clear_plc()
+
+
+def test_sanitize_rel_type_normalizes_llm_relationship_names():
+    assert _sanitize_rel_type("mode control") == "MODE_CONTROL"
+    assert _sanitize_rel_type("inhibits/blocks") == "INHIBITS_BLOCKS"
+    assert _sanitize_rel_type("RELATES_TO") == "RELATES_TO"
+
+
+def test_add_troubleshooting_marks_enriched_in_first_statement_without_states():
+    graph = _graph()
+    graph.add_troubleshooting("Motor", {"intents": {"run": {"what": "Run"}}})
+
+    first_query, first_params = graph._driver.calls[0]
+    assert "a.troubleshooting_enriched = true" in first_query
+    assert first_params["states"] is None
+    assert len(graph._driver.sessions) == 1
+
+
+def test_create_aoi_passes_analyzed_at_as_parameter():
+    graph = _graph()
+    graph.create_aoi("Motor", "AOI", "motor.sc", analysis={"purpose": "Runs a motor"})
+
+    query, params = graph._driver.calls[0]
+    assert "datetime()" not in query
+    assert params["analyzed_at"].tzinfo is not None
+
+
+def test_get_all_aois_streams_one_aggregated_query():
+    graph = _graph()
+    graph._driver.responses.append(
+        (
+            "MATCH (a:AOI)\nRETURN a,",
+            [
+                {
+                    "a": {"name": "Motor", "type": "AOI", "purpose": "Runs"},
+                    "tags": [{"name": "Run", "description": None}],
+                    "relationships": [],
+                    "patterns": [{"pattern": "Latch", "description": ""}],
+                    "flows": [],
+                    "safety": [],
+                }
+            ],
+        )
+    )
+
+    aois = graph.get_all_aois()
+
+    assert len(graph._driver.calls) == 1
+    assert aois[0]["name"] == "Motor"
+    assert aois[0]["analysis"]["tags"] == {"Run": ""}
+    assert aois[0]["analysis"]["control_patterns"][0]["pattern"] == "Latch"
+
+
+def test_create_aoi_links_relationship_only_tags_once_up_front():
+    graph = _graph()
+    graph.create_aoi(
+        "Motor",
+        "AOI",
+        "motor.sc",
+        analysis={
+            "purpose": "Runs a motor",
+            "tags": {"Run": "Run command"},
+            "relationships": [
+                {"from": "Run", "to": "Fault", "relationship_type": "inhibits"}
+            ],
+        },
+    )
+
+    preamble = [p for q, p in graph._driver.calls if "$tag_names" in q]
+    assert preamble == [{"aoi_name": "Motor", "tag_names": ["Fault"]}]
+    rel_query = next(q for q, _ in graph._driver.calls if "INHIBITS" in q)
+    assert "HAS_TAG" not in rel_query
+
+
+def test_add_troubleshooting_writes_fault_tree_in_one_unwind():
+    graph = _graph()
+    graph.add_troubleshooting(
+        "Motor",
+        {
+            "fault_tree": [
+                {"symptom": "Won't start", "possible_causes": [{"cause": "No permissive"}]},
+                {"symptom": "Trips", "possible_causes": []},
+            ]
+        },
+    )
+
+    fault_calls = [p for q, p in graph._driver.calls if "UNWIND $faults" in q]
+    assert len(fault_calls) == 1
+    faults = fault_calls[0]["faults"]
+    assert [f["symptom"] for f in faults] == ["Won't start", "Trips"]
+    assert faults[0]["possible_causes"][0]["likelihood"] == "unknown"
+
+
+def test_add_troubleshooting_issues_one_statement_per_section():
+    graph = _graph()
+    graph.add_troubleshooting(
+        "Motor",
+        {
+            "intents": {"run": {"what": "Run"}, "stop": {"what": "Stop"}},
+            "operator_phrases": [{"phrase": "won't go"}, {"phrase": "stuck"}],
+            "diagnostic_tags": [{"tag": "Fault", "normal_value": "0"}],
+        },
+    )
+
+    # enriched flag + intents + phrases + diagnostic tags
+    assert len(graph._driver.calls) == 4
+    intent_rows = next(p["rows"] for q, p in graph._driver.calls if ":Intent" in q)
+    assert [r["name"] for r in intent_rows] == ["run", "stop"]
+
+
+def test_create_udt_writes_members_with_one_unwind():
+    graph = _graph()
+    graph.create_udt(
+        "Motor_UDT",
+        "",
+        members=[{"name": "Run", "data_type": "Boolean"}, {"name": "Speed"}],
+    )
+
+    assert len(graph._driver.calls) == 2
+    members = graph._driver.calls[1][1]["members"]
+    assert members[1] == {"name": "Speed", "data_type": "", "tag_type": ""}
+
+
+def test_create_helpers_reuse_a_caller_supplied_transaction():
+    graph = _graph()
+    tx = _FakeSession(graph._driver.calls, graph._driver.responses)
+
+    graph.create_udt("Motor_UDT", "", members=[{"name": "Run"}], session=tx)
+    graph.create_equipment("M1", "motor", "", udt_name="Motor_UDT", session=tx)
+    graph.add_troubleshooting("Motor", {}, session=tx)
+
+    assert graph._driver.sessions == []
+    assert len(graph._driver.calls) >= 4
+
+
+def test_ensure_schema_creates_merge_key_constraints_once():
+    graph = _graph()
+    graph._schema_ready = False
+    graph.ensure_schema()
+    graph.ensure_schema()
+
+    queries = [q for q, _ in graph._driver.calls]
+    assert len(queries) == len(set(queries))
+    assert any("REQUIRE s.id IS UNIQUE" in q for q in queries)
+    assert any("ON (c.view, c.path)" in q for q in queries)
+
+
+def test_reads_skip_schema_ddl_and_index_hints_until_schema_is_ready():
+    graph = _graph()
+    graph._schema_ready = False
+    graph.get_item_with_context("AOI", "Motor")
+    graph.get_pending_items("AOI")
+
+    queries = [q for q, _ in graph._driver.calls]
+    assert len(queries) == 2
+    assert not any("CREATE" in q or "USING INDEX" in q for q in queries)
+
+
+def test_failed_schema_statement_leaves_schema_unready_for_a_retry():
+    class _FailingSession(_FakeSession):
+        def run(self, query, parameters=None, **kwargs):
+            if "CREATE TEXT INDEX" in query:
+                raise RuntimeError("text indexes not supported")
+            return super().run(query, parameters, **kwargs)
+
+    graph = _graph()
+    graph._schema_ready = False
+    driver = graph._driver
+    driver.session = lambda **kw: _FailingSession(driver.calls, driver.responses)
+
+    assert graph.create_indexes() is False
+    assert graph._schema_ready is False
+
+
+def test_system_overview_and_flows_are_stored_as_json():
+    graph = _graph()
+    graph.create_system_overview("Plant", safety_architecture={"estop": "PLC"})
+    graph.create_end_to_end_flow("Fill", {"description": "Tank fill", "path": ["A", "B"]})
+
+    overview_params = graph._driver.calls[0][1]
+    flow_params = graph._driver.calls[1][1]
+    assert json.loads(overview_params["safety"]) == {"estop": "PLC"}
+    assert overview_params["control"] == ""
+    assert json.loads(flow_params["path"]) == ["A", "B"]
+    assert json.loads(flow_params["data"])["description"] == "Tank fill"
+
+
+def test_plc_scada_mappings_fuzzy_match_only_unmatched_pairs():
+    graph = _graph()
+    graph._driver.responses.append(("RETURN DISTINCT p.idx", [{"idx": 0}]))
+    graph.create_plc_scada_mappings(
+        [
+            {"plc_component": "Motor", "scada_component": "Motor"},
+            {"plc_component": "Valve_Solenoid", "scada_component": "ValveSolenoidControl"},
+        ]
+    )
+
+    assert len(graph._driver.calls) == 2
+    fuzzy = graph._driver.calls[1][1]["pairs"]
+    assert [p["plc_words"] for p in fuzzy] == [["valve", "solenoid"]]
+
+
+def test_get_troubleshooting_reads_all_sections_in_one_query():
+    graph = _graph()
+    graph._driver.responses.append(
+        (
+            "as diagnostic_tags",
+            [
+                {
+                    "expected_states": '{"running": "on"}',
+                    "faults": [
+                        {"symptom": "Trips", "possible_causes": [{"cause": "Overload"}]}
+                    ],
+                    "intents": [{"name": "run", "intent": {"what": "Run"}}],
+                    "phrases": [{"phrase": "stuck"}],
+                    "diagnostic_tags": [{"tag": "Fault", "normal_value": "0"}],
+                }
+            ],
+        )
+    )
+
+    data = graph.get_troubleshooting("Motor")
+
+    assert len(graph._driver.calls) == 1
+    assert data["fault_tree"][0]["possible_causes"][0]["cause"] == "Overload"
+    assert data["intents"]["run"]["what"] == "Run"
+    assert data["operator_phrases"][0]["phrase"] == "stuck"
+    assert data["expected_states"] == {"running": "on"}
+    assert _graph().get_troubleshooting("Missing")["fault_tree"] == []
+
+
+def test_get_troubleshooting_is_cached_until_aoi_is_rewritten():
+    graph = _graph()
+    graph.get_troubleshooting("Motor")
+    graph.get_troubleshooting("Motor")
+    assert len(graph._driver.calls) == 1
+
+    graph.add_troubleshooting("Motor", {})
+    graph.get_troubleshooting("Motor")
+    reads = [q for q, _ in graph._driver.calls if "as diagnostic_tags" in q]
+    assert len(reads) == 2
+
+
+def test_get_troubleshooting_returns_copies_of_the_cached_entry():
+    graph = _graph()
+    first = graph.get_troubleshooting("Motor")
+    first["fault_tree"].append({"symptom": "changed"})
+    first["intents"]["changed"] = True
+    again = graph.get_troubleshooting("Motor")
+    assert again["fault_tree"] == []
+    assert again["intents"] == {}
+
+
+def test_delete_aoi_drops_its_cached_troubleshooting():
+    graph = _graph()
+    graph.get_troubleshooting("Motor")
+    graph.delete_aoi("Motor")
+    graph.get_troubleshooting("Motor")
+    reads = [q for q, _ in graph._driver.calls if "as diagnostic_tags" in q]
+    assert len(reads) == 2
+
+
+def test_create_view_component_matches_view_once():
+    graph = _graph()
+    graph.create_view_component("Main", "Start", "Button", "Root/Start")
+
+    query = graph._driver.calls[0][0]
+    assert query.count("MATCH (v:View") == 1
+    assert "MERGE (v)-[:HAS_COMPONENT]->(c)" in query
+
+
+def test_create_view_components_bulk_unwinds_rows():
+    graph = _graph()
+    graph._driver.responses.append(("count(c) as created", [{"created": 2}]))
+
+    created = graph.create_view_components_bulk(
+        "Main",
+        [
+            {"component_name": "Start", "component_path": "Root/Start"},
+            {"component_name": "Stop", "component_path": "Root/Stop", "event_scripts": []},
+        ],
+    )
+
+    assert created == 2
+    rows = graph._driver.calls[0][1]["rows"]
+    assert rows[1]["event_scripts"] is None
+    assert rows[0]["props"] == "{}"
+
+
+def test_fuzzy_words_drop_short_tokens():
+    assert _fuzzy_words("Valve_Solenoid") == ["valve", "solenoid"]
+    assert _fuzzy_words("FT_101 Flow") == ["101", "flow"]
+
+
+class _FakeAsyncTx:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def run(self, query, parameters=None):
+        self.calls.append((query, parameters))
+
+
+class _FakeAsyncSession:
+    """Write-only async session: every write must go through execute_write."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, fn):
+        calls = []
+        self.driver.transactions.append(calls)
+        return await fn(_FakeAsyncTx(calls))
+
+
+class _FakeAsyncDriver:
+    def __init__(self):
+        self.transactions = []
+
+    def session(self, **kwargs):
+        return _FakeAsyncSession(self)
+
+
+def _async_graph():
+    from neo4j_ontology import AsyncOntologyGraph
+
+    agraph = AsyncOntologyGraph()
+    agraph._driver = _FakeAsyncDriver()
+    return agraph
+
+
+def test_async_graph_shares_cypher_with_sync_graph():
+    import asyncio
+
+    graph = _graph()
+    graph.create_udt("Motor_UDT", "", members=[{"name": "Run"}])
+    agraph = _async_graph()
+    asyncio.run(agraph.create_udt("Motor_UDT", "", members=[{"name": "Run"}]))
+
+    assert agraph._driver.transactions == [graph._driver.calls]
+
+
+def test_async_graph_writes_each_entity_in_one_transaction():
+    import asyncio
+
+    graph = _graph()
+    graph.create_equipment("Pump1", "Pump", "", udt_name="Pump_UDT")
+    graph.create_view("Main", "Main", "", project="Plant")
+    agraph = _async_graph()
+
+    async def write():
+        await agraph.create_equipment("Pump1", "Pump", "", udt_name="Pump_UDT")
+        await agraph.create_view("Main", "Main", "", project="Plant")
+
+    asyncio.run(write())
+
+    equipment, view = agraph._driver.transactions
+    assert equipment + view == graph._driver.calls
+    # The view and its project link commit together
+    assert len(view) == 2
+
+
+def test_sessions_target_the_configured_database():
+    from neo4j_ontology import Neo4jConfig
+
+    graph = OntologyGraph(Neo4jConfig(database="plant"))
+    graph._driver = _FakeDriver()
+    graph.create_view("Main", "Main", "")
+    graph.get_aoi("Motor")
+
+    assert [s["database"] for s in graph._driver.sessions] == ["plant", "plant"]
+
+
+def test_binding_helpers_set_relationship_properties_from_one_map():
+    graph = _graph()
+    graph.create_component_tag_binding(
+        "Main", "Root/Start", "Run", "value", tag_path="[default]Run", bidirectional=True
+    )
+
+    query, params = graph._driver.calls[0]
+    assert "SET r += $props" in query
+    assert params["props"]["property"] == "value"
+    assert params["props"]["bidirectional"] is True
+
+
+def test_create_view_runs_node_and_project_link_in_one_transaction():
+    graph = _graph()
+    writes = []
+    session = _FakeSession(graph._driver.calls, graph._driver.responses)
+    session.execute_write = lambda fn, *args: writes.append(fn) or fn(session, *args)
+    graph._driver.session = lambda **kwargs: session
+
+    graph.create_view("Main", "Main", "", project="Plant")
+
+    assert len(writes) == 1
+    assert len(graph._driver.calls) == 2
+
+
+def test_create_scada_tags_bulk_batches_without_apoc_and_iterates_with_it():
+    rows = [{"name": f"Tag{i}", "tag_type": "memory"} for i in range(1500)]
+
+    graph = _graph()
+    graph._has_apoc = False
+    assert graph.create_scada_tags_bulk(rows + [{"name": ""}]) == 1500
+    batches = [p["rows"] for q, p in graph._driver.calls if q.startswith("UNWIND $rows")]
+    assert [len(b) for b in batches] == [1000, 500]
+
+    graph = _graph()
+    graph._has_apoc = True
+    graph.create_scada_tags_bulk(rows)
+    query, params = graph._driver.calls[0]
+    assert "apoc.periodic.iterate" in query
+    assert "MERGE (t:ScadaTag {name: r.name})" in params["inner"]
+
+
+def test_create_scada_tag_clears_empty_optional_properties():
+    graph = _graph()
+    graph.create_scada_tag("Speed", "opc", opc_item_path="ns=1;s=Speed", initial_value=0)
+
+    query, params = graph._driver.calls[0]
+    assert "SET t += r.props" in query
+    props = params["row"]["props"]
+    assert props["tag_type"] == "opc"
+    assert props["opc_item_path"] == "ns=1;s=Speed"
+    # None removes whatever a previous import of the tag stored
+    assert props["query"] is None
+    assert props["expression"] is None
+    assert props["initial_value"] is None
+
+
+def test_iter_all_aois_streams_with_a_smaller_fetch_size():
+    graph = _graph()
+    list(graph.iter_all_aois())
+
+    assert graph._driver.sessions[0]["fetch_size"] == 1000
+
+
+def test_iter_all_aois_pages_by_name_and_stops_on_a_short_page():
+    graph = _graph()
+    row = {"tags": [], "relationships": [], "patterns": [], "flows": [], "safety": []}
+    graph._driver.responses.append(
+        ("WHERE a.name > $after", [dict(row, a={"name": n}) for n in ("A", "B")])
+    )
+
+    aois = list(graph.iter_all_aois(page_size=3))
+
+    assert [aoi["name"] for aoi in aois] == ["A", "B"]
+    assert len(graph._driver.calls) == 1
+    assert graph._driver.calls[0][1] == {"after": "", "limit": 3}
+
+
+def test_create_aois_bulk_writes_each_node_kind_with_one_unwind():
+    graph = _graph()
+    count = graph.create_aois_bulk(
+        [
+            {
+                "name": "Motor",
+                "type": "AOI",
+                "source_file": "motor.sc",
+                "analysis": {
+                    "purpose": "Runs a motor",
+                    "tags": {"Run": "Run command"},
+                    "relationships": [
+                        {"from": "Run", "to": "Fault", "relationship_type": "inhibits"}
+                    ],
+                    "control_patterns": ["Latch"],
+                },
+                "analysis_hash": "abc",
+            },
+            {"name": "Valve", "type": "AOI", "source_file": "valve.sc"},
+        ]
+    )
+
+    queries = [query for query, _ in graph._driver.calls]
+    assert count == 2
+    assert len(queries) == 6
+    assert graph._driver.calls[0][1]["aois"][0]["analysis_hash"] == "abc"
+    assert graph._driver.calls[1][1]["aois"][0]["semantic_status"] == "pending"
+    assert graph._driver.calls[3][1]["tags"] == [{"aoi": "Motor", "name": "Fault"}]
+    assert "[r:INHIBITS]" in queries[4]
+    assert graph._driver.calls[5][1]["patterns"][0]["name"] == "Latch"
+
+
+def test_create_aoi_stub_only_sets_properties_on_create():
+    graph = _graph()
+    graph.create_aoi_stub("Motor", "AOI", "motor.sc", {"revision": "1.2"})
+
+    query, params = graph._driver.calls[0]
+    assert len(graph._driver.calls) == 1
+    assert "ON CREATE SET" in query
+    assert "ON MATCH SET a.semantic_status = COALESCE" in query
+    assert params["aois"][0]["revision"] == "1.2"
+
+
+def test_create_udts_bulk_uses_two_statements_for_all_udts():
+    graph = _graph()
+    count = graph.create_udts_bulk(
+        [
+            {"name": "Motor_UDT", "members": [{"name": "Run"}, {"name": "Speed"}]},
+            {"name": "Valve_UDT", "purpose": "Opens a valve", "members": [{"name": "Open"}]},
+        ]
+    )
+
+    assert count == 2
+    assert len(graph._driver.calls) == 2
+    members = graph._driver.calls[1][1]["members"]
+    assert [(m["udt"], m["name"]) for m in members] == [
+        ("Motor_UDT", "Run"),
+        ("Motor_UDT", "Speed"),
+        ("Valve_UDT", "Open"),
+    ]
+
+
+def test_semantic_status_counts_use_one_union_query():
+    graph = _graph()
+    graph._driver.responses.append(
+        (
+            "UNION ALL",
+            [
+                {"label": "AOI", "status": "pending", "count": 3},
+                {"label": "AOI", "status": "complete", "count": 2},
+                {"label": "ScadaTag", "status": "pending", "count": 7},
+            ],
+        )
+    )
+
+    counts = graph.get_semantic_status_counts()
+
+    assert len(graph._driver.calls) == 1
+    assert counts["AOI"] == {"pending": 3, "complete": 2}
+    assert counts["ScadaTag"] == {"pending": 7}
+    assert counts["PLCTag"] == {}
+
+
+def test_pending_and_status_queries_are_fixed_strings_per_label():
+    graph = _graph()
+    graph.get_pending_items("UDT", limit=5)
+    graph.get_pending_items("UDT", limit=7)
+    graph.set_semantic_status("ViewComponent", "Root/Start", "complete", "Starts")
+
+    (q1, p1), (q2, p2), (q3, p3) = graph._driver.calls
+    assert q1 is q2 and "USING INDEX n:UDT(semantic_status)" in q1
+    assert "UNION ALL" in q1 and "OR n.semantic_status IS NULL" not in q1
+    assert p2 == {"limit": 7}
+    assert "USING INDEX n:ViewComponent(path)" in q3
+    assert "WHERE n.path = u.name" in q3
+    assert p3["updates"] == [{"name": "Root/Start", "status": "complete", "purpose": "Starts"}]
+
+
+def test_pending_items_rejects_unknown_types():
+    with pytest.raises(ValueError):
+        _graph().get_pending_items("Robot")
+
+
+def test_enrichment_counts_come_from_one_statement():
+    graph = _graph()
+    graph._driver.responses.append(
+        ("'AOI' as label", [{"label": "AOI", "enriched": 4, "pending": 1}])
+    )
+
+    counts = graph.get_enrichment_status_counts()
+
+    assert len(graph._driver.calls) == 1
+    assert counts == {
+        "AOI": {"enriched": 4, "pending": 1},
+        "View": {"enriched": 0, "pending": 0},
+    }
+
+
+def test_item_context_collects_each_expansion_in_its_own_subquery():
+    graph = _graph()
+    graph._driver.responses.append(
+        (
+            "USING INDEX u:UDT(name)",
+            [{"item": {"name": "Motor_UDT"}, "views": ["Main"], "equipment": [], "aois": [], "members": []}],
+        )
+    )
+
+    data = graph.get_item_with_context("UDT", "Motor_UDT")
+
+    query = graph._driver.calls[0][0]
+    assert "OPTIONAL MATCH" not in query and query.count("CALL {") == 4
+    assert data == {
+        "item": {"name": "Motor_UDT"},
+        "context": {"views": ["Main"], "equipment": [], "aois": [], "members": []},
+    }
+    assert graph.get_item_with_context("Robot", "R1") is None
+
+
+def test_item_context_and_pending_items_are_cached_until_status_changes():
+    graph = _graph()
+    graph._driver.responses.append(
+        ("USING INDEX u:UDT(name)", [{"item": {"name": "Motor_UDT"}}])
+    )
+
+    graph.get_item_with_context("UDT", "Motor_UDT")
+    graph.get_item_with_context("UDT", "Motor_UDT")
+    graph.get_pending_items("UDT", limit=5)
+    graph.get_pending_items("UDT", limit=5)
+    assert len(graph._driver.calls) == 2
+
+    graph.set_semantic_status("UDT", "Motor_UDT", "complete", "Drives a motor")
+    graph.get_item_with_context("UDT", "Motor_UDT")
+    graph.get_pending_items("UDT", limit=5)
+    assert len(graph._driver.calls) == 5
+
+
+def test_item_context_cache_is_dropped_by_writers_and_returns_copies():
+    graph = _graph()
+    graph._driver.responses.append(
+        ("USING INDEX a:AOI(name)", [{"item": {"name": "Motor"}, "tags": []}])
+    )
+
+    data = graph.get_item_with_context("AOI", "Motor")
+    data["item"]["name"] = "changed"
+    assert graph.get_item_with_context("AOI", "Motor")["item"]["name"] == "Motor"
+    graph.get_pending_items("AOI", limit=5)
+    assert len(graph._driver.calls) == 2
+
+    graph.create_aois_bulk([{"name": "Motor", "type": "AOI", "source_file": "m.sc"}])
+    writes = len(graph._driver.calls)
+    graph.get_item_with_context("AOI", "Motor")
+    graph.get_pending_items("AOI", limit=5)
+    assert len(graph._driver.calls) == writes + 2
+
+
+def test_tag_traces_use_a_literal_depth_bound():
+    graph = _graph()
+    graph.trace_tag_influence("Motor", "Run", depth=2)
+    graph.trace_tag_dependencies("Motor", "Run")
+
+    (down, params), (up, _) = graph._driver.calls
+    assert "-[*1..2]->(end:Tag)" in down and "$depth" not in down
+    assert "(start:Tag)-[*1..3]->" in up
+    assert params == {"tag_name": "Run", "aoi_name": "Motor"}
+    with pytest.raises(ValueError):
+        graph.trace_tag_influence("Motor", "Run", depth=20)
+
+
+def test_visualization_graph_is_one_projected_statement():
+    graph = _graph()
+    graph._driver.responses.append(
+        (
+            "as edges",
+            [
+                {
+                    "id": "4:db:1",
+                    "type": "UDT",
+                    "label": "Motor_UDT",
+                    "details": {"name": "Motor_UDT", "purpose": None},
+                    "edges": [{"target": "4:db:2", "type": "MAPS_TO", "label": None}],
+                },
+                {"id": "4:db:2", "type": "AOI", "label": "Motor", "details": {}, "edges": []},
+            ],
+        )
+    )
+
+    viz = graph.get_graph_for_visualization()
+
+    query = graph._driver.calls[0][0]
+    assert len(graph._driver.calls) == 1 and "properties(" not in query
+    assert viz["nodes"][0] == {
+        "id": "4:db:1", "type": "udt", "label": "Motor_UDT", "details": {"name": "Motor_UDT"}
+    }
+    assert viz["edges"] == [
+        {"source": "4:db:1", "target": "4:db:2", "type": "MAPS_TO", "label": "MAPS_TO"}
+    ]
+
+
+def test_set_semantic_statuses_updates_a_batch_in_one_statement():
+    graph = _graph()
+    graph._driver.responses.append(("UNWIND $updates AS u", [{"updated": 2}]))
+
+    updated = graph.set_semantic_statuses(
+        "UDT",
+        [{"name": "A", "status": "complete", "purpose": "x"}, {"name": "B", "status": "review"}],
+    )
+
+    assert updated == 2 and len(graph._driver.calls) == 1
+    assert graph._driver.calls[0][1]["updates"][1] == {"name": "B", "status": "review", "purpose": None}
+    assert graph.set_semantic_statuses("UDT", []) == 0
+    with pytest.raises(ValueError):
+        graph.set_semantic_statuses("UDT", [{"name": "A", "status": "done"}])
+
+
+def test_get_node_details_fetches_one_node_by_element_id():
+    graph = _graph()
+    graph._driver.responses.append(
+        ("elementId(n) = $id", [{"labels": ["AOI"], "props": {"name": "Motor"}}])
+    )
+
+    assert graph.get_node_details("4:abc:1") == {
+        "labels": ["AOI"],
+        "details": {"name": "Motor"},
+    }
+    assert graph._driver.calls[0][1] == {"id": "4:abc:1"}
+    assert _graph().get_node_details("4:abc:2") is None
+
+
+def test_item_context_queries_all_seek_through_an_index():
+    from neo4j_ontology import _ITEM_CONTEXT_QUERIES
+
+    assert set(_ITEM_CONTEXT_QUERIES) == {
+        "AOI", "UDT", "View", "Equipment", "ViewComponent", "ScadaTag"
+    }
+    for query in _ITEM_CONTEXT_QUERIES.values():
+        assert "USING INDEX" in query and "{name: $name}" not in query
+
+
+def test_import_json_ontology_imports_each_aoi_of_a_list(tmp_path):
+    from neo4j_ontology import import_json_ontology
+
+    path = tmp_path / "l5x.json"
+    path.write_text(json.dumps([{"name": "Motor"}, {"name": "Valve"}]), encoding="utf-8")
+    graph = _graph()
+
+    import_json_ontology(str(path), graph)
+
+    names = [
+        row["name"]
+        for query, params in graph._driver.calls
+        if "MERGE (a:AOI" in query
+        for row in params["aois"]
+    ]
+    assert names == ["Motor", "Valve"]
+
+
+def test_import_json_ontology_writes_aois_in_bounded_batches(tmp_path, monkeypatch):
+    import neo4j_ontology
+    from neo4j_ontology import import_json_ontology
+
+    monkeypatch.setattr(neo4j_ontology, "AOI_WRITE_BATCH", 2)
+    path = tmp_path / "l5x.json"
+    path.write_text(
+        json.dumps([{"name": f"A{i}"} for i in range(5)]), encoding="utf-8"
+    )
+    graph = _graph()
+
+    import_json_ontology(str(path), graph)
+
+    batches = [
+        [r["name"] for r in p["aois"]]
+        for q, p in graph._driver.calls
+        if "MERGE (a:AOI" in q
+    ]
+    assert batches == [["A0", "A1"], ["A2", "A3"], ["A4"]]
+
+
+def test_ignition_import_writes_each_kind_in_one_unwind():
+    from neo4j_ontology import _import_ignition
+
+    graph = _graph()
+    _import_ignition(
+        graph,
+        {
+            "source": "ignition",
+            "source_file": "gw.json",
+            "analysis": {
+                "udt_semantics": {"Motor_UDT": "Drives a motor"},
+                "equipment_instances": [{"name": "M1", "type": "Motor_UDT"}, {"name": "M2"}],
+                "view_purposes": {"Main": "Overview", "Alarms": ""},
+            },
+        },
+    )
+
+    queries = [q for q, _ in graph._driver.calls]
+    assert len(queries) == 3 and all("UNWIND" in q for q in queries)
+    equipment = graph._driver.calls[1][1]["rows"]
+    assert [e["name"] for e in equipment] == ["M1", "M2"]
+    assert graph._driver.calls[2][1]["rows"][1]["project"] is None
+
+
+def test_phrase_and_symptom_searches_use_lowercased_keys():
+    graph = _graph()
+    graph.find_by_symptom("Motor Trip")
+    graph.find_by_operator_phrase("Won't START")
+
+    (symptom_q, symptom_p), (common_q, common_p), (aoi_q, _) = graph._driver.calls
+    assert "s.symptom_lower CONTAINS $text" in symptom_q and symptom_p == {"text": "motor trip"}
+    assert "p.variations_lower" in common_q and common_p == {"phrase": "won't start"}
+    assert "toLower" not in symptom_q + common_q + aoi_q
+
+
+def test_missing_item_context_is_one_statement_and_not_cached():
+    graph = _graph()
+
+    assert graph.get_item_with_context("AOI", "Ghost") is None
+    assert graph.get_item_with_context("AOI", "Ghost") is None
+
+    queries = [q for q, _ in graph._driver.calls]
+    assert len(queries) == 2
+    assert queries[0].lstrip().startswith("MATCH (a:AOI) USING INDEX a:AOI(name)")
+
+
+def test_get_aoi_by_analysis_hash_reads_the_matching_aoi():
+    graph = _graph()
+    graph._driver.responses.extend(
+        [
+            ("{analysis_hash: $analysis_hash}", [{"name": "Motor"}]),
+            (
+                "MATCH (a:AOI {name: $name})\n            RETURN a",
+                [{"a": {"name": "Motor"}}],
+            ),
+        ]
+    )
+
+    aoi = graph.get_aoi_by_analysis_hash("abc")
+
+    assert aoi["name"] == "Motor"
+    assert graph._driver.calls[0][1] == {"analysis_hash": "abc"}
+    assert graph._driver.sessions[0].get("default_access_mode") == "READ"
+
+
+def test_create_aoi_records_analysis_hash():
+    graph = _graph()
+    graph.create_aoi(
+        "Motor", "AOI", "motor.sc", analysis={"purpose": "Runs"}, analysis_hash="abc"
+    )
+
+    query, params = graph._driver.calls[0]
+    assert "a.analysis_hash = $analysis_hash" in query
+    assert params["analysis_hash"] == "abc"
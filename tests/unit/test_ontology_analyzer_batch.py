@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import ontology_analyzer
+from ontology_analyzer import OntologyAnalyzer
+from sc_parser import LogicRung, SCFile
+
+
+class _FakeBatches:
+    """Message Batches stand-in: every batch has ended and every request succeeds."""
+
+    def __init__(self):
+        self.created = []
+
+    def create(self, requests):
+        self.created.append([r["custom_id"] for r in requests])
+        return SimpleNamespace(id=f"batch-{len(self.created)}")
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def results(self, batch_id):
+        for custom_id in self.created[int(batch_id.split("-")[1]) - 1]:
+            block = SimpleNamespace(
+                type="tool_use", name="emit_ontology", input={"purpose": custom_id}
+            )
+            message = SimpleNamespace(content=[block], stop_reason="tool_use")
+            yield SimpleNamespace(
+                custom_id=custom_id,
+                result=SimpleNamespace(type="succeeded", message=message),
+            )
+
+
+class _FakeGraph:
+    @contextmanager
+    def session(self):
+        yield None
+
+
+def _analyzer():
+    batches = _FakeBatches()
+    client = SimpleNamespace(
+        model="test-model",
+        graph=_FakeGraph(),
+        client=SimpleNamespace(messages=SimpleNamespace(batches=batches)),
+    )
+    analyzer = OntologyAnalyzer(client=client, force=True, trivial_threshold=0)
+    # Record what would be written to Neo4j instead of writing it
+    analyzer._store_ontology = lambda sc_file, analysis, **kwargs: {
+        "name": sc_file.name,
+        "analysis": analysis,
+    }
+    return analyzer, batches
+
+
+def _blocks(count):
+    routine = {"name": "Logic", "type": "RLL", "rungs": [LogicRung(0, None, "NOP();")]}
+    return [
+        SCFile(file_path=f"c{i}.sc", name=f"C{i}", type="AOI", routines=[routine])
+        for i in range(count)
+    ]
+
+
+def test_requests_are_split_across_bounded_batches(monkeypatch):
+    monkeypatch.setattr(ontology_analyzer, "BATCH_MAX_REQUESTS", 2)
+    analyzer, batches = _analyzer()
+
+    ontologies = list(analyzer._analyze_parsed_files_batched(_blocks(5), False, 0))
+
+    assert batches.created == [
+        ["component-0", "component-1"],
+        ["component-2", "component-3"],
+        ["component-4"],
+    ]
+    assert [o["name"] for o in ontologies] == ["C0", "C1", "C2", "C3", "C4"]
+    assert ontologies[4]["analysis"] == {"purpose": "component-4"}
+
+
+def test_batches_are_also_bounded_by_request_size(monkeypatch):
+    monkeypatch.setattr(ontology_analyzer, "BATCH_MAX_BYTES", 1)
+    analyzer, batches = _analyzer()
+
+    list(analyzer._analyze_parsed_files_batched(_blocks(2), False, 0))
+
+    # A request larger than the limit still goes out, alone in its batch
+    assert batches.created == [["component-0"], ["component-1"]]
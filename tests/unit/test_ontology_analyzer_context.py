@@ -0,0 +1,89 @@
+from ontology_analyzer import OntologyAnalyzer
+from sc_parser import LogicRung, SCFile, Tag
+
+
+def _analyzer(context_budget=8000):
+    # A stand-in graph: building context never touches Neo4j or Claude
+    return OntologyAnalyzer(graph=object(), context_budget=context_budget)
+
+
+def _routine(rungs):
+    return {"name": "Logic", "type": "RLL", "rungs": rungs}
+
+
+def test_small_component_context_matches_the_original_layout():
+    sc_file = SCFile(
+        file_path="motor.sc",
+        name="Motor",
+        type="AOI",
+        description="Runs a motor",
+        input_tags=[Tag("Start", "BOOL", description="start command")],
+        output_tags=[Tag("Running", "BOOL")],
+        local_tags=[Tag("Timer", "TIMER")],
+        routines=[
+            _routine([LogicRung(0, "Seal in", "XIC(Start)OTE(Running);")]),
+            {
+                "name": "Calc",
+                "type": "ST",
+                "visibility": "private",
+                "raw_content": "x := 1;",
+            },
+        ],
+    )
+
+    assert _analyzer()._build_analysis_context(sc_file) == (
+        "# PLC Component: Motor\nType: AOI\nDescription: Runs a motor\n\n"
+        "## Input Parameters\n- Start: BOOL // start command\n\n"
+        "## Output Parameters\n- Running: BOOL\n\n"
+        "## Local Variables\n- Timer: TIMER\n\n"
+        "## Logic Implementation\n### Routine: Logic (RLL)\n\n"
+        "Rung 0: Seal in\n```\nXIC(Start)OTE(Running);\n```\n\n"
+        "### Routine: Calc (ST) [private]\n```st\nx := 1;\n```\n"
+    )
+
+
+def test_rungs_are_picked_commented_then_shortest_and_shown_in_order():
+    rungs = [
+        LogicRung(0, None, "A" * 1000),
+        LogicRung(1, "Start motor", "B" * 600),
+        LogicRung(2, None, "C" * 300),
+    ]
+    sc_file = SCFile(
+        file_path="m.sc", name="M", type="AOI", routines=[_routine(rungs)]
+    )
+
+    # The smallest budget leaves each routine its minimum share (1500 chars):
+    # room for rung 1 (commented) and rung 2 (shortest) but not rung 0
+    context = _analyzer(context_budget=1)._build_analysis_context(sc_file)
+
+    assert "Rung 0:" not in context
+    assert context.index("Rung 1: Start motor") < context.index("Rung 2:")
+    assert context.endswith("\n... and 1 more rungs totaling 1 lines\n")
+
+
+def test_rungs_within_always_shows_one_rung():
+    rungs = [LogicRung(0, None, "A" * 5000), LogicRung(1, None, "B" * 4000)]
+    assert OntologyAnalyzer._rungs_within(rungs, 100) == {1}
+
+
+def test_local_tags_fill_their_budget_share_beyond_the_minimum():
+    local_tags = [Tag(f"L{i:02}", "BOOL") for i in range(100)]
+    sc_file = SCFile(file_path="m.sc", name="M", type="AOI", local_tags=local_tags)
+
+    # 1000 tokens * 4 chars * 15% = 600 chars; each "- Lnn: BOOL" line is 12
+    roomy = _analyzer(context_budget=1000)._build_analysis_context(sc_file)
+    assert "- L49: BOOL" in roomy
+    assert "- L50: BOOL" not in roomy
+    assert "... and 50 more local variables" in roomy
+
+    # A tight budget still lists the first ten
+    tight = _analyzer(context_budget=1)._build_analysis_context(sc_file)
+    assert "- L09: BOOL" in tight
+    assert "... and 90 more local variables" in tight
+
+
+def test_format_tag_length_matches_the_formatted_line():
+    for tag in (Tag("Speed", "REAL"), Tag("Speed", "REAL", description="rpm")):
+        assert OntologyAnalyzer._format_tag_length(tag) == len(
+            OntologyAnalyzer._format_tag(tag)
+        )